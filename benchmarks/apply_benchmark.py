@@ -0,0 +1,108 @@
+"""
+Time pipeline.apply_stage against the SQLite-backed fake target.
+
+    python -m benchmarks.apply_benchmark [--tables 400] [--latency 0.02] [--failure-rate 0.01] [--pool-size 8]
+
+Narrow fixture tables are exported to a catalog.jsonl; one in ten is a parent
+with a primary key and every other table references one parent with a
+foreign key. The export is applied once over a single connection and once
+over the pool, and each target is checked for every table and constraint.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from benchmarks import fake_target
+from benchmarks.fixtures import narrow_table
+from connector.dbapi_pool import DbApiPool
+from connector.section_fetching import split_describe_formatted
+from connector.utils import convert_sections_to_clean_json
+from pipeline import json_codec
+from pipeline.apply_stage import ApplyStage, build_statements, summarize
+
+
+def write_catalog(path: str, count: int) -> None:
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            table = f"t_{i}"
+            clean_json = convert_sections_to_clean_json(
+                "bench", table, split_describe_formatted(narrow_table("bench", table, rng))
+            )
+            constraints = clean_json["constraints"]
+            if i % 10 == 0:
+                constraints["primary_key"] = {"table": f"bench.{table}", "constraint": f"pk_{table}", "columns": ["col_0"]}
+            else:
+                parent = f"bench.t_{i // 10 * 10}"
+                constraints["foreign_keys"] = [
+                    {"table": f"bench.{table}", "constraint": f"fk_{table}", "column": "col_0",
+                     "parent_column": f"{parent}.col_0", "key_sequence": "1"}
+                ]
+            f.write(json_codec.dumps(clean_json) + "\n")
+
+
+def run_once(catalog: str, workdir: str, label: str, pool_size: int, batch_size: int, args) -> dict:
+    target = os.path.join(workdir, f"{label}.sqlite")
+    settings = {"database": target, "latency": args.latency, "failure_rate": args.failure_rate, "seed": 1}
+    pool = DbApiPool(lambda: fake_target.connect(**settings), pool_size)
+    stage = ApplyStage(pool, os.path.join(workdir, f"{label}_log.jsonl"), retries=5,
+                       batch_size=batch_size, backoff_base=0.01, backoff_max=0.1)
+    statements = build_statements(catalog)
+    start = time.perf_counter()
+    results = stage.run(statements)
+    seconds = time.perf_counter() - start
+    pool.close_all()
+
+    db = sqlite3.connect(target)
+    counts = {
+        "tables": db.execute("SELECT COUNT(*) FROM tables").fetchone()[0],
+        "constraints": db.execute("SELECT COUNT(*) FROM constraints").fetchone()[0],
+        "dropped": db.execute("SELECT COUNT(*) FROM statements WHERE status = 'dropped'").fetchone()[0],
+    }
+    db.close()
+    print(f"[INFO] {label}: {summarize(results, seconds)}", file=sys.stderr)
+    return {
+        "pool_size": pool_size,
+        "batch_size": batch_size,
+        "statements": len(statements),
+        "seconds": round(seconds, 3),
+        "failed": sum(1 for r in results if r["status"] in ("failed", "skipped")),
+        "target": counts,
+    }
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tables", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per statement")
+    parser.add_argument("--failure-rate", type=float, default=0.01, help="chance a statement drops the connection")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        catalog = os.path.join(workdir, "catalog.jsonl")
+        write_catalog(catalog, args.tables)
+        report = {
+            "tables": args.tables,
+            "latency": args.latency,
+            "failure_rate": args.failure_rate,
+            "serial": run_once(catalog, workdir, "serial", 1, 1, args),
+            "pooled": run_once(catalog, workdir, "pooled", args.pool_size, args.batch_size, args),
+        }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
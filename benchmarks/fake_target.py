@@ -0,0 +1,154 @@
+"""
+SQLite-backed stand-in for a DB-API target (e.g. databricks.sql), so
+pipeline.apply_stage can be run end to end without a warehouse:
+
+    apply:
+      driver: "benchmarks.fake_target"
+      connect_args: {database: "/tmp/target.sqlite", latency: 0.05, failure_rate: 0.02}
+
+Every executed statement is recorded in the ``statements`` table. CREATE
+TABLE and ADD CONSTRAINT are tracked like a catalog that enforces keys: a
+second PRIMARY KEY or constraint name fails with "already exists", and a
+FOREIGN KEY fails unless its parent table and primary key exist. Each
+statement sleeps ``latency`` seconds and fails with ConnectionError at
+``failure_rate``, before it takes effect.
+"""
+import random
+import re
+import sqlite3
+import threading
+import time
+
+apilevel = "2.0"
+threadsafety = 1
+paramstyle = "qmark"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT, connection INTEGER, sql TEXT, status TEXT, at REAL
+);
+CREATE TABLE IF NOT EXISTS tables (name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS constraints (
+    table_name TEXT, name TEXT, kind TEXT, parent TEXT, PRIMARY KEY (table_name, name)
+);
+"""
+_CREATE = re.compile(r"^\s*CREATE\s+(?:EXTERNAL\s+)?TABLE\s+(IF\s+NOT\s+EXISTS\s+)?(\S+)", re.IGNORECASE)
+_CONSTRAINT = re.compile(
+    r"^\s*ALTER\s+TABLE\s+(\S+)\s+ADD\s+CONSTRAINT\s+(\S+)\s+(PRIMARY|FOREIGN)\s+KEY"
+    r"(?:.*?\bREFERENCES\s+(\S+))?",
+    re.IGNORECASE | re.DOTALL,
+)
+_lock = threading.Lock()
+_connection_ids = iter(range(1, 1 << 62))
+
+
+class Error(Exception):
+    pass
+
+
+class OperationalError(Error):
+    pass
+
+
+def _name(identifier: str) -> str:
+    return identifier.replace("`", "").replace('"', "").lower()
+
+
+def connect(database: str = ":memory:", latency: float = 0.0, failure_rate: float = 0.0, seed: int = None):
+    return Connection(database, latency, failure_rate, seed)
+
+
+class Connection:
+    def __init__(self, database: str, latency: float, failure_rate: float, seed: int = None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._db = sqlite3.connect(database, check_same_thread=False, isolation_level=None, timeout=30)
+        with _lock:
+            self._db.executescript(_SCHEMA)
+            self.id = next(_connection_ids)
+
+    def cursor(self) -> "Cursor":
+        if self._db is None:
+            raise OperationalError("connection is closed")
+        return Cursor(self)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _execute(self, sql_text: str) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            self._record(sql_text, "dropped")
+            raise ConnectionError("fake target: connection reset")
+        with _lock:
+            try:
+                self._apply(sql_text)
+            except OperationalError as e:
+                self._record(sql_text, f"error: {e}")
+                raise
+            self._record(sql_text, "ok")
+
+    def _apply(self, sql_text: str) -> None:
+        create = _CREATE.match(sql_text)
+        if create:
+            name = _name(create.group(2))
+            if self._exists("SELECT 1 FROM tables WHERE name = ?", name):
+                if not create.group(1):
+                    raise OperationalError(f"table {name} already exists")
+                return
+            self._db.execute("INSERT INTO tables VALUES (?)", (name,))
+            return
+
+        constraint = _CONSTRAINT.match(sql_text)
+        if not constraint:
+            return  # other statements are only recorded
+        table, name, kind = _name(constraint.group(1)), _name(constraint.group(2)), constraint.group(3).lower()
+        parent = _name(constraint.group(4) or "")
+        if not self._exists("SELECT 1 FROM tables WHERE name = ?", table):
+            raise OperationalError(f"table {table} not found")
+        if self._exists("SELECT 1 FROM constraints WHERE table_name = ? AND name = ?", table, name):
+            raise OperationalError(f"constraint {name} already exists on {table}")
+        if kind == "primary" and self._exists(
+            "SELECT 1 FROM constraints WHERE table_name = ? AND kind = 'primary'", table
+        ):
+            raise OperationalError(f"a primary key already exists on {table}")
+        if kind == "foreign":
+            if not self._exists("SELECT 1 FROM tables WHERE name = ?", parent):
+                raise OperationalError(f"referenced table {parent} not found")
+            if not self._exists(
+                "SELECT 1 FROM constraints WHERE table_name = ? AND kind = 'primary'", parent
+            ):
+                raise OperationalError(f"referenced table {parent} has no primary key")
+        self._db.execute("INSERT INTO constraints VALUES (?, ?, ?, ?)", (table, name, kind, parent))
+
+    def _exists(self, query: str, *params) -> bool:
+        return self._db.execute(query, params).fetchone() is not None
+
+    def _record(self, sql_text: str, status: str) -> None:
+        self._db.execute(
+            "INSERT INTO statements (connection, sql, status, at) VALUES (?, ?, ?, ?)",
+            (self.id, sql_text, status, time.time()),
+        )
+
+
+class Cursor:
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.rowcount = -1
+        self.description = None
+
+    def execute(self, sql_text: str, parameters=None) -> None:
+        self.connection._execute(sql_text)
+
+    def fetchall(self) -> list:
+        return []
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,196 @@
+"""Synthetic DESCRIBE FORMATTED row sets shaped like HiveServer2 output."""
+import random
+
+PRIMITIVES = [
+    "int", "bigint", "string", "double", "boolean", "timestamp", "date",
+    "decimal(18,4)", "varchar(64)", "char(8)", "tinyint", "binary",
+]
+
+
+def nested_type(rng: random.Random, depth: int) -> str:
+    if depth <= 0:
+        return rng.choice(PRIMITIVES)
+    kind = rng.choice(("struct", "map", "array"))
+    if kind == "array":
+        return f"array<{nested_type(rng, depth - 1)}>"
+    if kind == "map":
+        return f"map<string,{nested_type(rng, depth - 1)}>"
+    fields = ",".join(
+        f"f{i}:{nested_type(rng, depth - 1 if i == 0 else 0)}" for i in range(4)
+    )
+    return f"struct<{fields}>"
+
+
+def describe_rows(
+    db: str,
+    table: str,
+    columns: list[tuple[str, str, str]],
+    partitions: list[tuple[str, str, str]] = (),
+    table_type: str = "MANAGED_TABLE",
+    bucket_columns: list[str] = (),
+    skewed_columns: list[str] = (),
+    skewed_values: list[list[str]] = (),
+    constraint_count: int = 0,
+    extra_params: int = 0,
+) -> list[tuple]:
+    full_name = f"{db}.{table}"
+    rows = [("# col_name", "data_type", "comment")]
+    rows.extend(columns)
+    rows.append(("", None, None))
+
+    if partitions:
+        rows.append(("# Partition Information", None, None))
+        rows.append(("# col_name", "data_type", "comment"))
+        rows.extend(partitions)
+        rows.append(("", None, None))
+
+    rows += [
+        ("# Detailed Table Information", None, None),
+        ("Database:", db, None),
+        ("OwnerType:", "USER", None),
+        ("Owner:", "etl", None),
+        ("CreateTime:", "Mon Jan 01 00:00:00 UTC 2024", None),
+        ("LastAccessTime:", "UNKNOWN", None),
+        ("Retention:", "0", None),
+        ("Location:", f"hdfs://nameservice1/warehouse/{db}.db/{table}", None),
+        ("Table Type:", table_type, None),
+        ("Table Parameters:", None, None),
+        ("", "COLUMN_STATS_ACCURATE", '{"BASIC_STATS":"true"}'),
+        ("", "numFiles", "128"),
+        ("", "numRows", "1000000"),
+        ("", "rawDataSize", "512000000"),
+        ("", "totalSize", "128000000"),
+        ("", "transient_lastDdlTime", "1700000000"),
+    ]
+    rows += [("", f"custom.param.{i}", f"value {i}") for i in range(extra_params)]
+    rows += [
+        ("", None, None),
+        ("# Storage Information", None, None),
+        ("SerDe Library:", "org.apache.hadoop.hive.ql.io.orc.OrcSerde", None),
+        ("InputFormat:", "org.apache.hadoop.hive.ql.io.orc.OrcInputFormat", None),
+        ("OutputFormat:", "org.apache.hadoop.hive.ql.io.orc.OrcOutputFormat", None),
+        ("Compressed:", "No", None),
+        ("Num Buckets:", str(len(bucket_columns) and 32 or -1), None),
+        ("Bucket Columns:", f"[{', '.join(bucket_columns)}]", None),
+        ("Sort Columns:", "[]", None),
+    ]
+    if skewed_columns:
+        rows += [
+            ("Stored As SubDirectories:", "Yes", None),
+            ("Skewed Columns:", f"[{', '.join(skewed_columns)}]", None),
+            ("Skewed Values:", "[" + ", ".join(f"[{', '.join(v)}]" for v in skewed_values) + "]", None),
+        ]
+    rows += [
+        ("Storage Desc Params:", None, None),
+        ("", "serialization.format", "1"),
+        ("", None, None),
+    ]
+
+    if constraint_count:
+        names = [c[0] for c in columns]
+        rows += [
+            ("# Constraints", None, None),
+            ("", None, None),
+            ("# Primary Key", None, None),
+            ("Table:", full_name, None),
+            ("Constraint Name:", f"pk_{table}", None),
+            ("Column Name:", names[0], None),
+            ("", None, None),
+            ("# Foreign Keys", None, None),
+        ]
+        for i in range(constraint_count):
+            rows += [
+                ("Table:", full_name, None),
+                ("Constraint Name:", f"fk_{table}_{i}", None),
+                (
+                    f"Parent Column Name:{db}.parent_{i % 50}.id",
+                    f"Column Name:{names[i % len(names)]}",
+                    "Key Sequence:1",
+                ),
+                ("", None, None),
+            ]
+        rows.append(("# Not Null Constraints", None, None))
+        for i in range(constraint_count):
+            rows += [
+                ("Table:", full_name, None),
+                ("Constraint Name:", f"nn_{table}_{i}", None),
+                ("Column Name:", names[i % len(names)], None),
+                ("", None, None),
+            ]
+        rows.append(("# Default Constraints", None, None))
+        for i in range(constraint_count // 4):
+            rows += [
+                ("Table:", full_name, None),
+                ("Constraint Name:", f"df_{table}_{i}", None),
+                (f"Column Name:{names[i % len(names)]}", "Default Value:0", None),
+                ("", None, None),
+            ]
+        rows.append(("# Check Constraints", None, None))
+        for i in range(constraint_count // 4):
+            rows += [
+                ("Table:", full_name, None),
+                ("Constraint Name:", f"chk_{table}_{i}", None),
+                (f"Column Name:{names[i % len(names)]}", f"Check Value:{names[i % len(names)]} > 0", None),
+                ("", None, None),
+            ]
+    return rows
+
+
+def _plain_columns(count: int, rng: random.Random) -> list[tuple[str, str, str]]:
+    return [
+        (f"col_{i}", rng.choice(PRIMITIVES), f"column {i}" if i % 3 == 0 else None)
+        for i in range(count)
+    ]
+
+
+def narrow_table(db: str, table: str, rng: random.Random) -> list[tuple]:
+    return describe_rows(
+        db, table, _plain_columns(12, rng), partitions=[("ds", "string", None)]
+    )
+
+
+def wide_table(db: str, table: str, rng: random.Random) -> list[tuple]:
+    return describe_rows(db, table, _plain_columns(5000, rng))
+
+
+def nested_table(db: str, table: str, rng: random.Random) -> list[tuple]:
+    columns = [(f"nested_{i}", nested_type(rng, 6), None) for i in range(60)]
+    return describe_rows(db, table, columns)
+
+
+def constraint_heavy_table(db: str, table: str, rng: random.Random) -> list[tuple]:
+    return describe_rows(db, table, _plain_columns(200, rng), constraint_count=2000)
+
+
+def bucketed_skewed_table(db: str, table: str, rng: random.Random) -> list[tuple]:
+    return describe_rows(
+        db,
+        table,
+        _plain_columns(40, rng),
+        partitions=[("ds", "string", None), ("region", "varchar(8)", None)],
+        table_type="EXTERNAL_TABLE",
+        bucket_columns=["col_0", "col_1"],
+        skewed_columns=["col_2", "col_3"],
+        skewed_values=[["'a'", "'1'"], ["'b'", "'2'"]],
+        extra_params=40,
+    )
+
+
+# profile name -> (row generator, tables generated per run)
+PROFILES = {
+    "narrow": (narrow_table, 2000),
+    "wide_5000_columns": (wide_table, 10),
+    "deeply_nested": (nested_table, 100),
+    "constraint_heavy": (constraint_heavy_table, 20),
+    "bucketed_skewed": (bucketed_skewed_table, 500),
+}
+
+
+def generate_profile(name: str, scale: float = 1.0, seed: int = 0) -> list[tuple[str, str, list]]:
+    """Return [(db, table, rows)] for one profile."""
+    factory, count = PROFILES[name]
+    rng = random.Random(seed)
+    return [
+        ("bench", f"{name}_{i}", factory("bench", f"{name}_{i}", rng))
+        for i in range(max(1, int(count * scale)))
+    ]
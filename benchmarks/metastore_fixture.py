@@ -0,0 +1,292 @@
+"""
+A SQLite copy of the Hive metastore tables connector.metastore_backend reads,
+and a parity check of the metastore backend against DESCRIBE FORMATTED.
+
+    python -m benchmarks.metastore_fixture [--keep metastore.db]
+
+The fixture holds sales.customers and sales.orders. Orders carries every
+constraint type: a two-column PRIMARY KEY, a FOREIGN KEY, UNIQUE, NOT NULL
+(one of them on a partition column), DEFAULT and CHECK. KEY_CONSTRAINTS rows
+are laid out as Hive's ObjectStore writes them. The same tables are rendered
+as DESCRIBE FORMATTED rows, and load_database_metadata() must return the
+clean JSON both row parsers build from them.
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import time
+
+from connector.describe_stream import parse_describe_stream
+from connector.metastore_backend import (
+    CHECK,
+    DEFAULT_VALUE,
+    FOREIGN_KEY,
+    NOT_NULL,
+    PRIMARY_KEY,
+    UNIQUE_KEY,
+    load_database_metadata,
+)
+from connector.section_fetching import split_describe_formatted
+from connector.utils import convert_sections_to_clean_json
+
+DATABASE = "sales"
+CREATE_TIME = 1700000000
+SERDE = "org.apache.hadoop.hive.ql.io.orc.OrcSerde"
+INPUT_FORMAT = "org.apache.hadoop.hive.ql.io.orc.OrcInputFormat"
+OUTPUT_FORMAT = "org.apache.hadoop.hive.ql.io.orc.OrcOutputFormat"
+
+# The metastore tables and columns the backend queries, as in Hive's schema.
+SCHEMA = """
+CREATE TABLE DBS (DB_ID INTEGER PRIMARY KEY, NAME TEXT, DB_LOCATION_URI TEXT, OWNER_NAME TEXT);
+CREATE TABLE TBLS (TBL_ID INTEGER PRIMARY KEY, CREATE_TIME INTEGER, DB_ID INTEGER, LAST_ACCESS_TIME INTEGER,
+                   OWNER TEXT, RETENTION INTEGER, SD_ID INTEGER, TBL_NAME TEXT, TBL_TYPE TEXT);
+CREATE TABLE SDS (SD_ID INTEGER PRIMARY KEY, CD_ID INTEGER, INPUT_FORMAT TEXT, IS_COMPRESSED INTEGER,
+                  IS_STOREDASSUBDIRECTORIES INTEGER, LOCATION TEXT, NUM_BUCKETS INTEGER, OUTPUT_FORMAT TEXT,
+                  SERDE_ID INTEGER);
+CREATE TABLE SERDES (SERDE_ID INTEGER PRIMARY KEY, NAME TEXT, SLIB TEXT);
+CREATE TABLE SERDE_PARAMS (SERDE_ID INTEGER, PARAM_KEY TEXT, PARAM_VALUE TEXT);
+CREATE TABLE COLUMNS_V2 (CD_ID INTEGER, COMMENT TEXT, COLUMN_NAME TEXT, TYPE_NAME TEXT, INTEGER_IDX INTEGER);
+CREATE TABLE PARTITION_KEYS (TBL_ID INTEGER, PKEY_COMMENT TEXT, PKEY_NAME TEXT, PKEY_TYPE TEXT,
+                             INTEGER_IDX INTEGER);
+CREATE TABLE TABLE_PARAMS (TBL_ID INTEGER, PARAM_KEY TEXT, PARAM_VALUE TEXT);
+CREATE TABLE BUCKETING_COLS (SD_ID INTEGER, BUCKET_COL_NAME TEXT, INTEGER_IDX INTEGER);
+CREATE TABLE SORT_COLS (SD_ID INTEGER, COLUMN_NAME TEXT, "ORDER" INTEGER, INTEGER_IDX INTEGER);
+CREATE TABLE SKEWED_COL_NAMES (SD_ID INTEGER, SKEWED_COL_NAME TEXT, INTEGER_IDX INTEGER);
+CREATE TABLE SKEWED_VALUES (SD_ID_OID INTEGER, STRING_LIST_ID_EID INTEGER, INTEGER_IDX INTEGER);
+CREATE TABLE SKEWED_STRING_LIST_VALUES (STRING_LIST_ID INTEGER, STRING_LIST_VALUE TEXT, INTEGER_IDX INTEGER);
+CREATE TABLE KEY_CONSTRAINTS (CHILD_CD_ID INTEGER, CHILD_INTEGER_IDX INTEGER, CHILD_TBL_ID INTEGER,
+                              PARENT_CD_ID INTEGER, PARENT_INTEGER_IDX INTEGER, PARENT_TBL_ID INTEGER,
+                              POSITION INTEGER, CONSTRAINT_NAME TEXT, CONSTRAINT_TYPE INTEGER,
+                              UPDATE_RULE INTEGER, DELETE_RULE INTEGER, ENABLE_VALIDATE_RELY INTEGER,
+                              DEFAULT_VALUE TEXT, PRIMARY KEY (CONSTRAINT_NAME, POSITION));
+"""
+
+# table -> (table type, columns, partition columns, bucket columns, table parameters)
+TABLES = {
+    "customers": (
+        "MANAGED_TABLE",
+        [("id", "bigint", "customer id"), ("name", "string", "")],
+        [],
+        [],
+        {"numRows": "10", "transient_lastDdlTime": str(CREATE_TIME)},
+    ),
+    "orders": (
+        "EXTERNAL_TABLE",
+        [
+            ("order_id", "bigint", ""),
+            ("line_no", "int", ""),
+            ("customer_id", "bigint", "buyer"),
+            ("order_ref", "string", ""),
+            ("status", "string", ""),
+            ("amount", "decimal(10,2)", ""),
+        ],
+        [("ds", "string", "load date")],
+        ["order_id"],
+        {"EXTERNAL": "TRUE", "numRows": "1000", "transient_lastDdlTime": str(CREATE_TIME)},
+    ),
+}
+
+# (table, constraint name, type, columns, DEFAULT_VALUE, referenced "table.column"s)
+CONSTRAINTS = [
+    ("customers", "pk_customers", PRIMARY_KEY, ["id"], None, []),
+    ("orders", "pk_orders", PRIMARY_KEY, ["order_id", "line_no"], None, []),
+    ("orders", "fk_orders_customer", FOREIGN_KEY, ["customer_id"], None, ["customers.id"]),
+    ("orders", "uk_orders_ref", UNIQUE_KEY, ["order_ref"], None, []),
+    ("orders", "nn_orders_ds", NOT_NULL, ["ds"], None, []),
+    ("orders", "nn_orders_status", NOT_NULL, ["status"], None, []),
+    ("orders", "df_orders_status", DEFAULT_VALUE, ["status"], "'new'", []),
+    ("orders", "chk_orders_amount", CHECK, ["amount"], "amount > 0", []),
+]
+
+
+def _format_time(epoch: int) -> str:
+    return time.strftime("%a %b %d %H:%M:%S %Z %Y", time.localtime(epoch))
+
+
+def _location(table: str) -> str:
+    return f"hdfs://nameservice1/warehouse/{DATABASE}.db/{table}"
+
+
+def build_metastore(connection) -> None:
+    """Create the schema and the fixture tables on an empty SQLite connection."""
+    connection.executescript(SCHEMA)
+    connection.execute("INSERT INTO DBS VALUES (1, ?, '', 'hive')", (DATABASE,))
+    connection.execute("INSERT INTO SERDES VALUES (1, NULL, ?)", (SERDE,))
+    connection.execute("INSERT INTO SERDE_PARAMS VALUES (1, 'serialization.format', '1')")
+    ids = {}
+    for tbl_id, (table, (table_type, columns, partitions, buckets, params)) in enumerate(TABLES.items(), 1):
+        ids[table] = tbl_id  # TBL_ID, SD_ID and CD_ID are the same number
+        connection.execute(
+            "INSERT INTO TBLS VALUES (?, ?, 1, 0, 'etl', 0, ?, ?, ?)",
+            (tbl_id, CREATE_TIME, tbl_id, table, table_type),
+        )
+        connection.execute(
+            "INSERT INTO SDS VALUES (?, ?, ?, 0, 0, ?, ?, ?, 1)",
+            (tbl_id, tbl_id, INPUT_FORMAT, _location(table), 4 if buckets else -1, OUTPUT_FORMAT),
+        )
+        connection.executemany(
+            "INSERT INTO COLUMNS_V2 VALUES (?, ?, ?, ?, ?)",
+            [(tbl_id, comment or None, name, type_, i) for i, (name, type_, comment) in enumerate(columns)],
+        )
+        connection.executemany(
+            "INSERT INTO PARTITION_KEYS VALUES (?, ?, ?, ?, ?)",
+            [(tbl_id, comment or None, name, type_, i) for i, (name, type_, comment) in enumerate(partitions)],
+        )
+        connection.executemany(
+            "INSERT INTO BUCKETING_COLS VALUES (?, ?, ?)", [(tbl_id, c, i) for i, c in enumerate(buckets)]
+        )
+        connection.executemany(
+            "INSERT INTO TABLE_PARAMS VALUES (?, ?, ?)", [(tbl_id, k, v) for k, v in params.items()]
+        )
+
+    def column_ref(table: str, column: str) -> tuple:
+        """(CD_ID, INTEGER_IDX); partition columns have no CD_ID and index PARTITION_KEYS."""
+        _, columns, partitions, _, _ = TABLES[table]
+        names = [c[0] for c in columns]
+        if column in names:
+            return ids[table], names.index(column)
+        return None, [p[0] for p in partitions].index(column)
+
+    for table, name, ctype, columns, value, references in CONSTRAINTS:
+        for position, column in enumerate(columns, 1):
+            cd_id, idx = column_ref(table, column)
+            if ctype == FOREIGN_KEY:
+                parent_table, parent_column = references[position - 1].split(".")
+                parent_cd_id, parent_idx = column_ref(parent_table, parent_column)
+                row = (cd_id, idx, ids[table], parent_cd_id, parent_idx, ids[parent_table])
+            else:
+                # Every other type lives on the parent side only.
+                row = (None, None, None, cd_id, idx, ids[table])
+            connection.execute(
+                "INSERT INTO KEY_CONSTRAINTS VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, 0, 0, ?)",
+                row + (position, name, ctype, value),
+            )
+    connection.commit()
+
+
+def _constraint_rows(table: str) -> list[tuple]:
+    full_name = f"{DATABASE}.{table}"
+    own = [c for c in CONSTRAINTS if c[0] == table]
+    if not own:
+        return []
+    rows = [("# Constraints", None, None), ("", None, None)]
+    sections = (
+        ("# Primary Key", PRIMARY_KEY),
+        ("# Foreign Keys", FOREIGN_KEY),
+        ("# Unique Constraints", UNIQUE_KEY),
+        ("# Not Null Constraints", NOT_NULL),
+        ("# Default Constraints", DEFAULT_VALUE),
+        ("# Check Constraints", CHECK),
+    )
+    for header, ctype in sections:
+        of_type = [c for c in own if c[2] == ctype]
+        if not of_type:
+            continue
+        rows.append((header, None, None))
+        for _, name, _, columns, value, references in of_type:
+            rows += [("Table:", full_name, None), ("Constraint Name:", name, None)]
+            if ctype == PRIMARY_KEY:
+                rows.append(("Column Names:", ", ".join(columns), None))
+            for seq, column in enumerate(columns, 1):
+                if ctype == FOREIGN_KEY:
+                    rows.append(
+                        (f"Parent Column Name:{DATABASE}.{references[seq - 1]}", f"Column Name:{column}",
+                         f"Key Sequence:{seq}")
+                    )
+                elif ctype == UNIQUE_KEY:
+                    rows.append((f"Column Name:{column}", f"Key Sequence:{seq}", None))
+                elif ctype == NOT_NULL:
+                    rows.append(("Column Name:", column, None))
+                elif ctype == DEFAULT_VALUE:
+                    rows.append((f"Column Name:{column}", f"Default Value:{value}", None))
+                elif ctype == CHECK:
+                    rows.append((f"Column Name:{column}", f"Check Value:{value}", None))
+            rows.append(("", None, None))
+    return rows
+
+
+def describe_rows(table: str) -> list[tuple]:
+    """DESCRIBE FORMATTED rows for one fixture table, as HiveServer2 returns them."""
+    table_type, columns, partitions, buckets, params = TABLES[table]
+    rows = [("# col_name", "data_type", "comment")]
+    rows += [(name, type_, comment or None) for name, type_, comment in columns]
+    rows.append(("", None, None))
+    if partitions:
+        rows += [("# Partition Information", None, None), ("# col_name", "data_type", "comment")]
+        rows += [(name, type_, comment or None) for name, type_, comment in partitions]
+        rows.append(("", None, None))
+    rows += [
+        ("# Detailed Table Information", None, None),
+        ("Database:", DATABASE, None),
+        ("Owner:", "etl", None),
+        ("CreateTime:", _format_time(CREATE_TIME), None),
+        ("LastAccessTime:", "UNKNOWN", None),
+        ("Retention:", "0", None),
+        ("Location:", _location(table), None),
+        ("Table Type:", table_type, None),
+        ("Table Parameters:", None, None),
+    ]
+    rows += [("", key, value) for key, value in sorted(params.items())]
+    rows += [
+        ("", None, None),
+        ("# Storage Information", None, None),
+        ("SerDe Library:", SERDE, None),
+        ("InputFormat:", INPUT_FORMAT, None),
+        ("OutputFormat:", OUTPUT_FORMAT, None),
+        ("Compressed:", "No", None),
+        ("Num Buckets:", "4" if buckets else "-1", None),
+        ("Bucket Columns:", f"[{', '.join(buckets)}]", None),
+        ("Sort Columns:", "[]", None),
+        ("Storage Desc Params:", None, None),
+        ("", "serialization.format", "1"),
+        ("", None, None),
+    ]
+    return rows + _constraint_rows(table)
+
+
+def _differences(expected, actual, path: str = "") -> list[str]:
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        found = []
+        for key in sorted(set(expected) | set(actual)):
+            found += _differences(expected.get(key), actual.get(key), f"{path}.{key}" if path else key)
+        return found
+    return [] if expected == actual else [f"{path}: describe={expected!r} metastore={actual!r}"]
+
+
+def check_parity(connection) -> list[str]:
+    """Differences between the metastore backend and both DESCRIBE FORMATTED parsers."""
+    loaded = load_database_metadata(connection, DATABASE)
+    problems = []
+    for table in TABLES:
+        rows = describe_rows(table)
+        for label, clean_json in (
+            ("sections", convert_sections_to_clean_json(DATABASE, table, split_describe_formatted(rows))),
+            ("stream", parse_describe_stream(DATABASE, table, rows)),
+        ):
+            problems += [f"{table} ({label}) {d}" for d in _differences(clean_json, loaded.get(table))]
+    return problems
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keep", help="write the fixture metastore to this SQLite file")
+    args = parser.parse_args(argv)
+
+    connection = sqlite3.connect(args.keep or ":memory:")
+    try:
+        build_metastore(connection)
+        problems = check_parity(connection)
+        loaded = load_database_metadata(connection, DATABASE)
+    finally:
+        connection.close()
+    for problem in problems:
+        print(f"[ERROR] {problem}", file=sys.stderr)
+    print(json.dumps({t: loaded[t]["constraints"] for t in sorted(loaded)}, indent=2))
+    if problems:
+        sys.exit(1)
+    print(f"[INFO] Metastore backend matches DESCRIBE FORMATTED for {len(TABLES)} tables", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
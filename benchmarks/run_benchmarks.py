@@ -0,0 +1,205 @@
+"""
+Time each conversion stage over synthetic DESCRIBE FORMATTED fixtures.
+
+    python -m benchmarks.run_benchmarks --output bench.json [--scale 0.5] [--profile wide_5000_columns]
+
+Each stage is timed ``--repeat`` times (best run is reported) and then run once
+more under tracemalloc for its peak memory. Results are written as JSON so runs
+from different commits can be compared. A profile whose inputs cannot be
+prepared, or a stage that raises, is reported with its error instead of timings.
+Type strings that the parser once mishandled are checked against their
+expected mapping first; a mismatch is reported and fails the run.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.fixtures import PROFILES, generate_profile
+from connector.describe_stream import parse_describe_stream
+from connector.parse_constraints import parse_constraints
+from connector.section_fetching import split_describe_formatted
+from connector.utils import convert_sections_to_clean_json
+from convertor.constraint_handling import generate_all_constraints
+from convertor.datatype_mapping import TypeMapper
+from convertor.generate_databricks_ddl import generate_create_table_ddl
+from convertor.helper_methods import generate_properties_clause, infer_format
+
+
+def _prepare(tables: list) -> dict:
+    """Precompute every stage's input so each stage is timed on its own."""
+    prepared = []
+    for db, table, rows in tables:
+        sections = split_describe_formatted(rows)
+        clean_json = convert_sections_to_clean_json(db, table, sections)
+        prepared.append(
+            {
+                "db": db,
+                "table": table,
+                "rows": rows,
+                "sections": sections,
+                "constraints": sections.get("constraints", []) + sections.get("not_null_constraints", []),
+                "types": [c["type"] for c in clean_json["columns"] + clean_json["partitions"]],
+                "clean_json": clean_json,
+                "constraint_package": generate_all_constraints(f"{db}.{table}", clean_json),
+            }
+        )
+    return prepared
+
+
+def _ddl(t: dict) -> str:
+    clean_json = t["clean_json"]
+    storage_format = clean_json["storage_format"]
+    return generate_create_table_ddl(
+        table_name=f"{t['db']}.{t['table']}",
+        columns=clean_json["columns"],
+        partitions=clean_json["partitions"],
+        table_type=clean_json["table_type"],
+        location=clean_json["location"],
+        skewed_cols=storage_format["skewed_columns"],
+        file_format=infer_format(storage_format["input_format"]),
+    )
+
+
+# Hive type -> expected Databricks type, for parser regressions.
+TYPE_REGRESSIONS = {
+    # Parameters inside nested types used to be cut at the comma.
+    "struct<b:decimal(5,1)>": "STRUCT<b:DECIMAL(5,1)>",
+    "map<string,array<decimal(10,2)>>": "MAP<STRING, ARRAY<DECIMAL(10,2)>>",
+    # A backtick-quoted field name is one token, spaces and all.
+    "array<struct<`a b`:int>>": "ARRAY<STRUCT<`a b`:INT>>",
+}
+
+
+def check_type_mappings() -> list[str]:
+    """TYPE_REGRESSIONS entries that no longer map as expected."""
+    problems = []
+    for hive_type, expected in TYPE_REGRESSIONS.items():
+        actual = TypeMapper.map_type(hive_type)
+        if actual != expected:
+            problems.append(f"{hive_type}: expected {expected}, got {actual}")
+    return problems
+
+
+def _map_types(t: dict) -> None:
+    for hive_type in t["types"]:
+        TypeMapper.map_type(hive_type)
+
+
+STAGES = {
+    "split_describe_formatted": lambda t: split_describe_formatted(t["rows"]),
+    "convert_sections_to_clean_json": lambda t: convert_sections_to_clean_json(
+        t["db"], t["table"], t["sections"]
+    ),
+    "parse_describe_stream": lambda t: parse_describe_stream(t["db"], t["table"], iter(t["rows"])),
+    "parse_constraints": lambda t: parse_constraints(t["constraints"]),
+    "TypeMapper.map_type": _map_types,
+    "generate_create_table_ddl": _ddl,
+    "generate_properties_clause": lambda t: generate_properties_clause(
+        dict(t["clean_json"]["table_parameters"]),
+        t["constraint_package"],
+        t["clean_json"]["columns"],
+    ),
+}
+
+
+def _run_stage(stage, prepared: list) -> None:
+    if stage is _map_types:
+        # Time the parser, not a cache warmed by an earlier repetition.
+        TypeMapper.cache_clear()
+    for t in prepared:
+        stage(t)
+
+
+def time_stage(stage, prepared: list, repeat: int) -> dict:
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _run_stage(stage, prepared)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            _run_stage(stage, prepared)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+    return {
+        "seconds": round(best, 6),
+        "tables_per_sec": round(len(prepared) / best, 2) if best > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run(profiles: list[str], scale: float, repeat: int) -> dict:
+    results = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "repeat": repeat,
+        "type_regressions": check_type_mappings(),
+        "profiles": {},
+    }
+    for problem in results["type_regressions"]:
+        print(f"[ERROR] Type mapping regressed: {problem}", file=sys.stderr)
+    for name in profiles:
+        tables = generate_profile(name, scale)
+        try:
+            prepared = _prepare(tables)
+        except Exception as e:
+            # Timing the stages without their real inputs would measure another code path.
+            print(f"[ERROR] Could not prepare profile '{name}': {type(e).__name__}: {e}", file=sys.stderr)
+            results["profiles"][name] = {"tables": len(tables), "error": f"{type(e).__name__}: {e}"}
+            continue
+        print(f"[INFO] Benchmarking profile '{name}' ({len(prepared)} tables)", file=sys.stderr)
+        results["profiles"][name] = {
+            "tables": len(prepared),
+            "describe_rows": sum(len(t["rows"]) for t in prepared),
+            "stages": {
+                stage_name: time_stage(stage, prepared, repeat)
+                for stage_name, stage in STAGES.items()
+            },
+        }
+    return results
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES),
+                        help="profile to run (repeatable); default is all")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply the number of tables generated per profile")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    report = run(args.profile or list(PROFILES), args.scale, max(1, args.repeat))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    if report["type_regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
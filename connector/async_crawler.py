@@ -0,0 +1,242 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator
+
+from connector.connection_pool import HiveConnectionPool
+from connector.db_function import drain_cursor, list_databases, list_tables, stream_describe_formatted
+from connector.describe_stream import RowList
+from connector.resilience import ResilientFetcher
+from connector.utils import FAILED_STATES, FINISHED_STATE, QueryTimeout
+from pipeline.metrics import get_metrics
+from pipeline.table_filter import TableFilter
+
+
+class TokenBucket:
+    """Asyncio token bucket: ``rate`` tokens per second, bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncHiveCrawler:
+    """
+    Drives list_databases, list_tables and DESCRIBE FORMATTED from asyncio.
+
+    At most ``concurrency`` statements are in flight, and each HiveServer2 host
+    is limited to ``rate_per_second`` new statements (0 disables the limit).
+    By default the blocking connector calls run on a thread per in-flight
+    statement. With ``async_polling`` the DESCRIBE is submitted with pyhive's
+    ``async_=True`` and polled from the event loop, so a slow statement
+    occupies a pooled session but no thread. Either way rows are fetched in
+    fetchmany() batches and streamed into a sink. A ``fetcher`` adds its deadline,
+    retries and hedging to the threaded DESCRIBE path; the polling path only
+    applies its deadline. Every in-flight statement holds a session of
+    ``pool``, so the pool should have ``concurrency`` sessions.
+    """
+
+    def __init__(
+        self,
+        pool: HiveConnectionPool,
+        concurrency: int = 100,
+        rate_per_second: float = 0.0,
+        burst: float = None,
+        async_polling: bool = False,
+        poll_interval: float = 0.2,
+        fetcher: ResilientFetcher = None,
+    ):
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.async_polling = async_polling
+        self.poll_interval = poll_interval
+        self.fetcher = fetcher
+        if pool.size < self.concurrency:
+            print(
+                f"[INFO] async_crawler.concurrency is {self.concurrency} but the Hive pool has "
+                f"{pool.size} sessions; statements will wait for a free session"
+            )
+        self._buckets = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="hive-crawler"
+        )
+
+    @classmethod
+    def from_config(
+        cls, pool: HiveConnectionPool, config: dict, fetcher: ResilientFetcher = None
+    ) -> "AsyncHiveCrawler":
+        settings = config.get("async_crawler", {}) or {}
+        return cls(
+            pool,
+            concurrency=settings.get("concurrency", 100),
+            rate_per_second=settings.get("rate_per_second", 0),
+            burst=settings.get("burst"),
+            async_polling=settings.get("async_polling", False),
+            poll_interval=settings.get("poll_interval", 0.2),
+            fetcher=fetcher,
+        )
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_second, self.burst)
+        return bucket
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    async def _with_session(self, fn, *args):
+        await self._bucket(self.pool.config["host"]).acquire()
+
+        def call():
+            with self.pool.acquire() as conn:
+                return fn(conn, *args)
+
+        return await self._run(call)
+
+    @property
+    def _query_timeout(self) -> float:
+        return self.fetcher.query_timeout if self.fetcher is not None else None
+
+    async def list_databases(self) -> list[str]:
+        return await self._with_session(list_databases, self._query_timeout)
+
+    async def list_tables(self, database: str, like: str = None) -> list[str]:
+        return await self._with_session(list_tables, database, self._query_timeout, like)
+
+    async def list_jobs(
+        self, databases: list[str], table_filter: TableFilter = None, unlisted: set = None
+    ) -> list[tuple[str, str]]:
+        """List every database concurrently; jobs keep the order of ``databases``.
+        Databases whose listing failed are added to ``unlisted``."""
+        table_filter = table_filter or TableFilter()
+        listed = await asyncio.gather(
+            *(self.list_tables(db, table_filter.for_database(db).like_pattern()) for db in databases),
+            return_exceptions=True,
+        )
+        jobs = []
+        for db, tables in zip(databases, listed):
+            if isinstance(tables, Exception):
+                print(f"[ERROR] Failed to list tables in database '{db}': {tables}")
+                if unlisted is not None:
+                    unlisted.add(db)
+                continue
+            jobs.extend((db, table) for table in table_filter.filter_tables(db, tables))
+        return jobs
+
+    async def describe_formatted(self, database: str, table: str, sink=RowList):
+        """
+        DESCRIBE FORMATTED streamed into a new ``sink()`` (see
+        ResilientFetcher.describe), which is returned. Errors are raised.
+        """
+        if not self.async_polling:
+            if self.fetcher is not None:
+                await self._bucket(self.pool.config["host"]).acquire()
+                return await self._run(self.fetcher.describe, database, table, sink)
+            return await self._with_session(self._describe_on, database, table, sink)
+
+        await self._bucket(self.pool.config["host"]).acquire()
+        conn = await self._run(self.pool.lease)
+        failed = False
+        try:
+            return await self._describe_polling(conn, database, table, sink)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.pool.release(conn, failed)
+
+    def _describe_on(self, conn, database: str, table: str, sink):
+        rows = sink()
+        stream_describe_formatted(conn, database, table, rows.feed, self._query_timeout)
+        return rows
+
+    async def _describe_polling(self, conn, database: str, table: str, sink):
+        metrics = get_metrics()
+        start = time.perf_counter()
+        # Use a dedicated cursor rather than the session's shared one.
+        cursor = conn.hive._conn.cursor()
+        timeout = self._query_timeout
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            await self._run(cursor.execute, f"DESCRIBE FORMATTED {database}.{table}", async_=True)
+            while True:
+                state = (await self._run(cursor.poll)).operationState
+                if state == FINISHED_STATE:
+                    break
+                if state in FAILED_STATES:
+                    raise RuntimeError(f"operation ended in state {FAILED_STATES[state]}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    await self._run(cursor.cancel)
+                    raise QueryTimeout(f"DESCRIBE {database}.{table} exceeded {timeout}s deadline")
+                await asyncio.sleep(self.poll_interval)
+            metrics.record_stage("hive.describe_formatted", time.perf_counter() - start)
+            rows = sink()
+            await self._run(drain_cursor, cursor, rows.feed)
+        finally:
+            await self._run(cursor.close)
+        return rows
+
+    async def describe_all(
+        self, jobs: list[tuple[str, str]], sink=RowList
+    ) -> AsyncIterator[tuple[int, str, str, float, object, Exception]]:
+        """
+        Describe every ``(db, table)`` job and yield
+        ``(index, db, table, start, rows, error)`` as each one completes.
+        ``rows`` is the ``sink()`` the rows were streamed into (a list by
+        default), or None on error.
+
+        ``concurrency`` worker coroutines share the job list, so memory stays
+        bounded no matter how many tables are crawled.
+        """
+        results = asyncio.Queue(maxsize=self.concurrency * 2)
+        pending = iter(enumerate(jobs))
+        done = object()
+
+        async def worker():
+            try:
+                for idx, (db, table) in pending:
+                    start = time.perf_counter()
+                    try:
+                        rows = await self.describe_formatted(db, table, sink)
+                        await results.put((idx, db, table, start, rows, None))
+                    except Exception as e:
+                        await results.put((idx, db, table, start, None, e))
+            finally:
+                await results.put(done)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.concurrency, len(jobs)))]
+        remaining = len(workers)
+        try:
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from connector.connection import ConnectionToHive
+from connector.utils import backoff_delays
+
+
+class _ReusableCursor:
+    """Cursor proxy whose close() is a no-op so the session cursor is reused."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class PooledConnection:
+    """A ConnectionToHive session that hands out one reusable cursor."""
+
+    def __init__(self, config: dict):
+        self.hive = ConnectionToHive(config)
+        self._cursor = None
+        self.last_checked = 0.0
+
+    @property
+    def connected(self) -> bool:
+        return self.hive._conn is not None
+
+    def connect(self, attempts: int = 1, backoff_base: float = 0.5, backoff_max: float = 10.0) -> bool:
+        """Connect, retrying with jittered backoff; returns whether it succeeded."""
+        delays = backoff_delays(backoff_base, backoff_max)
+        for attempt in range(max(1, attempts)):
+            if attempt:
+                time.sleep(next(delays))
+            self.hive.connect()
+            if self.connected:
+                break
+        self._cursor = None
+        # A session that never connected must not skip its next health check.
+        self.last_checked = time.monotonic() if self.connected else 0.0
+        return self.connected
+
+    def cursor(self):
+        if not self.hive._conn:
+            raise ConnectionError("No active Hive connection")
+        if self._cursor is None:
+            self._cursor = _ReusableCursor(self.hive._conn.cursor())
+        return self._cursor
+
+    def is_healthy(self) -> bool:
+        try:
+            cursor = self.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            self.last_checked = time.monotonic()
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        if self._cursor is not None:
+            try:
+                self._cursor._cursor.close()
+            except Exception:
+                pass
+            self._cursor = None
+        self.hive.close()
+
+
+class HiveConnectionPool:
+    """
+    Fixed-size pool of Hive sessions built on ConnectionToHive.
+
+    Sessions are opened lazily, health-checked with ``SELECT 1`` when they have
+    been idle longer than ``pool_health_check_interval`` seconds (or after a
+    failed lease), and reconnected when the check fails. Connecting is retried
+    ``resilience.connect_retries`` times with jittered backoff; a session that
+    still cannot connect makes lease() raise ConnectionError and is retried on
+    its next lease instead of failing every later table.
+    """
+
+    def __init__(self, config: dict, size: int = None):
+        self.config = config
+        self.size = max(1, int(size or config.get("pool_size", 1)))
+        self.health_check_interval = float(
+            config.get("pool_health_check_interval", 60)
+        )
+        resilience = config.get("resilience", {}) or {}
+        self.connect_retries = int(resilience.get("connect_retries", 3))
+        self.backoff_base = float(resilience.get("retry_backoff_base", 0.5))
+        self.backoff_max = float(resilience.get("retry_backoff_max", 10))
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def _checkout(self, block: bool = True) -> PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.size:
+                # Connected by _ensure_healthy, outside the pool lock.
+                conn = PooledConnection(self.config)
+                self._all.append(conn)
+                return conn
+
+        if not block:
+            return None
+        return self._idle.get()
+
+    def _connect(self, conn: PooledConnection) -> None:
+        if not conn.connect(self.connect_retries, self.backoff_base, self.backoff_max):
+            raise ConnectionError(
+                f"Could not connect to Hive at {conn.hive.host}:{conn.hive.port}"
+            )
+
+    def _ensure_healthy(self, conn: PooledConnection) -> None:
+        if not conn.connected:
+            self._connect(conn)
+            return
+        if time.monotonic() - conn.last_checked < self.health_check_interval:
+            return
+        if not conn.is_healthy():
+            print(f"[INFO] Reconnecting unhealthy Hive session to {conn.hive.host}")
+            conn.close()
+            self._connect(conn)
+
+    def lease(self) -> PooledConnection:
+        """Check out a healthy session; hand it back with release()."""
+        return self._lease(self._checkout())
+
+    def try_lease(self) -> PooledConnection:
+        """Like lease(), but return None instead of waiting for a busy pool."""
+        conn = self._checkout(block=False)
+        return self._lease(conn) if conn is not None else None
+
+    def _lease(self, conn: PooledConnection) -> PooledConnection:
+        try:
+            self._ensure_healthy(conn)
+        except Exception:
+            self._idle.put(conn)
+            raise
+        return conn
+
+    def release(self, conn: PooledConnection, failed: bool = False) -> None:
+        if failed:
+            # Force a health check before this session is handed out again.
+            conn.last_checked = 0.0
+        self._idle.put(conn)
+
+    @contextmanager
+    def acquire(self):
+        conn = self.lease()
+        failed = False
+        try:
+            yield conn
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(conn, failed)
+
+    def close_all(self) -> None:
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+        self._idle = queue.LifoQueue()
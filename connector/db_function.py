@@ -1,27 +1,72 @@
-from connector.utils import execute
+from connector.utils import execute, run_statement
+from pipeline.metrics import get_metrics
 
-def list_databases(connection) -> list[str]:
+def list_databases(connection, timeout: float = None) -> list[str]:
     try:
-        return [r[0] for r in execute(connection, "SHOW DATABASES")]
+        with get_metrics().stage("hive.list_databases"):
+            return [r[0] for r in execute(connection, "SHOW DATABASES", timeout)]
     except Exception as e:
         print(f"[ERROR] Failed to list databases: {e}")
         return []
 
-def list_tables(connection, database) -> list[str]:
+def list_tables(connection, database, timeout: float = None, like: str = None) -> list[str]:
+    """SHOW TABLES; errors are raised, so a failed listing is never taken for an empty database."""
+    query = f"SHOW TABLES IN {database}"
+    if like:
+        query += f" LIKE '{like}'"
+    with get_metrics().stage("hive.list_tables"):
+        return [r[0] for r in execute(connection, query, timeout)]
+
+# DESCRIBE FORMATTED rows per fetchmany(); a 10k-column table takes about ten round trips.
+DESCRIBE_BATCH_SIZE = 1000
+
+def drain_cursor(cursor, feed, batch_size: int = DESCRIBE_BATCH_SIZE) -> int:
+    """Hand every remaining row of ``cursor`` to ``feed`` in fetchmany() batches; returns the row count."""
+    metrics = get_metrics()
+    count = 0
+    while True:
+        with metrics.stage("hive.fetchmany"):
+            rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return count
+        metrics.count_fetched(rows)
+        count += len(rows)
+        for row in rows:
+            feed(row)
+
+def stream_describe_formatted(
+    connection, database: str, table: str, feed, timeout: float = None, batch_size: int = DESCRIBE_BATCH_SIZE
+) -> int:
+    """
+    Hand DESCRIBE FORMATTED rows to ``feed`` as they are fetched, so a wide
+    table's rows are never all held at once; returns the row count. Errors are raised.
+    """
+    cursor = connection.cursor()
     try:
-        return [r[0] for r in execute(connection, f"SHOW TABLES IN {database}")]
-    except Exception as e:
-        print(f"[ERROR] Failed to list tables in database '{database}': {e}")
-        return []
+        with get_metrics().stage("hive.describe_formatted"):
+            run_statement(cursor, f"DESCRIBE FORMATTED {database}.{table}", timeout)
+        return drain_cursor(cursor, feed, batch_size)
+    finally:
+        cursor.close()
 
-def describe_formatted(connection, database: str, table: str) -> list[tuple]:
-    query = f"DESCRIBE FORMATTED {database}.{table}"
+def iter_partitions(
+    connection, database: str, table: str, batch_size: int = 1000, timeout: float = None
+):
+    """
+    Yield SHOW PARTITIONS specs (``ds=2024-01-01/hr=00``) in fetchmany() batches,
+    so memory stays constant however many partitions a table has. Errors are raised.
+    """
+    metrics = get_metrics()
     cursor = connection.cursor()
     try:
-        cursor.execute(query)
-        return cursor.fetchall()
-    except Exception as e:
-        print(f"[ERROR] Failed to describe table '{database}.{table}': {e}")
-        return []
+        with metrics.stage("hive.show_partitions"):
+            run_statement(cursor, f"SHOW PARTITIONS {database}.{table}", timeout)
+        while True:
+            with metrics.stage("hive.fetchmany"):
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row[0]
     finally:
         cursor.close()
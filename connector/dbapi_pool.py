@@ -0,0 +1,86 @@
+import importlib
+import queue
+from contextlib import contextmanager
+
+
+def connect_dbapi(settings: dict):
+    """
+    Open a DB-API connection described by ``{"driver": module, "connect_args": {...}}``,
+    e.g. ``{"driver": "databricks.sql", "connect_args": {"server_hostname": ...}}``.
+    """
+    driver = importlib.import_module(settings.get("driver", "sqlite3"))
+    return driver.connect(**(settings.get("connect_args", {}) or {}))
+
+
+class DbApiConnection:
+    """One pool slot; the DB-API connection is opened on first use and after close()."""
+
+    def __init__(self, connect):
+        self._connect = connect
+        self.connection = None
+
+    def execute(self, sql_text: str) -> None:
+        """Run and commit one statement; a failed one is rolled back before the error is raised."""
+        if self.connection is None:
+            self.connection = self._connect()
+        try:
+            cursor = self.connection.cursor()
+            try:
+                cursor.execute(sql_text)
+            finally:
+                cursor.close()
+            if hasattr(self.connection, "commit"):
+                self.connection.commit()
+        except Exception:
+            self.rollback()
+            raise
+
+    def rollback(self) -> None:
+        """Roll back an open transaction, so the next statement on this slot starts clean."""
+        if self.connection is None or not hasattr(self.connection, "rollback"):
+            return
+        try:
+            self.connection.rollback()
+        except Exception as e:
+            # The error being raised matters more; a broken connection is
+            # reopened after close().
+            print(f"[ERROR] Rollback failed: {e}")
+
+    def close(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+            self.connection = None
+
+
+class DbApiPool:
+    """
+    Fixed-size pool of DB-API connections for any driver (the target of
+    pipeline.apply_stage). Callers close() a slot after a transport error so
+    the next lease reconnects.
+    """
+
+    def __init__(self, connect, size: int = 4):
+        self.size = max(1, int(size))
+        self._idle = queue.LifoQueue()
+        self._all = [DbApiConnection(connect) for _ in range(self.size)]
+        for conn in self._all:
+            self._idle.put(conn)
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "DbApiPool":
+        return cls(lambda: connect_dbapi(settings), settings.get("pool_size", 4))
+
+    @contextmanager
+    def acquire(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close_all(self) -> None:
+        for conn in self._all:
+            conn.close()
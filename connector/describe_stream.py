@@ -0,0 +1,205 @@
+import ast
+import pickle
+from typing import Iterable
+from connector.parse_constraints import ConstraintParser
+from pipeline.metadata_cache import DescriptionFingerprint
+
+SECTION_HEADERS = {
+    "# Partition Information": "partitions",
+    "# Detailed Table Information": "table_info",
+    "# Storage Information": "storage_info",
+    "# SerDe Library": "serde_info",
+    "# Not Null Constraints": "not_null_constraints",
+    "# Constraints": "constraints",
+}
+
+# Rows per pickled chunk of a PackedDescription.
+PACK_ROWS = 1000
+
+# Labels that open a nested key/value block inside a section.
+PARAMS_START = {
+    "table_info": "Table Parameters:",
+    "storage_info": "Storage Desc Params:",
+}
+
+
+def _parse_list_string(value: str) -> list:
+    try:
+        return ast.literal_eval(value) if value else []
+    except Exception:
+        return [val.strip() for val in value.strip("[]").split(",") if val.strip()]
+
+
+class DescribeFormattedParser:
+    """
+    Single-pass state machine over DESCRIBE FORMATTED rows.
+
+    Produces the same dict as split_describe_formatted() followed by
+    convert_sections_to_clean_json(), without materialising the row sections.
+    Rows can be fed as they arrive from cursor.fetchmany().
+    """
+
+    def __init__(self, db: str, table: str):
+        self.db = db
+        self.table = table
+        self.section = "columns"
+        self.columns = []
+        self.partitions = []
+        self.kv = {"table_info": {}, "storage_info": {}}
+        self.params = {"table_info": {}, "storage_info": {}}
+        self.capturing = {"table_info": False, "storage_info": False}
+        self.constraints = ConstraintParser()
+        self._dispatch = {
+            "columns": self._column_row,
+            "partitions": self._partition_row,
+            "table_info": self._kv_row,
+            "storage_info": self._kv_row,
+            "constraints": self._constraint_row,
+            "not_null_constraints": self._constraint_row,
+        }
+
+    def _column_row(self, col0: str, col1: str, col2: str) -> None:
+        if col0.lower() != "# col_name":
+            self.columns.append({"name": col0, "type": col1, "comment": col2})
+
+    def _partition_row(self, col0: str, col1: str, col2: str) -> None:
+        if col0.lower() != "# col_name":
+            self.partitions.append({"name": col0, "type": col1, "comment": col2})
+
+    def _kv_row(self, col0: str, col1: str, col2: str) -> None:
+        section = self.section
+        if col0 and col1:
+            self.kv[section][col0.rstrip(":")] = col1
+
+        if col0 == PARAMS_START[section]:
+            self.capturing[section] = True
+        elif self.capturing[section]:
+            if col0:
+                self.params[section][col0] = col1
+            elif col1:
+                # Hive lists parameters as ("", key, value)
+                self.params[section][col1] = col2
+
+    def _constraint_row(self, col0: str, col1: str, col2: str) -> None:
+        self.constraints.feed((col0, col1, col2))
+
+    def feed(self, row) -> None:
+        if not isinstance(row, (list, tuple)) or len(row) < 2:
+            return
+
+        col0 = row[0].strip() if row[0] else ""
+        col1 = row[1].strip() if row[1] else ""
+        col2 = row[2].strip() if len(row) > 2 and row[2] else ""
+
+        section = SECTION_HEADERS.get(col0)
+        if section is not None:
+            self.section = section
+            if section == "not_null_constraints":
+                self.constraints.feed((col0, col1, col2))
+            return
+
+        if not col0 and not col1:
+            return
+
+        handler = self._dispatch.get(self.section)
+        if handler is not None:
+            handler(col0, col1, col2)
+
+    def result(self) -> dict:
+        table_info = self.kv["table_info"]
+        storage_info = self.kv["storage_info"]
+        return {
+            "database": self.db,
+            "table_name": self.table,
+            "location": table_info.get("Location", ""),
+            "table_type": table_info.get("Table Type", ""),
+            "columns": self.columns,
+            "partitions": self.partitions,
+            "storage_format": {
+                "input_format": storage_info.get("InputFormat", ""),
+                "output_format": storage_info.get("OutputFormat", ""),
+                "serde_library": storage_info.get("SerDe Library", ""),
+                "compressed": storage_info.get("Compressed", ""),
+                "bucket_columns": _parse_list_string(storage_info.get("Bucket Columns", "")),
+                "sort_columns": _parse_list_string(storage_info.get("Sort Columns", "")),
+                "num_buckets": int(storage_info.get("Num Buckets", "0")),
+                "stored_as_subdirectories": storage_info.get(
+                    "Stored As SubDirectories", ""
+                ).lower()
+                == "yes",
+                "skewed_columns": _parse_list_string(storage_info.get("Skewed Columns", "")),
+                "skewed_values": _parse_list_string(storage_info.get("Skewed Values", "")),
+                "desc_params": self.params["storage_info"],
+            },
+            "table_parameters": self.params["table_info"],
+            "meta": {
+                "owner": table_info.get("Owner", ""),
+                "created_at": table_info.get("CreateTime", ""),
+                "last_accessed": table_info.get("LastAccessTime", ""),
+                "retention": table_info.get("Retention", ""),
+            },
+            "constraints": self.constraints.result,
+        }
+
+
+class RowList(list):
+    """Fetched rows kept as a plain list; the sink interface of PackedDescription."""
+
+    feed = list.append
+
+
+class PackedDescription:
+    """
+    Sink for DESCRIBE FORMATTED rows as they are fetched. Each row is hashed
+    for the metadata cache (with ``fingerprint``) and rows are packed into
+    pickled chunks of ``PACK_ROWS``, so a fetched table waiting for a worker
+    costs about its text size instead of a tuple and string object per cell.
+    Iterating unpacks one chunk at a time, so parse_describe_stream() never
+    holds every row either; only the chunks are pickled to a worker process.
+    """
+
+    __slots__ = ("chunks", "rows", "fingerprint", "_pending")
+
+    def __init__(self, fingerprint: bool = True):
+        self.chunks = []
+        self.rows = 0
+        self.fingerprint = DescriptionFingerprint() if fingerprint else None
+        self._pending = []
+
+    def feed(self, row) -> None:
+        if self.fingerprint is not None:
+            self.fingerprint.feed(row)
+        self.rows += 1
+        self._pending.append(row)
+        if len(self._pending) >= PACK_ROWS:
+            self._pack()
+
+    def _pack(self) -> None:
+        if self._pending:
+            self.chunks.append(pickle.dumps(self._pending, pickle.HIGHEST_PROTOCOL))
+            self._pending = []
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from pickle.loads(chunk)
+        yield from self._pending
+
+    def __getstate__(self):
+        self._pack()
+        return self.chunks, self.rows
+
+    def __setstate__(self, state) -> None:
+        self.chunks, self.rows = state
+        self.fingerprint = None
+        self._pending = []
+
+
+def parse_describe_stream(db: str, table: str, rows: Iterable) -> dict:
+    parser = DescribeFormattedParser(db, table)
+    feed = parser.feed
+    for row in rows:
+        feed(row)
+    return parser.result()
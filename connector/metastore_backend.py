@@ -0,0 +1,307 @@
+import importlib
+import time
+from collections import defaultdict
+
+# Hive metastore KEY_CONSTRAINTS.CONSTRAINT_TYPE values
+PRIMARY_KEY = 0
+FOREIGN_KEY = 1
+UNIQUE_KEY = 2
+NOT_NULL = 3
+DEFAULT_VALUE = 4
+CHECK = 5
+
+# Every query is scoped to one database and returns rows for all of its tables.
+TABLES_QUERY = """
+SELECT t.TBL_ID, t.TBL_NAME, t.TBL_TYPE, t.OWNER, t.CREATE_TIME, t.LAST_ACCESS_TIME,
+       t.RETENTION, s.SD_ID, s.LOCATION, s.INPUT_FORMAT, s.OUTPUT_FORMAT,
+       s.IS_COMPRESSED, s.NUM_BUCKETS, s.IS_STOREDASSUBDIRECTORIES, s.SERDE_ID, d.SLIB
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+LEFT JOIN SDS s ON s.SD_ID = t.SD_ID
+LEFT JOIN SERDES d ON d.SERDE_ID = s.SERDE_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_NAME
+"""
+
+COLUMNS_QUERY = """
+SELECT t.TBL_ID, c.COLUMN_NAME, c.TYPE_NAME, c.COMMENT
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN SDS s ON s.SD_ID = t.SD_ID
+JOIN COLUMNS_V2 c ON c.CD_ID = s.CD_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, c.INTEGER_IDX
+"""
+
+PARTITION_KEYS_QUERY = """
+SELECT t.TBL_ID, k.PKEY_NAME, k.PKEY_TYPE, k.PKEY_COMMENT
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN PARTITION_KEYS k ON k.TBL_ID = t.TBL_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, k.INTEGER_IDX
+"""
+
+TABLE_PARAMS_QUERY = """
+SELECT t.TBL_ID, p.PARAM_KEY, p.PARAM_VALUE
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN TABLE_PARAMS p ON p.TBL_ID = t.TBL_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, p.PARAM_KEY
+"""
+
+SERDE_PARAMS_QUERY = """
+SELECT t.TBL_ID, p.PARAM_KEY, p.PARAM_VALUE
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN SDS s ON s.SD_ID = t.SD_ID
+JOIN SERDE_PARAMS p ON p.SERDE_ID = s.SERDE_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, p.PARAM_KEY
+"""
+
+BUCKET_COLS_QUERY = """
+SELECT t.TBL_ID, b.BUCKET_COL_NAME
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN BUCKETING_COLS b ON b.SD_ID = t.SD_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, b.INTEGER_IDX
+"""
+
+SORT_COLS_QUERY = """
+SELECT t.TBL_ID, c.COLUMN_NAME
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN SORT_COLS c ON c.SD_ID = t.SD_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, c.INTEGER_IDX
+"""
+
+SKEWED_COLS_QUERY = """
+SELECT t.TBL_ID, k.SKEWED_COL_NAME
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN SKEWED_COL_NAMES k ON k.SD_ID = t.SD_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, k.INTEGER_IDX
+"""
+
+SKEWED_VALUES_QUERY = """
+SELECT t.TBL_ID, v.STRING_LIST_ID_EID, l.STRING_LIST_VALUE
+FROM TBLS t
+JOIN DBS db ON db.DB_ID = t.DB_ID
+JOIN SKEWED_VALUES v ON v.SD_ID_OID = t.SD_ID
+JOIN SKEWED_STRING_LIST_VALUES l ON l.STRING_LIST_ID = v.STRING_LIST_ID_EID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, v.INTEGER_IDX, l.INTEGER_IDX
+"""
+
+# Hive stores a foreign key on its child table, columns in CHILD_*, and the
+# referenced column in PARENT_*. Every other constraint type is stored on the
+# parent side only (PARENT_TBL_ID, PARENT_CD_ID, PARENT_INTEGER_IDX) with
+# CHILD_TBL_ID NULL, so the owning table and column are picked per type
+# (CONSTRAINT_TYPE 1 is FOREIGN_KEY). A constraint on a partition column has
+# a NULL CD_ID and its INTEGER_IDX indexes PARTITION_KEYS.
+CONSTRAINTS_QUERY = """
+SELECT t.TBL_ID, k.CONSTRAINT_NAME, k.CONSTRAINT_TYPE, k.POSITION, k.DEFAULT_VALUE,
+       CASE WHEN k.CONSTRAINT_TYPE = 1 THEN COALESCE(cc.COLUMN_NAME, cpk.PKEY_NAME)
+            ELSE COALESCE(pc.COLUMN_NAME, ppk.PKEY_NAME) END,
+       pdb.NAME, pt.TBL_NAME, COALESCE(pc.COLUMN_NAME, ppk.PKEY_NAME)
+FROM KEY_CONSTRAINTS k
+JOIN TBLS t
+  ON t.TBL_ID = CASE WHEN k.CONSTRAINT_TYPE = 1 THEN k.CHILD_TBL_ID ELSE k.PARENT_TBL_ID END
+JOIN DBS db ON db.DB_ID = t.DB_ID
+LEFT JOIN COLUMNS_V2 cc
+       ON cc.CD_ID = k.CHILD_CD_ID AND cc.INTEGER_IDX = k.CHILD_INTEGER_IDX
+LEFT JOIN PARTITION_KEYS cpk
+       ON k.CHILD_CD_ID IS NULL AND cpk.TBL_ID = k.CHILD_TBL_ID AND cpk.INTEGER_IDX = k.CHILD_INTEGER_IDX
+LEFT JOIN COLUMNS_V2 pc
+       ON pc.CD_ID = k.PARENT_CD_ID AND pc.INTEGER_IDX = k.PARENT_INTEGER_IDX
+LEFT JOIN PARTITION_KEYS ppk
+       ON k.PARENT_CD_ID IS NULL AND ppk.TBL_ID = k.PARENT_TBL_ID AND ppk.INTEGER_IDX = k.PARENT_INTEGER_IDX
+LEFT JOIN TBLS pt ON pt.TBL_ID = k.PARENT_TBL_ID
+LEFT JOIN DBS pdb ON pdb.DB_ID = pt.DB_ID
+WHERE db.NAME = {p}
+ORDER BY t.TBL_ID, k.CONSTRAINT_NAME, k.POSITION
+"""
+
+
+def connect_metastore(config: dict):
+    """
+    Open a DB-API connection to the metastore database described by the
+    ``metastore`` section of creds.yaml, e.g.
+    ``{"driver": "pymysql", "placeholder": "%s", "connect_args": {...}}``.
+    """
+    driver = importlib.import_module(config.get("driver", "sqlite3"))
+    return driver.connect(**config.get("connect_args", {}))
+
+
+def _query(connection, sql_text: str, params: tuple = (), placeholder: str = "?"):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql_text.format(p=placeholder), params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def _format_time(epoch) -> str:
+    if not epoch:
+        return "UNKNOWN"
+    return time.strftime("%a %b %d %H:%M:%S %Z %Y", time.localtime(int(epoch)))
+
+
+def _group(rows) -> dict:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row[0]].append(row[1:])
+    return grouped
+
+
+def _empty_constraints() -> dict:
+    return {
+        "not_null": [],
+        "default": [],
+        "check": [],
+        "primary_key": None,
+        "unique": [],
+        "foreign_keys": [],
+    }
+
+
+def _constraints_by_table(rows, db: str, table_names: dict) -> dict:
+    """Rebuild the parse_constraints() structure for every table from KEY_CONSTRAINTS."""
+    result = {}
+    for tbl_id, name, ctype, position, value, column, pdb, ptable, pcolumn in rows:
+        full_name = f"{db}.{table_names.get(tbl_id, '')}"
+        data = result.setdefault(tbl_id, _empty_constraints())
+        if ctype == PRIMARY_KEY:
+            if data["primary_key"] is None:
+                data["primary_key"] = {
+                    "table": full_name,
+                    "constraint": name,
+                    "columns": [],
+                }
+            data["primary_key"]["columns"].append(column)
+        elif ctype == UNIQUE_KEY:
+            if not data["unique"] or data["unique"][-1]["constraint"] != name:
+                data["unique"].append({"table": full_name, "constraint": name, "columns": []})
+            data["unique"][-1]["columns"].append(column)
+        elif ctype == FOREIGN_KEY:
+            data["foreign_keys"].append(
+                {
+                    "table": full_name,
+                    "constraint": name,
+                    "column": column,
+                    "parent_column": f"{pdb}.{ptable}.{pcolumn}",
+                    "key_sequence": position,
+                }
+            )
+        elif ctype == NOT_NULL:
+            data["not_null"].append(
+                {"table": full_name, "column": column, "constraint": name}
+            )
+        elif ctype == DEFAULT_VALUE:
+            data["default"].append(
+                {
+                    "table": full_name,
+                    "column": column,
+                    "constraint": name,
+                    "default_value": value,
+                }
+            )
+        elif ctype == CHECK:
+            data["check"].append(
+                {"table": full_name, "constraint": name, "expression": value}
+            )
+    return result
+
+
+def list_metastore_databases(connection) -> list[str]:
+    try:
+        return [r[0] for r in _query(connection, "SELECT NAME FROM DBS ORDER BY NAME")]
+    except Exception as e:
+        print(f"[ERROR] Failed to list databases from metastore: {e}")
+        return []
+
+
+def load_database_metadata(
+    connection, database: str, placeholder: str = "?", table_filter=None
+) -> dict:
+    """
+    Bulk-load every table of ``database`` straight from the metastore schema.
+    Tables rejected by ``table_filter(name)`` are left out of the result.
+
+    Returns ``{table_name: clean_json}`` where each value has the same shape as
+    connector.utils.convert_sections_to_clean_json. The number of queries is
+    fixed per database, independent of how many tables it holds.
+    """
+    def run(sql_text):
+        return _query(connection, sql_text, (database,), placeholder)
+
+    try:
+        tables = run(TABLES_QUERY)
+        columns = _group(run(COLUMNS_QUERY))
+        partition_keys = _group(run(PARTITION_KEYS_QUERY))
+        table_params = _group(run(TABLE_PARAMS_QUERY))
+        serde_params = _group(run(SERDE_PARAMS_QUERY))
+        bucket_cols = _group(run(BUCKET_COLS_QUERY))
+        sort_cols = _group(run(SORT_COLS_QUERY))
+        skewed_cols = _group(run(SKEWED_COLS_QUERY))
+        skewed_values = _group(run(SKEWED_VALUES_QUERY))
+        table_names = {row[0]: row[1] for row in tables}
+        constraints = _constraints_by_table(run(CONSTRAINTS_QUERY), database, table_names)
+    except Exception as e:
+        print(f"[ERROR] Failed to load metastore metadata for '{database}': {e}")
+        return {}
+
+    result = {}
+    for (
+        tbl_id, name, tbl_type, owner, create_time, access_time, retention,
+        _sd_id, location, input_format, output_format, compressed, num_buckets,
+        subdirectories, _serde_id, serde_lib,
+    ) in tables:
+        if table_filter is not None and not table_filter(name):
+            continue
+        values_by_list = {}
+        for list_id, value in skewed_values.get(tbl_id, []):
+            values_by_list.setdefault(list_id, []).append(value)
+
+        result[name] = {
+            "database": database,
+            "table_name": name,
+            "location": location or "",
+            "table_type": tbl_type or "",
+            "columns": [
+                {"name": c, "type": t, "comment": comment or ""}
+                for c, t, comment in columns.get(tbl_id, [])
+            ],
+            "partitions": [
+                {"name": c, "type": t, "comment": comment or ""}
+                for c, t, comment in partition_keys.get(tbl_id, [])
+            ],
+            "storage_format": {
+                "input_format": input_format or "",
+                "output_format": output_format or "",
+                "serde_library": serde_lib or "",
+                "compressed": "Yes" if compressed else "No",
+                "bucket_columns": [c for (c,) in bucket_cols.get(tbl_id, [])],
+                "sort_columns": [c for (c,) in sort_cols.get(tbl_id, [])],
+                "num_buckets": int(num_buckets or 0),
+                "stored_as_subdirectories": bool(subdirectories),
+                "skewed_columns": [c for (c,) in skewed_cols.get(tbl_id, [])],
+                "skewed_values": list(values_by_list.values()),
+                "desc_params": dict(serde_params.get(tbl_id, [])),
+            },
+            "table_parameters": dict(table_params.get(tbl_id, [])),
+            "meta": {
+                "owner": owner or "",
+                "created_at": _format_time(create_time),
+                "last_accessed": _format_time(access_time),
+                "retention": str(retention or 0),
+            },
+            "constraints": constraints.get(tbl_id) or _empty_constraints(),
+        }
+    return result
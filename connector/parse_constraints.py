@@ -1,99 +1,196 @@
-def extract_foreign_key_data(col0: str, col1: str) -> tuple[str, str, int]:
-    """
-    Extracts parent column, child column, and key sequence from foreign key metadata.
-    """
-    try:
-        parent_column = None
-        column = None
-        key_sequence = None
+"""
+Constraint sections of DESCRIBE FORMATTED.
+
+Hive prints each constraint as a ``Table:`` and ``Constraint Name:`` row
+followed by one row per key column, made of ``Label:value`` cells:
+
+    # Primary Key
+    Table:                  sales.orders
+    Constraint Name:        pk_orders
+    Column Names:           order_id, line_no
+    # Foreign Keys
+    Parent Column Name:sales.customers.id   Column Name:customer_id   Key Sequence:1
+    # Unique Constraints
+    Column Name:order_ref   Key Sequence:1
+    # Not Null Constraints
+    Column Name:            customer_id
+    # Default Constraints
+    Column Name:status      Default Value:'new'
+    # Check Constraints
+    Column Name:amount      Check Value:amount > 0
+
+Each row is split into its labels once and dispatched on its first label.
+Rows of one constraint are grouped by constraint name, in key-sequence order.
+"""
+import re
 
-        # Split the string by multiple spaces or tabs
-        parts = col0.strip().split("  ")
+# Section headers inside "# Constraints" -> result key.
+SECTION_KINDS = {
+    "# Primary Key": "primary_key",
+    "# Foreign Keys": "foreign_keys",
+    "# Unique Constraints": "unique",
+    "# Not Null Constraints": "not_null",
+    "# Default Constraints": "default",
+    "# Check Constraints": "check",
+}
+LABELS = frozenset(
+    (
+        "Table",
+        "Constraint Name",
+        "Column Names",
+        "Column Name",
+        "Parent Column Name",
+        "Key Sequence",
+        "Default Value",
+        "Check Value",
+    )
+)
+# Some drivers return a whole row in one cell, its pairs separated by spaces.
+_PACKED_PAIR = re.compile(r"\s{2,}(?=(?:Parent Column Name|Column Name|Key Sequence|Default Value|Check Value):)")
+
+
+def split_fields(row) -> dict:
+    """``{label: value}`` for one row; a bare label takes the next cell as its value."""
+    fields, pending = {}, None
+    for cell in row:
+        if not cell:
+            continue
+        parts = _PACKED_PAIR.split(cell) if "  " in cell else (cell,)
         for part in parts:
-            if "Parent Column Name" in part:
-                parent_column = part.split(":", 1)[1].strip()
-            elif "Column Name" in part:
-                column = part.split(":", 1)[1].strip()
-            elif "Key Sequence" in part:
-                key_sequence = int(part.split(":", 1)[1].strip())
+            label, sep, value = part.partition(":")
+            label = label.strip()
+            if sep and label in LABELS:
+                value = value.strip()
+                fields[label] = value
+                pending = None if value else label
+            elif pending is not None:
+                fields[pending] = part.strip()
+                pending = None
+    return fields
 
-        return parent_column, column, key_sequence
 
-    except Exception as e:
-        print(f"[ERROR] Failed to extract foreign key data from '{col0}': {e}")
-        return "", "", -1
+def _key_sequence(value: str):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
-def parse_constraints(constraints_section: list[tuple]) -> dict:
-    result = {
-        "not_null": [],
-        "default": [],
-        "check": [],
-        "primary_key": None,
-        "foreign_keys": [],
-    }
+class ConstraintParser:
+    """Incremental form of parse_constraints(); rows are fed one at a time."""
 
-    current_table = None
+    def __init__(self):
+        self.section = None
+        self.table = None
+        self.constraint = None
+        self.not_null = []
+        self.default = []
+        self.check = []
+        self.foreign_keys = []
+        # (kind, constraint name) -> [table, [(key sequence, column), ...]]
+        self.keys = {}
+        # Rows that only set the current table or constraint, keyed by their whole first cell.
+        self._state_rows = {"Table:": self._table, "Constraint Name:": self._constraint_name}
+        self._handlers = {
+            "Column Names": self._column_names,
+            "Column Name": self._column,
+            "Parent Column Name": self._foreign_key,
+            "Default Value": self._column,
+            "Check Value": self._column,
+        }
 
-    for row in constraints_section:
-        if "Table:" in row[0]:
-            current_table = row[1]
-            continue
+    def feed(self, row: tuple) -> None:
+        """Feed one row; cells are expected stripped, as the section splitters leave them."""
+        first = row[0] if row else None
+        state = self._state_rows.get(first)
+        if state is not None:
+            state(row[1] if len(row) > 1 else None)
+            return
+        if first and first[0] == "#":
+            self.section = SECTION_KINDS.get(first, self.section)
+            return
+        fields = split_fields(row)
+        if not fields:
+            return
+        handler = self._handlers.get(next(iter(fields)))
+        if handler is not None:
+            handler(fields)
 
-        if "Constraint Name:" in row[0]:
-            constraint_name = row[1]
-            continue
+    def _table(self, value: str) -> None:
+        self.table = value
 
-        if "Column Name:" in row[0]:
-            column_name = row[1]
-            continue
+    def _constraint_name(self, value: str) -> None:
+        self.constraint = value
 
-        if "Default Value:" in row[0]:
-            result["default"].append(
-                {
-                    "table": current_table,
-                    "column": column_name,
-                    "constraint": constraint_name,
-                    "default_value": row[1],
-                }
-            )
+    def _add_key_column(self, kind: str, column: str, sequence=None) -> None:
+        table, columns = self.keys.setdefault((kind, self.constraint), [self.table, []])
+        columns.append((sequence if sequence is not None else len(columns) + 1, column))
 
-        elif "Check Value:" in row[0]:
-            result["check"].append(
-                {
-                    "table": current_table,
-                    "constraint": constraint_name,
-                    "expression": row[1],
-                }
-            )
+    def _column_names(self, fields: dict) -> None:
+        kind = "unique" if self.section == "unique" else "primary_key"
+        for column in fields["Column Names"].split(","):
+            if column.strip():
+                self._add_key_column(kind, column.strip())
 
-        elif "Key Sequence:" in row[0] and "Parent Column Name" in row[0]:
-            # Extract from full row[0] and row[1]
-            parent_col, column, key_seq = extract_foreign_key_data(row[0], row[1])
-            result["foreign_keys"].append(
+    def _foreign_key(self, fields: dict) -> None:
+        self.foreign_keys.append(
+            {
+                "table": self.table,
+                "constraint": self.constraint,
+                "column": fields.get("Column Name"),
+                "parent_column": fields["Parent Column Name"],
+                "key_sequence": _key_sequence(fields.get("Key Sequence")),
+            }
+        )
+
+    def _column(self, fields: dict) -> None:
+        column = fields.get("Column Name")
+        if "Default Value" in fields:
+            self.default.append(
                 {
-                    "table": current_table,
-                    "constraint": constraint_name,
+                    "table": self.table,
                     "column": column,
-                    "parent_column": parent_col,
-                    "key_sequence": key_seq,
+                    "constraint": self.constraint,
+                    "default_value": fields["Default Value"],
                 }
             )
+        elif "Check Value" in fields:
+            self.check.append(
+                {"table": self.table, "constraint": self.constraint, "expression": fields["Check Value"]}
+            )
+        elif self.section in ("primary_key", "unique") or "Key Sequence" in fields:
+            kind = "primary_key" if self.section == "primary_key" else "unique"
+            self._add_key_column(kind, column, _key_sequence(fields.get("Key Sequence")))
+        elif column:
+            self.not_null.append({"table": self.table, "column": column, "constraint": self.constraint})
 
-        elif "Column Names:" in row[0]:
-            result["primary_key"] = {
-                "table": current_table,
-                "constraint": constraint_name,
-                "columns": [c.strip() for c in row[1].split(",")],
-            }
-
-        elif "NOT NULL" in row[0] or "Not Null" in row[0]:
-            result["not_null"].append(
-                {
-                    "table": current_table,
-                    "column": column_name,
-                    "constraint": constraint_name,
-                }
+    @property
+    def result(self) -> dict:
+        """Constraints in the clean-JSON form (see convertor.catalog.CONSTRAINT_KEYS)."""
+        keys = {"primary_key": [], "unique": []}
+        for (kind, name), (table, columns) in self.keys.items():
+            columns.sort(key=lambda item: item[0])
+            keys[kind].append({"table": table, "constraint": name, "columns": [c for _, c in columns]})
+        foreign_keys = self.foreign_keys
+        if any(fk["key_sequence"] is not None for fk in foreign_keys):
+            order = {}
+            for fk in foreign_keys:
+                order.setdefault(fk["constraint"], len(order))
+            foreign_keys = sorted(
+                foreign_keys, key=lambda fk: (order[fk["constraint"]], fk["key_sequence"] or 0)
             )
+        return {
+            "not_null": self.not_null,
+            "default": self.default,
+            "check": self.check,
+            "primary_key": keys["primary_key"][0] if keys["primary_key"] else None,
+            "unique": keys["unique"],
+            "foreign_keys": foreign_keys,
+        }
 
-    return result
+
+def parse_constraints(constraints_section: list[tuple]) -> dict:
+    parser = ConstraintParser()
+    for row in constraints_section:
+        parser.feed(row)
+    return parser.result
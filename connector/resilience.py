@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from connector.connection_pool import HiveConnectionPool, PooledConnection
+from connector.db_function import stream_describe_formatted
+from connector.describe_stream import RowList
+from connector.utils import backoff_delays, is_retryable
+from pipeline.metrics import get_metrics
+
+
+class LatencyTracker:
+    """Rolling window of recent DESCRIBE latencies used to pick the hedge delay."""
+
+    def __init__(self, window: int = 512, min_samples: int = 50):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float:
+        """The ``p`` quantile (0-1), or None until ``min_samples`` were observed."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class ResilientFetcher:
+    """
+    DESCRIBE FORMATTED over a HiveConnectionPool with a per-statement
+    deadline, retries with jittered backoff and optional hedging.
+
+    A timed-out statement is cancelled on the server. Timeouts and
+    connection failures are retried up to ``retries`` times; the failed
+    session is health-checked (and reconnected) before it is leased again.
+    With ``hedge_percentile`` set, a request still running after that
+    percentile of recent latencies is duplicated and the first answer wins.
+    Hedges run on their own pool of ``hedge_sessions`` sessions, since the
+    crawl keeps every session of ``pool`` busy; a hedge never waits for a
+    session, so at most ``hedge_sessions`` run at a time.
+    """
+
+    def __init__(
+        self,
+        pool: HiveConnectionPool,
+        query_timeout: float = None,
+        retries: int = 0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        hedge_percentile: float = None,
+        hedge_min_samples: int = 50,
+        hedge_sessions: int = 2,
+    ):
+        self.pool = pool
+        self.query_timeout = query_timeout or None
+        self.retries = max(0, retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile or None
+        self.latency = LatencyTracker(min_samples=hedge_min_samples)
+        self.hedge_pool = None
+        self._executor = None
+        if self.hedge_percentile:
+            self.hedge_pool = HiveConnectionPool(pool.config, max(1, hedge_sessions))
+            # Primaries and hedges of the in-flight requests, plus losers still running.
+            self._executor = ThreadPoolExecutor(
+                max_workers=(pool.size + self.hedge_pool.size) * 2, thread_name_prefix="hive-hedge"
+            )
+
+    @classmethod
+    def from_config(cls, pool: HiveConnectionPool, config: dict) -> "ResilientFetcher":
+        settings = config.get("resilience", {}) or {}
+        return cls(
+            pool,
+            query_timeout=settings.get("query_timeout", 0),
+            retries=settings.get("retries", 0),
+            backoff_base=settings.get("retry_backoff_base", 0.5),
+            backoff_max=settings.get("retry_backoff_max", 10),
+            hedge_percentile=settings.get("hedge_percentile", 0),
+            hedge_min_samples=settings.get("hedge_min_samples", 50),
+            hedge_sessions=settings.get("hedge_sessions", 2),
+        )
+
+    def describe(self, database: str, table: str, sink=RowList):
+        """
+        DESCRIBE FORMATTED streamed into a fresh ``sink()`` per attempt (any
+        object with ``feed(row)``; a list of rows by default). Returns the sink
+        of the attempt that succeeded; raises once every retry has failed.
+        """
+        delays = backoff_delays(self.backoff_base, self.backoff_max)
+        for attempt in range(self.retries + 1):
+            try:
+                return self._attempt(database, table, sink)
+            except Exception as e:
+                if attempt == self.retries or not is_retryable(e):
+                    raise
+                delay = next(delays)
+                print(
+                    f"[INFO] DESCRIBE {database}.{table} failed ({e}); "
+                    f"retry {attempt + 1}/{self.retries} in {delay:.1f}s"
+                )
+                get_metrics().count("hive.retries")
+                time.sleep(delay)
+
+    def _attempt(self, database: str, table: str, sink):
+        threshold = self.latency.percentile(self.hedge_percentile) if self._executor else None
+        if threshold is None:
+            return self._describe_on(self.pool, self.pool.lease(), database, table, sink)
+
+        primary = self._executor.submit(self._describe_leased, database, table, sink)
+        done, _ = wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        try:
+            conn = self.hedge_pool.try_lease()
+        except ConnectionError:
+            conn = None
+        if conn is None:
+            return primary.result()
+        get_metrics().count("hive.hedges")
+        hedge = self._executor.submit(self._describe_on, self.hedge_pool, conn, database, table, sink)
+
+        # First successful answer wins; the loser finishes in the background
+        # and returns its session to the pool.
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        get_metrics().count("hive.hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _describe_leased(self, database: str, table: str, sink):
+        return self._describe_on(self.pool, self.pool.lease(), database, table, sink)
+
+    def _describe_on(
+        self, pool: HiveConnectionPool, conn: PooledConnection, database: str, table: str, sink
+    ):
+        start = time.perf_counter()
+        failed = False
+        rows = sink()
+        try:
+            stream_describe_formatted(conn, database, table, rows.feed, self.query_timeout)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            pool.release(conn, failed)
+        self.latency.observe(time.perf_counter() - start)
+        return rows
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        if self.hedge_pool is not None:
+            self.hedge_pool.close_all()
@@ -0,0 +1,262 @@
+"""
+Parallel walker over table storage locations on mounted filesystems.
+
+DESCRIBE FORMATTED only reports where a table lives; the files themselves
+are counted here, for the sizing report and small-file detection. Locations
+are read through ``file://`` URIs, absolute paths, or a ``mounts`` mapping
+from a location prefix to its local mount:
+
+    mounts: {"hdfs://nameservice1/warehouse": "/mnt/hdfs/warehouse"}
+
+Each directory is one task. Workers push the subdirectories they find onto
+their own deque and take work LIFO from it, so a worker stays inside one
+subtree; an idle worker steals the oldest task of another worker, which is
+the biggest subtree left. Names starting with "." or "_" (_SUCCESS,
+.hive-staging, _temporary) are skipped, as Hive skips them.
+
+With a cache, a directory whose mtime is unchanged is not listed again: its
+files and subdirectories are taken from the last scan. A directory's mtime
+changes whenever an entry is added, removed or renamed in it, which covers
+how Hive writes data.
+"""
+import bisect
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from pipeline import json_codec
+
+# Upper bounds of the file-size histogram buckets; the last bucket is open.
+SIZE_BUCKETS = (1 << 20, 8 << 20, 32 << 20, 128 << 20, 512 << 20, 1 << 30)
+SIZE_BUCKET_LABELS = ("<1 MB", "1-8 MB", "8-32 MB", "32-128 MB", "128-512 MB", "512 MB-1 GB", ">=1 GB")
+
+
+def local_path(location: str, mounts: Dict[str, str] = None) -> Optional[str]:
+    """The local path of ``location``, or None when it is not on a mounted filesystem."""
+    if not location:
+        return None
+    for prefix, mount in sorted((mounts or {}).items(), key=lambda item: -len(item[0])):
+        if location == prefix or location.startswith(prefix.rstrip("/") + "/"):
+            return os.path.join(mount, location[len(prefix):].lstrip("/"))
+    if location.startswith("file://"):
+        return location[len("file://"):] or None
+    if location.startswith("file:"):
+        return location[len("file:"):] or None
+    return location if location.startswith("/") else None
+
+
+class StorageStats:
+    """Files under one table location."""
+
+    __slots__ = ("files", "bytes", "directories", "partition_dirs", "histogram", "errors", "error")
+
+    def __init__(self, files: int = 0, bytes: int = 0, directories: int = 0, partition_dirs: int = 0,
+                 histogram: List[int] = None, errors: int = 0, error: str = ""):
+        self.files = files
+        self.bytes = bytes
+        self.directories = directories
+        self.partition_dirs = partition_dirs
+        self.histogram = list(histogram) if histogram else [0] * len(SIZE_BUCKET_LABELS)
+        self.errors = errors
+        self.error = error
+
+    def merge(self, other: "StorageStats") -> None:
+        self.files += other.files
+        self.bytes += other.bytes
+        self.directories += other.directories
+        self.partition_dirs += other.partition_dirs
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.errors += other.errors
+        self.error = self.error or other.error
+
+    @property
+    def average_file_size(self) -> Optional[float]:
+        return self.bytes / self.files if self.files else None
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StorageStats":
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def __repr__(self) -> str:
+        return f"StorageStats(files={self.files}, bytes={self.bytes}, errors={self.errors})"
+
+
+class DirectoryCache:
+    """
+    Listing results per directory, keyed by table location and then by path
+    relative to it. Each scan replaces a location's entries, so directories
+    that were removed drop out.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.locations: Dict[str, Dict[str, dict]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.locations = json_codec.loads(f.read()).get("locations", {})
+            except Exception as e:
+                print(f"[ERROR] Ignoring unreadable storage scan cache '{path}': {e}")
+        self.hits = 0
+        self.misses = 0
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+            f.write(json_codec.dumps({"locations": self.locations}))
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+class StorageScanner:
+    """Scans table locations with ``workers`` threads; see the module docstring."""
+
+    def __init__(self, workers: int = 16, cache: DirectoryCache = None, mounts: Dict[str, str] = None):
+        self.workers = max(1, workers)
+        self.cache = cache
+        self.mounts = mounts or {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "StorageScanner":
+        settings = config.get("storage_scan", {}) or {}
+        cache_path = settings.get("cache_path", "")
+        return cls(
+            settings.get("workers", 16),
+            DirectoryCache(cache_path) if cache_path else None,
+            settings.get("mounts") or {},
+        )
+
+    def scan(self, locations: Dict[tuple, str]) -> Dict[tuple, StorageStats]:
+        """``{key: location}`` -> ``{key: StorageStats}`` for every location on a local path."""
+        roots = {}
+        for key, location in locations.items():
+            path = local_path(location, self.mounts)
+            if path is not None:
+                roots[key] = (location, path.rstrip("/") or "/")
+        if not roots:
+            return {}
+
+        queues = [deque() for _ in range(self.workers)]
+        state = {"pending": 0, "idle": 0}
+        cond = threading.Condition()
+        listings: List[Dict[str, Dict[str, dict]]] = [{} for _ in range(self.workers)]
+        partials: List[Dict[tuple, StorageStats]] = [{} for _ in range(self.workers)]
+        cached = self.cache.locations if self.cache is not None else {}
+
+        def push(worker: int, task: tuple) -> None:
+            with cond:
+                state["pending"] += 1
+                queues[worker].append(task)
+                if state["idle"]:
+                    cond.notify()
+
+        def next_task(worker: int) -> Optional[tuple]:
+            own = queues[worker]
+            while True:
+                try:
+                    return own.pop()
+                except IndexError:
+                    pass
+                for offset in range(1, self.workers):
+                    try:
+                        return queues[(worker + offset) % self.workers].popleft()
+                    except IndexError:
+                        continue
+                with cond:
+                    if state["pending"] == 0:
+                        return None
+                    if any(queues):
+                        continue
+                    state["idle"] += 1
+                    cond.wait()
+                    state["idle"] -= 1
+
+        def run(worker: int) -> None:
+            while True:
+                task = next_task(worker)
+                if task is None:
+                    return
+                try:
+                    self._scan_directory(worker, task, push, cached, listings[worker], partials[worker])
+                finally:
+                    with cond:
+                        state["pending"] -= 1
+                        if state["pending"] == 0:
+                            cond.notify_all()
+
+        for i, (key, (location, path)) in enumerate(roots.items()):
+            push(i % self.workers, (key, location, path, ""))
+        threads = [
+            threading.Thread(target=run, args=(i,), name=f"storage-scan-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results = {key: StorageStats() for key in roots}
+        for partial in partials:
+            for key, stats in partial.items():
+                results[key].merge(stats)
+        if self.cache is not None:
+            scanned = {}
+            for listing in listings:
+                for location, entries in listing.items():
+                    scanned.setdefault(location, {}).update(entries)
+            self.cache.locations.update(scanned)
+        return results
+
+    def _scan_directory(self, worker: int, task: tuple, push, cached: dict, listing: dict, partial: dict) -> None:
+        key, location, root, relative = task
+        path = os.path.join(root, relative) if relative else root
+        stats = partial.get(key)
+        if stats is None:
+            stats = partial[key] = StorageStats()
+        try:
+            mtime = os.stat(path).st_mtime_ns  # before listing, so a concurrent change is seen next time
+            entry = cached.get(location, {}).get(relative)
+            if entry is not None and entry["mtime"] == mtime:
+                if self.cache is not None:
+                    self.cache.hits += 1
+            else:
+                entry = self._list(path, mtime)
+                if self.cache is not None:
+                    self.cache.misses += 1
+        except OSError as e:
+            stats.errors += 1
+            stats.error = stats.error or f"{path}: {e.strerror or e}"
+            return
+
+        listing.setdefault(location, {})[relative] = entry
+        stats.directories += 1
+        stats.files += entry["files"]
+        stats.bytes += entry["bytes"]
+        stats.histogram = [a + b for a, b in zip(stats.histogram, entry["histogram"])]
+        subdirs = entry["subdirs"]
+        # key=value directories with no key=value below them are partitions.
+        if "=" in os.path.basename(path) and not any("=" in name for name in subdirs):
+            stats.partition_dirs += 1
+        for name in subdirs:
+            push(worker, (key, location, root, os.path.join(relative, name) if relative else name))
+
+    @staticmethod
+    def _list(path: str, mtime: int) -> dict:
+        files = size_total = 0
+        histogram = [0] * len(SIZE_BUCKET_LABELS)
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name[0] in "._":
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    size = entry.stat().st_size
+                    files += 1
+                    size_total += size
+                    histogram[bisect.bisect_right(SIZE_BUCKETS, size)] += 1
+        return {"mtime": mtime, "files": files, "bytes": size_total, "histogram": histogram, "subdirs": subdirs}
@@ -1,13 +1,73 @@
 import ast
+import random
+import time
 from connector.parse_constraints import parse_constraints
 
-def execute(connection, sql_text: str):
+# TCLIService TOperationState values
+FINISHED_STATE = 2
+FAILED_STATES = {3: "CANCELED", 4: "CLOSED", 5: "ERROR", 6: "UNKNOWN", 8: "TIMEDOUT"}
+
+
+class QueryTimeout(TimeoutError):
+    """A statement did not finish before its deadline and was cancelled."""
+
+
+def is_retryable(error: Exception) -> bool:
+    """Timeouts and transport/session failures are retried; Hive query errors are not."""
+    if isinstance(error, (QueryTimeout, ConnectionError, EOFError, OSError)):
+        return True
+    # thrift's TTransportException does not derive from OSError.
+    return type(error).__name__ == "TTransportException"
+
+
+def backoff_delays(base: float = 0.5, cap: float = 10.0):
+    """Endless "full jitter" exponential backoff: uniform(0, min(cap, base * 2**n))."""
+    attempt = 0
+    while True:
+        yield random.uniform(0, min(cap, base * (2 ** attempt)))
+        attempt += 1
+
+
+def run_statement(cursor, sql_text: str, timeout: float = None, poll_interval: float = 0.05) -> None:
+    """
+    Execute ``sql_text`` on ``cursor``, cancelling it after ``timeout`` seconds.
+
+    With a timeout the statement is submitted with pyhive's ``async_=True`` and
+    polled until it finishes; cursors without poll() run it blocking.
+    """
+    if not timeout or not hasattr(cursor, "poll"):
+        cursor.execute(sql_text)
+        return
+
+    deadline = time.monotonic() + timeout
+    cursor.execute(sql_text, async_=True)
+    delay = poll_interval
+    while True:
+        status = cursor.poll()
+        state = status.operationState
+        if state == FINISHED_STATE:
+            return
+        if state in FAILED_STATES:
+            message = getattr(status, "errorMessage", None) or f"operation ended in state {FAILED_STATES[state]}"
+            raise RuntimeError(message)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            try:
+                cursor.cancel()
+            except Exception as e:
+                print(f"[ERROR] Failed to cancel timed out statement: {e}")
+            raise QueryTimeout(f"Query exceeded {timeout}s deadline: {sql_text}")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 1.0)
+
+
+def execute(connection, sql_text: str, timeout: float = None):
     if not connection:
         raise RuntimeError("No active Hive connection")
 
     cursor = connection.cursor()
     try:
-        cursor.execute(sql_text)
+        run_statement(cursor, sql_text, timeout)
         return cursor.fetchall()
     finally:
         cursor.close()
@@ -47,13 +107,21 @@ def convert_sections_to_clean_json(db: str, table: str, sections: dict) -> dict:
             if k.strip() == start_key:
                 capture = True
                 continue
-            if capture and k.strip():
+            if not capture:
+                continue
+            if k.strip():
                 result[k.strip()] = v.strip()
+            elif v and v.strip() and len(row) > 2:
+                # Hive lists parameters as ("", key, value)
+                result[v.strip()] = (row[2] or "").strip()
         return result
 
     # Extract constraints
-    constraints_raw = sections.get("constraints", []) + sections.get(
-        "not_null_constraints", []
+    # "# Not Null Constraints" opens its own section; the parser needs the header back.
+    constraints_raw = (
+        sections.get("constraints", [])
+        + [("# Not Null Constraints", "", "")]
+        + sections.get("not_null_constraints", [])
     )
     constraint_data = parse_constraints(constraints_raw)
 
@@ -0,0 +1,267 @@
+"""
+Compact in-memory catalog model.
+
+A clean-JSON table document is a tree of dicts and lists. Holding tens of
+thousands of them for cross-table work costs several GB, mostly dict
+overhead and duplicate strings. These records use ``__slots__`` and intern
+their repeated strings (types, comments, owners, formats, constraint
+targets). Table.from_dict()/to_dict() convert losslessly to and from the
+clean-JSON format.
+"""
+import sys
+from typing import Any, Dict, Optional
+
+# JSON keys of each constraint kind, in the order parse_constraints emits them.
+CONSTRAINT_KEYS = {
+    "not_null": ("table", "column", "constraint"),
+    "default": ("table", "column", "constraint", "default_value"),
+    "check": ("table", "constraint", "expression"),
+    "primary_key": ("table", "constraint", "columns"),
+    "unique": ("table", "constraint", "columns"),
+    "foreign_keys": ("table", "constraint", "column", "parent_column", "key_sequence"),
+}
+
+STORAGE_LIST_KEYS = ("bucket_columns", "sort_columns", "skewed_columns", "skewed_values")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_list(values) -> tuple:
+    return tuple(_intern(v) for v in values or ())
+
+
+class Partition:
+    __slots__ = ("name", "type", "comment")
+
+    def __init__(self, name: str, type: str, comment: str = ""):
+        self.name = _intern(name)
+        self.type = _intern(type)
+        self.comment = _intern(comment)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Partition":
+        return cls(data.get("name"), data.get("type"), data.get("comment", ""))
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "type": self.type, "comment": self.comment}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r}, {self.type!r})"
+
+
+class Column(Partition):
+    """A data column; ``not_null``/``default`` are set once constraints are folded in."""
+
+    __slots__ = ("not_null", "default")
+
+    def __init__(
+        self, name: str, type: str, comment: str = "", not_null: bool = None, default: str = None
+    ):
+        super().__init__(name, type, comment)
+        self.not_null = not_null
+        self.default = default
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Column":
+        return cls(
+            data.get("name"),
+            data.get("type"),
+            data.get("comment", ""),
+            data.get("not_null"),
+            data.get("default"),
+        )
+
+    def update(self, modifications: dict) -> None:
+        """Apply extract_column_constraints() output for this column."""
+        if "not_null" in modifications:
+            self.not_null = modifications["not_null"]
+        if "default" in modifications:
+            self.default = modifications["default"]
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        if self.not_null is not None:
+            data["not_null"] = self.not_null
+        if self.default is not None:
+            data["default"] = self.default
+        return data
+
+
+class StorageFormat:
+    __slots__ = (
+        "input_format",
+        "output_format",
+        "serde_library",
+        "compressed",
+        "bucket_columns",
+        "sort_columns",
+        "num_buckets",
+        "stored_as_subdirectories",
+        "skewed_columns",
+        "skewed_values",
+        "desc_params",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            value = fields.get(name)
+            if name in STORAGE_LIST_KEYS:
+                value = _intern_list(value)
+            elif name == "desc_params":
+                value = {_intern(k): _intern(v) for k, v in (value or {}).items()}
+            elif name == "num_buckets":
+                value = value or 0
+            elif name == "stored_as_subdirectories":
+                value = bool(value)
+            else:
+                value = _intern(value or "")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StorageFormat":
+        return cls(**(data or {}))
+
+    def to_dict(self) -> dict:
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if name in STORAGE_LIST_KEYS:
+                value = list(value)
+            elif name == "desc_params":
+                value = dict(value)
+            data[name] = value
+        return data
+
+
+class Constraint:
+    """One constraint record; which fields are used depends on ``kind`` (see CONSTRAINT_KEYS)."""
+
+    __slots__ = (
+        "kind",
+        "table",
+        "constraint",
+        "column",
+        "columns",
+        "default_value",
+        "expression",
+        "parent_column",
+        "key_sequence",
+    )
+
+    def __init__(self, kind: str, **fields):
+        if kind not in CONSTRAINT_KEYS:
+            raise ValueError(f"Unknown constraint kind '{kind}'")
+        self.kind = kind
+        for name in self.__slots__[1:]:
+            value = fields.get(name)
+            if name == "columns" and value is not None:
+                value = _intern_list(value)
+            setattr(self, name, _intern(value))
+
+    @classmethod
+    def from_dict(cls, kind: str, data: dict) -> "Constraint":
+        return cls(kind, **data)
+
+    def to_dict(self) -> dict:
+        data = {key: getattr(self, key) for key in CONSTRAINT_KEYS[self.kind]}
+        if data.get("columns") is not None:
+            data["columns"] = list(data["columns"])
+        return data
+
+    def __repr__(self) -> str:
+        return f"Constraint({self.kind!r}, {self.table!r}, {self.constraint!r})"
+
+
+class Table:
+    __slots__ = (
+        "database",
+        "table_name",
+        "location",
+        "table_type",
+        "columns",
+        "partitions",
+        "storage_format",
+        "table_parameters",
+        "meta",
+        "constraints",
+    )
+
+    def __init__(
+        self,
+        database: str,
+        table_name: str,
+        location: str = "",
+        table_type: str = "",
+        columns: tuple = (),
+        partitions: tuple = (),
+        storage_format: StorageFormat = None,
+        table_parameters: Optional[Dict[str, str]] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        constraints: tuple = (),
+    ):
+        self.database = _intern(database)
+        self.table_name = _intern(table_name)
+        self.location = location
+        self.table_type = _intern(table_type)
+        self.columns = tuple(columns)
+        self.partitions = tuple(partitions)
+        self.storage_format = storage_format or StorageFormat()
+        self.table_parameters = {_intern(k): v for k, v in (table_parameters or {}).items()}
+        self.meta = {_intern(k): _intern(v) for k, v in (meta or {}).items()}
+        self.constraints = tuple(constraints)
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.database}.{self.table_name}"
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Table":
+        constraints = []
+        for kind, entries in (data.get("constraints") or {}).items():
+            if entries is None:
+                continue
+            if kind == "primary_key":
+                entries = [entries]
+            constraints.extend(Constraint.from_dict(kind, entry) for entry in entries)
+        return cls(
+            database=data.get("database", ""),
+            table_name=data.get("table_name", ""),
+            location=data.get("location", ""),
+            table_type=data.get("table_type", ""),
+            columns=[Column.from_dict(c) for c in data.get("columns", [])],
+            partitions=[Partition.from_dict(p) for p in data.get("partitions", [])],
+            storage_format=StorageFormat.from_dict(data.get("storage_format")),
+            table_parameters=data.get("table_parameters"),
+            meta=data.get("meta"),
+            constraints=constraints,
+        )
+
+    def constraints_dict(self) -> dict:
+        """The ``constraints`` section in parse_constraints() form."""
+        result = {kind: [] for kind in CONSTRAINT_KEYS}
+        result["primary_key"] = None
+        for c in self.constraints:
+            if c.kind == "primary_key":
+                result["primary_key"] = c.to_dict()
+            else:
+                result[c.kind].append(c.to_dict())
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "database": self.database,
+            "table_name": self.table_name,
+            "location": self.location,
+            "table_type": self.table_type,
+            "columns": [c.to_dict() for c in self.columns],
+            "partitions": [p.to_dict() for p in self.partitions],
+            "storage_format": self.storage_format.to_dict(),
+            "table_parameters": dict(self.table_parameters),
+            "meta": dict(self.meta),
+            "constraints": self.constraints_dict(),
+        }
+
+    def __repr__(self) -> str:
+        return f"Table({self.full_name!r}, columns={len(self.columns)})"
@@ -0,0 +1,278 @@
+"""
+Catalog-wide index for cross-table constraint work.
+
+Per-table DDL only sees one table, so a foreign key's parent table is never
+resolved and ALTER statements come out in file order. CatalogIndex holds the
+whole crawled catalog (as compact catalog.Table records) with dict lookups
+from table to columns, keys and constraints, groups multi-column foreign keys
+by key_sequence and builds a MigrationPlan: every PRIMARY KEY, then every
+FOREIGN KEY, applied in one pass after all tables exist, parents first.
+"""
+import heapq
+from typing import Dict, List, Optional, Union
+
+from convertor.catalog import Column, Constraint, Table
+from convertor import constraint_handling, identifiers
+from convertor.constraint_handling import generate_alter_statements
+
+
+class ForeignKey:
+    """A foreign key with its columns ordered by key_sequence and its parent resolved."""
+
+    __slots__ = ("table", "constraint_name", "columns", "reference_table", "reference_columns")
+
+    def __init__(self, table: str, constraint_name: str, columns: tuple,
+                 reference_table: str, reference_columns: tuple):
+        self.table = table
+        self.constraint_name = constraint_name
+        self.columns = columns
+        self.reference_table = reference_table
+        self.reference_columns = reference_columns
+
+    def to_constraint(self) -> dict:
+        """The shape constraint_handling.generate_alter_statements() expects."""
+        return {
+            "constraint_name": self.constraint_name,
+            "columns": list(self.columns),
+            "reference_table": self.reference_table,
+            "reference_columns": list(self.reference_columns),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ForeignKey({self.table}.{self.constraint_name}: ({', '.join(self.columns)}) -> "
+            f"{self.reference_table} ({', '.join(self.reference_columns)}))"
+        )
+
+
+def group_foreign_keys(table: str, rows: List[Constraint]) -> List[ForeignKey]:
+    """Fold per-column foreign-key rows into one ForeignKey per constraint name."""
+    return [
+        ForeignKey(
+            table,
+            fk["constraint_name"],
+            tuple(fk["columns"]),
+            fk["reference_table"],
+            tuple(fk["reference_columns"]),
+        )
+        for fk in constraint_handling.group_foreign_keys(
+            {"foreign_keys": [row.to_dict() for row in rows]}, table
+        )
+    ]
+
+
+class MigrationPlan:
+    """Ordered constraint statements for a catalog; see CatalogIndex.migration_plan()."""
+
+    def __init__(self, table_order: List[str], primary_keys: List[str], foreign_keys: List[str],
+                 unresolved: List[tuple], cycles: List[str], checks: List[str] = (),
+                 unique: List[str] = ()):
+        self.table_order = table_order
+        self.primary_keys = primary_keys
+        self.foreign_keys = foreign_keys
+        self.unresolved = unresolved  # (ForeignKey, reason)
+        self.cycles = cycles
+        self.checks = list(checks)
+        self.unique = list(unique)  # listed as comments: Databricks has no UNIQUE constraints
+
+    @property
+    def statements(self) -> List[str]:
+        return self.primary_keys + self.foreign_keys + self.checks
+
+    def to_sql(self) -> str:
+        lines = [
+            "-- Constraint migration plan",
+            "-- Run after every table's CREATE TABLE; tables are listed parents first.",
+            "",
+            "-- Table order",
+        ]
+        lines += [f"--   {i}. {name}" for i, name in enumerate(self.table_order, 1)]
+        if self.cycles:
+            lines.append(f"-- Foreign-key cycles (order among these is arbitrary): {', '.join(self.cycles)}")
+        if self.primary_keys:
+            lines += ["", "-- Primary keys"] + [f"{s};" for s in self.primary_keys]
+        if self.foreign_keys:
+            lines += ["", "-- Foreign keys"] + [f"{s};" for s in self.foreign_keys]
+        if self.checks:
+            lines += ["", "-- Check constraints"] + [f"{s};" for s in self.checks]
+        if self.unique:
+            lines += ["", "-- Unique constraints (not supported by Databricks; kept for reference)"]
+            lines += [f"-- {s};" for s in self.unique]
+        if self.unresolved:
+            lines += ["", "-- Skipped foreign keys"]
+            lines += [f"--   {fk!r}: {reason}" for fk, reason in self.unresolved]
+        return "\n".join(lines) + "\n"
+
+
+class CatalogIndex:
+    """
+    In-memory index over a crawled catalog keyed by ``db.table``. Statements
+    quote their names through ``dialect`` (a ddl_renderer.Dialect).
+    """
+
+    def __init__(self, tables=(), dialect=identifiers):
+        self.dialect = dialect
+        self.tables: Dict[str, Table] = {}
+        self._columns: Dict[str, Dict[str, Column]] = {}
+        self._primary_keys: Dict[str, Optional[Constraint]] = {}
+        self._foreign_keys: Dict[str, List[ForeignKey]] = {}
+        self._referenced_by: Dict[str, List[ForeignKey]] = {}
+        for table in tables:
+            self.add(table)
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.tables
+
+    def add(self, table: Union[Table, dict]) -> Table:
+        if isinstance(table, dict):
+            table = Table.from_dict(table)
+        name = table.full_name
+        if name in self.tables:
+            self.remove(name)
+
+        self.tables[name] = table
+        self._columns[name] = {c.name: c for c in table.columns + table.partitions}
+        self._primary_keys[name] = next(
+            (c for c in table.constraints if c.kind == "primary_key"), None
+        )
+        foreign_keys = group_foreign_keys(
+            name, [c for c in table.constraints if c.kind == "foreign_keys"]
+        )
+        self._foreign_keys[name] = foreign_keys
+        for fk in foreign_keys:
+            self._referenced_by.setdefault(fk.reference_table, []).append(fk)
+        return table
+
+    def remove(self, name: str) -> None:
+        for fk in self._foreign_keys.pop(name, []):
+            self._referenced_by[fk.reference_table].remove(fk)
+        self.tables.pop(name, None)
+        self._columns.pop(name, None)
+        self._primary_keys.pop(name, None)
+
+    def table(self, name: str) -> Optional[Table]:
+        return self.tables.get(name)
+
+    def columns(self, name: str) -> Dict[str, Column]:
+        return self._columns.get(name, {})
+
+    def column(self, name: str, column: str) -> Optional[Column]:
+        return self._columns.get(name, {}).get(column)
+
+    def primary_key(self, name: str) -> tuple:
+        pk = self._primary_keys.get(name)
+        return tuple(pk.columns or ()) if pk is not None else ()
+
+    def foreign_keys(self, name: str) -> List[ForeignKey]:
+        return self._foreign_keys.get(name, [])
+
+    def referenced_by(self, name: str) -> List[ForeignKey]:
+        return self._referenced_by.get(name, [])
+
+    def check_foreign_key(self, fk: ForeignKey) -> str:
+        """Why ``fk`` cannot be applied, or "" when it can."""
+        if fk.reference_table not in self.tables:
+            return f"parent table {fk.reference_table} is not in the catalog"
+        missing = [c for c in fk.reference_columns if self.column(fk.reference_table, c) is None]
+        if missing:
+            return f"parent columns {missing} not found in {fk.reference_table}"
+        if len(fk.columns) != len(fk.reference_columns):
+            return "column count does not match the parent key"
+        return ""
+
+    def primary_key_statement(self, name: str) -> str:
+        """``ALTER TABLE ... PRIMARY KEY`` for ``name``, or "" when it has no primary key."""
+        pk = self._primary_keys.get(name)
+        if pk is None or not pk.columns:
+            return ""
+        return generate_alter_statements(
+            name,
+            {"primary_key": {"constraint_name": pk.constraint, "columns": list(pk.columns)}},
+            ["primary_key"],
+            self.dialect,
+        )[0]
+
+    def foreign_key_statement(self, fk: ForeignKey) -> str:
+        return generate_alter_statements(
+            fk.table, {"foreign_key": [fk.to_constraint()]}, ["foreign_key"], self.dialect
+        )[0]
+
+    def check_statements(self, name: str) -> List[tuple]:
+        """``(constraint name, ALTER TABLE ... CHECK)`` for each CHECK constraint of ``name``."""
+        table = self.tables.get(name)
+        if table is None:
+            return []
+        return [
+            (c.constraint, generate_alter_statements(
+                name, {"check": [{"constraint_name": c.constraint, "expression": c.expression}]}, ["check"],
+                self.dialect,
+            )[0])
+            for c in table.constraints
+            if c.kind == "check" and c.expression
+        ]
+
+    def unique_statements(self, name: str) -> List[tuple]:
+        """``(constraint name, ALTER TABLE ... UNIQUE)`` for each UNIQUE constraint of ``name``."""
+        table = self.tables.get(name)
+        if table is None:
+            return []
+        return [
+            (c.constraint, generate_alter_statements(
+                name, {"unique": [{"constraint_name": c.constraint, "columns": list(c.columns)}]}, ["unique"],
+                self.dialect,
+            )[0])
+            for c in table.constraints
+            if c.kind == "unique" and c.columns
+        ]
+
+    def migration_plan(self) -> MigrationPlan:
+        """PRIMARY KEY, FOREIGN KEY then CHECK statements, with parent tables ordered first."""
+        resolved, unresolved = {}, []
+        dependencies = {name: set() for name in self.tables}
+        for name, foreign_keys in self._foreign_keys.items():
+            for fk in foreign_keys:
+                reason = self.check_foreign_key(fk)
+                if reason:
+                    unresolved.append((fk, reason))
+                    continue
+                resolved.setdefault(name, []).append(fk)
+                if fk.reference_table != name:
+                    dependencies[name].add(fk.reference_table)
+
+        table_order, cycles = _topological_order(dependencies)
+
+        primary_keys, foreign_keys, checks, unique = [], [], [], []
+        for name in table_order:
+            pk_statement = self.primary_key_statement(name)
+            if pk_statement:
+                primary_keys.append(pk_statement)
+            foreign_keys += [self.foreign_key_statement(fk) for fk in resolved.get(name, [])]
+            checks += [statement for _, statement in self.check_statements(name)]
+            unique += [statement for _, statement in self.unique_statements(name)]
+        return MigrationPlan(table_order, primary_keys, foreign_keys, unresolved, cycles, checks, unique)
+
+
+def _topological_order(dependencies: Dict[str, set]) -> tuple[List[str], List[str]]:
+    """Kahn's algorithm, alphabetical among ready tables; cyclic tables go last."""
+    waiting = {name: len(parents) for name, parents in dependencies.items()}
+    children: Dict[str, List[str]] = {}
+    for name, parents in dependencies.items():
+        for parent in parents:
+            children.setdefault(parent, []).append(name)
+
+    ready = [name for name, count in waiting.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        name = heapq.heappop(ready)
+        order.append(name)
+        for child in children.get(name, []):
+            waiting[child] -= 1
+            if waiting[child] == 0:
+                heapq.heappush(ready, child)
+
+    cycles = sorted(name for name, count in waiting.items() if count > 0)
+    return order + cycles, cycles
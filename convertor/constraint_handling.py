@@ -1,14 +1,24 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from convertor import identifiers
+from convertor.catalog import Table
 
-def _format_columns(columns: List[str]) -> str:
+def _format_columns(columns: List[str], dialect=identifiers) -> str:
     """Format list of columns into SQL string."""
-    return ", ".join(columns)
+    return ", ".join(dialect.quote_identifier(column) for column in columns)
 
 
-def _generate_constraint_sql(constraint_type: str, table: str, constraint: Dict[str, Any]) -> str:
-    """Generate ALTER TABLE statement for primary, unique, and foreign key constraints."""
-    name = constraint["constraint_name"]
-    cols = _format_columns(constraint["columns"])
+def _generate_constraint_sql(
+    constraint_type: str, table: str, constraint: Dict[str, Any], dialect=identifiers
+) -> str:
+    """Generate ALTER TABLE statement for primary, unique, foreign key and check constraints.
+
+    ``table`` is ``db.table``; names are quoted by ``dialect`` (a ddl_renderer.Dialect).
+    """
+    table = dialect.quote_name(*table.split("."))
+    name = dialect.quote_identifier(constraint["constraint_name"])
+    if constraint_type == "check":
+        return f"ALTER TABLE {table} ADD CONSTRAINT {name} CHECK ({constraint['expression']})"
+    cols = _format_columns(constraint["columns"], dialect)
 
     if constraint_type == "primary_key":
         return f"ALTER TABLE {table} ADD CONSTRAINT {name} PRIMARY KEY ({cols})"
@@ -17,8 +27,8 @@ def _generate_constraint_sql(constraint_type: str, table: str, constraint: Dict[
         return f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE ({cols})"
 
     elif constraint_type == "foreign_key":
-        ref_table = constraint["reference_table"]
-        ref_cols = _format_columns(constraint["reference_columns"])
+        ref_table = dialect.quote_name(*constraint["reference_table"].split("."))
+        ref_cols = _format_columns(constraint["reference_columns"], dialect)
         return (
             f"ALTER TABLE {table} ADD CONSTRAINT {name} "
             f"FOREIGN KEY ({cols}) REFERENCES {ref_table} ({ref_cols})"
@@ -30,7 +40,8 @@ def _generate_constraint_sql(constraint_type: str, table: str, constraint: Dict[
 def generate_alter_statements(
     table: str,
     constraints: Dict[str, Any],
-    types: List[str] = ["primary_key", "unique", "foreign_key"]
+    types: List[str] = ["primary_key", "unique", "foreign_key"],
+    dialect=identifiers,
 ) -> List[str]:
     """Generate ALTER TABLE statements for supported constraint types."""
     statements = []
@@ -44,7 +55,7 @@ def generate_alter_statements(
             constraint_data = [constraint_data]
 
         for constraint in constraint_data:
-            sql = _generate_constraint_sql(ctype, table, constraint)
+            sql = _generate_constraint_sql(ctype, table, constraint, dialect)
             if sql:
                 statements.append(sql)
 
@@ -65,23 +76,79 @@ def extract_column_constraints(constraints: Dict[str, Any]) -> Dict[str, Dict[st
 
 
 def generate_tblproperties(constraints: Dict[str, Any]) -> Dict[str, str]:
-    """Generate TBLPROPERTIES for Databricks including enabling default column values and check constraints."""
-    props = {
+    """Generate TBLPROPERTIES for Databricks, enabling default column values."""
+    return {
         "delta.feature.defaultColumnValues": "supported"  # Required for enabling default values
     }
 
-    for chk in constraints.get("check", []):
-        props[f"check.{chk['constraint_name']}"] = chk["check_condition"]
 
-    return props
+def _key(constraint: Dict[str, Any]) -> Dict[str, Any]:
+    return {"constraint_name": constraint["constraint"], "columns": list(constraint.get("columns") or [])}
+
+
+def split_parent_column(parent_column: str) -> tuple[str, str]:
+    """``db.table.col`` -> (``db.table``, ``col``)."""
+    table, _, column = (parent_column or "").rpartition(".")
+    return table, column
+
+
+def group_foreign_keys(constraints: Dict[str, Any], table: str = "") -> List[Dict[str, Any]]:
+    """Fold the per-column foreign-key rows into one key per constraint name, in key-sequence order."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for row in constraints.get("foreign_keys", []):
+        grouped.setdefault(row["constraint"], []).append(row)
+
+    foreign_keys = []
+    for name, rows in grouped.items():
+        rows.sort(key=lambda r: r.get("key_sequence") or 0)
+        parents = [split_parent_column(r.get("parent_column")) for r in rows]
+        reference_tables = {parent for parent, _ in parents}
+        if len(reference_tables) != 1 or "" in reference_tables:
+            print(
+                f"[ERROR] Foreign key '{name}' on {table} has no single parent table: "
+                f"{sorted(reference_tables)}"
+            )
+            continue
+        foreign_keys.append(
+            {
+                "constraint_name": name,
+                "columns": [r["column"] for r in rows],
+                "reference_table": reference_tables.pop(),
+                "reference_columns": [column for _, column in parents],
+            }
+        )
+    return foreign_keys
+
+
+def key_constraints(constraints: Dict[str, Any], table: str = "") -> Dict[str, Any]:
+    """Parsed constraints (see connector.parse_constraints) in the form generate_alter_statements() takes."""
+    primary_key = constraints.get("primary_key")
+    return {
+        "primary_key": _key(primary_key) if primary_key and primary_key.get("columns") else None,
+        "unique": [_key(u) for u in constraints.get("unique", []) if u.get("columns")],
+        "foreign_key": group_foreign_keys(constraints, table),
+        "check": [
+            {"constraint_name": chk["constraint"], "expression": chk["expression"]}
+            for chk in constraints.get("check", [])
+            if chk.get("expression")
+        ],
+    }
 
 
-def generate_all_constraints(table: str, constraints_json: Dict[str, Any]) -> Dict[str, Any]:
+def generate_all_constraints(
+    table: str, constraints_json: Union[Dict[str, Any], Table], dialect=identifiers
+) -> Dict[str, Any]:
     """Master function to generate all Databricks constraints: ALTER, column mods, TBLPROPERTIES."""
-    constraints = constraints_json.get("constraints", {})
+    if isinstance(constraints_json, Table):
+        constraints = constraints_json.constraints_dict()
+    else:
+        constraints = constraints_json.get("constraints", {})
 
+    keys = key_constraints(constraints, table)
     return {
-        "alter_statements": generate_alter_statements(table, constraints),
+        "alter_statements": generate_alter_statements(table, keys, ["primary_key", "foreign_key", "check"], dialect),
+        # Not supported by Databricks; dialects emit these as comments only.
+        "unique_statements": generate_alter_statements(table, keys, ["unique"], dialect),
         "column_modifications": extract_column_constraints(constraints),
-        "table_properties": generate_tblproperties(constraints)
+        "table_properties": generate_tblproperties(constraints),
     }
@@ -1,3 +1,7 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
 HIVE_TO_DATABRICKS_MAP = {
     "int": "INT",
     "tinyint": "TINYINT",
@@ -14,87 +18,196 @@ HIVE_TO_DATABRICKS_MAP = {
     "char": "STRING",
 }
 
+COMPLEX_TYPES = ("array", "map", "struct", "uniontype")
 
-class TypeMapper:
-    COMPLEX_TYPE_HANDLERS = {}
+# Distinct type strings kept by TypeMapper.map_type; catalogs repeat a few
+# thousand complex types across millions of columns.
+TYPE_CACHE_SIZE = 16384
 
-    @staticmethod
-    def map_type(hive_type: str) -> str:
-        try:
-            hive_type = hive_type.strip().lower()
-            for prefix, handler in TypeMapper.COMPLEX_TYPE_HANDLERS.items():
-                if hive_type.startswith(prefix) and hive_type.endswith(">"):
-                    return handler(hive_type)
+# A backtick-quoted struct field name (``a b``, ``x:y``) is one token.
+_TOKEN_RE = re.compile(r"\s*(?:([<>,:()])|(`(?:[^`]|``)*`|[^<>,:()\s]+))")
+_PUNCTUATION = frozenset("<>,:()")
 
-            if hive_type.startswith("decimal"):
-                return hive_type.upper()
 
-            base_type = hive_type.split("(", 1)[0]
-            return HIVE_TO_DATABRICKS_MAP.get(base_type, hive_type.upper())
+class HiveType(NamedTuple):
+    """Node of a parsed Hive type; ``fields`` holds struct field names."""
 
-        except Exception as e:
-            print(f"[ERROR] Failed to map Hive type '{hive_type}': {e}")
-            return "STRING"
+    kind: str
+    name: str = ""
+    params: Tuple[str, ...] = ()
+    children: Tuple["HiveType", ...] = ()
+    fields: Tuple[str, ...] = ()
 
-    @staticmethod
-    def _safe_split(s: str, delimiter: str = ",") -> list:
-        parts = []
-        current = ""
-        depth = 0
-        for c in s:
-            if c == "<":
-                depth += 1
-            elif c == ">":
-                depth -= 1
-            if c == delimiter and depth == 0:
-                parts.append(current)
-                current = ""
+
+def _tokenize(hive_type: str) -> list:
+    tokens = []
+    pos, end = 0, len(hive_type)
+    while pos < end:
+        match = _TOKEN_RE.match(hive_type, pos)
+        if not match:
+            break
+        pos = match.end()
+        punct, word = match.groups()
+        if punct:
+            tokens.append(punct)
+        elif word:
+            tokens.append(word)
+    return tokens
+
+
+def parse_hive_type(hive_type: str) -> HiveType:
+    """
+    Parse a lower-cased Hive type string into a HiveType tree in one pass.
+
+    Nesting is tracked on an explicit stack, so depth is not bounded by the
+    interpreter's recursion limit. Raises ValueError on malformed input.
+    """
+    tokens = _tokenize(hive_type)
+    n = len(tokens)
+    stack = []  # [kind, children, field_names]
+    result = None
+    i = 0
+
+    def emit(node):
+        nonlocal result
+        if stack:
+            stack[-1][1].append(node)
+        elif result is None:
+            result = node
+        else:
+            raise ValueError(f"unexpected trailing type in '{hive_type}'")
+
+    while i < n:
+        tok = tokens[i]
+
+        if tok == ">":
+            if not stack:
+                raise ValueError(f"unbalanced '>' in '{hive_type}'")
+            kind, children, fields = stack.pop()
+            if kind == "struct" and len(fields) != len(children):
+                raise ValueError(f"struct field without a type in '{hive_type}'")
+            emit(HiveType(kind, kind, (), tuple(children), tuple(fields)))
+            i += 1
+            continue
+
+        if tok == ",":
+            if not stack:
+                raise ValueError(f"unexpected ',' in '{hive_type}'")
+            i += 1
+            continue
+
+        if tok in _PUNCTUATION:
+            raise ValueError(f"unexpected '{tok}' in '{hive_type}'")
+
+        frame = stack[-1] if stack else None
+        if (
+            frame is not None
+            and frame[0] == "struct"
+            and len(frame[2]) == len(frame[1])
+        ):
+            if i + 1 >= n or tokens[i + 1] != ":":
+                raise ValueError(f"missing ':' after struct field '{tok}'")
+            frame[2].append(tok)
+            i += 2
+            continue
+
+        if tok in COMPLEX_TYPES and i + 1 < n and tokens[i + 1] == "<":
+            stack.append([tok, [], []])
+            i += 2
+            continue
+
+        # Primitive: possibly multi-word ("timestamp with local time zone")
+        # with optional parameters ("decimal(10,2)", "varchar(20)").
+        words = [tok]
+        i += 1
+        while i < n and tokens[i] not in _PUNCTUATION:
+            words.append(tokens[i])
+            i += 1
+        params = []
+        if i < n and tokens[i] == "(":
+            i += 1
+            while i < n and tokens[i] != ")":
+                if tokens[i] != ",":
+                    params.append(tokens[i])
+                i += 1
+            if i >= n:
+                raise ValueError(f"unbalanced '(' in '{hive_type}'")
+            i += 1
+        emit(HiveType("primitive", " ".join(words), tuple(params)))
+
+    if stack or result is None:
+        raise ValueError(f"incomplete type '{hive_type}'")
+    return result
+
+
+def _render_primitive(node: HiveType) -> str:
+    if node.name == "decimal":
+        return f"DECIMAL({','.join(node.params)})" if node.params else "DECIMAL"
+    mapped = HIVE_TO_DATABRICKS_MAP.get(node.name)
+    if mapped:
+        return mapped
+    suffix = f"({','.join(node.params)})" if node.params else ""
+    return f"{node.name.upper()}{suffix}"
+
+
+def render_databricks_type(node: HiveType) -> str:
+    """Render a HiveType tree as a Databricks type (iterative post-order walk)."""
+    out = []
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if current.kind == "primitive":
+            out.append(_render_primitive(current))
+            continue
+        if not expanded:
+            stack.append((current, True))
+            stack.extend((child, False) for child in reversed(current.children))
+            continue
+
+        count = len(current.children)
+        parts = out[len(out) - count :]
+        del out[len(out) - count :]
+
+        if current.kind == "array" and count == 1:
+            out.append(f"ARRAY<{parts[0]}>")
+        elif current.kind == "map":
+            if count == 2:
+                out.append(f"MAP<{parts[0]}, {parts[1]}>")
             else:
-                current += c
-        if current:
-            parts.append(current)
-        return parts
+                out.append("MAP<STRING, STRING>")
+        elif current.kind == "struct":
+            fields = ", ".join(f"{f}:{t}" for f, t in zip(current.fields, parts))
+            out.append(f"STRUCT<{fields}>")
+        elif current.kind == "uniontype":
+            fields = ", ".join(f"field_{i}:{t}" for i, t in enumerate(parts))
+            out.append(f"STRUCT<{fields}>")
+        else:
+            raise ValueError(f"invalid {current.kind} with {count} element types")
+    return out[0]
+
 
+@lru_cache(maxsize=TYPE_CACHE_SIZE)
+def _map_normalized(hive_type: str) -> str:
+    return render_databricks_type(parse_hive_type(hive_type))
+
+
+class TypeMapper:
     @staticmethod
-    def _handle_array(hive_type: str) -> str:
-        inner = hive_type[len("array<") : -1].strip()
-        return f"ARRAY<{TypeMapper.map_type(inner)}>"
+    def map_type(hive_type: str) -> str:
+        try:
+            return _map_normalized(hive_type.strip().lower())
+        except Exception as e:
+            print(f"[ERROR] Failed to map Hive type '{hive_type}': {e}")
+            return "STRING"
 
     @staticmethod
-    def _handle_map(hive_type: str) -> str:
-        inner = hive_type[len("map<") : -1].strip()
-        parts = TypeMapper._safe_split(inner, ",")
-        if len(parts) == 2:
-            key, val = parts
-            return f"MAP<{TypeMapper.map_type(key.strip())}, {TypeMapper.map_type(val.strip())}>"
-        return "MAP<STRING, STRING>"
+    def parse(hive_type: str) -> HiveType:
+        return parse_hive_type(hive_type.strip().lower())
 
     @staticmethod
-    def _handle_struct(hive_type: str) -> str:
-        inner = hive_type[len("struct<") : -1].strip()
-        fields = TypeMapper._safe_split(inner)
-        struct_parts = []
-        for field in fields:
-            if ":" in field:
-                name, type_ = field.split(":", 1)
-                struct_parts.append(
-                    f"{name.strip()}:{TypeMapper.map_type(type_.strip())}"
-                )
-        return f"STRUCT<{', '.join(struct_parts)}>"
+    def cache_info():
+        return _map_normalized.cache_info()
 
     @staticmethod
-    def _handle_union(hive_type: str) -> str:
-        inner = hive_type[len("uniontype<") : -1].strip()
-        types = TypeMapper._safe_split(inner)
-        fields = [
-            f"field_{i}:{TypeMapper.map_type(t.strip())}" for i, t in enumerate(types)
-        ]
-        return f"STRUCT<{', '.join(fields)}>"
-
-
-TypeMapper.COMPLEX_TYPE_HANDLERS = {
-    "array<": TypeMapper._handle_array,
-    "map<": TypeMapper._handle_map,
-    "struct<": TypeMapper._handle_struct,
-    "uniontype<": TypeMapper._handle_union,
-}
+    def cache_clear() -> None:
+        _map_normalized.cache_clear()
@@ -0,0 +1,401 @@
+"""
+Dialect-aware CREATE TABLE rendering.
+
+A Dialect turns a catalog Table into DDL. It decides identifier quoting,
+type mapping and the clauses around the column list. Every statement is
+collected as a list of lines and joined once, and ends with ``;`` so the
+output runs as a script. Identifiers are quoted only when they need it, and
+string literals are escaped. As a result, Databricks output for ordinary
+names and comments is what build_table_ddl() has always produced, plus the
+statement terminators.
+
+Dialects:
+  "databricks"  Delta / Databricks SQL (default)
+  "spark"       Spark SQL with Hive support: Hive SerDe tables, Hive types
+  "iceberg"     Spark SQL on an Iceberg catalog
+"""
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Union
+
+from convertor.catalog import Table
+from convertor.constraint_handling import generate_all_constraints
+from convertor.datatype_mapping import TypeMapper
+from convertor.helper_methods import has_column_defaults, infer_format
+from convertor.identifiers import quote_identifier
+from convertor.schema_diff import VOLATILE_PROPERTIES
+from pipeline.metrics import get_metrics
+
+# Hive DESCRIBE prints sort columns as Order(col:name, order:1)
+_SORT_ORDER = re.compile(r"^Order\(col:(.+), order:(\d)\)$")
+
+def _fields(col) -> tuple:
+    """(name, type, comment) of a clean-JSON column dict or a catalog Column/Partition."""
+    if type(col) is dict:
+        return col.get("name"), col.get("type"), col.get("comment", "")
+    return col.name, col.type, col.comment
+
+
+def _column_constraints(col) -> tuple:
+    """(not_null, default) folded into a clean-JSON column dict or a catalog Column."""
+    if type(col) is dict:
+        return col.get("not_null"), col.get("default")
+    return col.not_null, col.default
+
+
+def _block(header: str, items: List[str]) -> List[str]:
+    """``header (`` / indented comma-separated items / ``)``."""
+    return [f"{header} (", "  " + ",\n  ".join(items), ")"]
+
+
+class Dialect(ABC):
+    """
+    Base dialect; subclasses provide create_table(), properties() and trailer().
+    Columns and partitions may be clean-JSON dicts or catalog records.
+    """
+
+    name = ""
+    # Whether the target takes PRIMARY/FOREIGN KEY and CHECK ALTER statements (others get them
+    # as comments). No dialect supports UNIQUE; it is always commented out.
+    key_constraints = False
+
+    quote_identifier = staticmethod(quote_identifier)
+
+    def quote_name(self, *parts: str) -> str:
+        return ".".join(self.quote_identifier(part) for part in parts)
+
+    def string_literal(self, value) -> str:
+        return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    column_type = staticmethod(TypeMapper.map_type)
+
+    def column_definitions(self, columns) -> List[str]:
+        # Hot loop for wide tables: methods are bound once.
+        quote, column_type, literal = self.quote_identifier, self.column_type, self.string_literal
+        definitions = []
+        for col in columns:
+            name, hive_type, comment = _fields(col)
+            if not name or not hive_type:
+                continue
+            if comment:
+                definitions.append(f"{quote(name)} {column_type(hive_type)} COMMENT {literal(comment)}")
+            else:
+                definitions.append(f"{quote(name)} {column_type(hive_type)}")
+        return definitions
+
+    def properties_clause(self, properties: Dict[str, str]) -> List[str]:
+        if not properties:
+            return []
+        return _block(
+            "TBLPROPERTIES",
+            [f"{self.string_literal(k)} = {self.string_literal(v)}" for k, v in properties.items()],
+        )
+
+    @abstractmethod
+    def create_table(self, table: Table) -> List[str]:
+        """The CREATE TABLE statement up to its table properties."""
+
+    @abstractmethod
+    def properties(self, table: Table, constraint_package: dict) -> Dict[str, str]:
+        """The TBLPROPERTIES to emit."""
+
+    def trailer(self, table: Table, constraint_package: dict, inline_constraints: bool) -> List[str]:
+        return []
+
+    def render(self, table: Table, constraint_package: dict, inline_constraints: bool = True) -> str:
+        lines = self.create_table(table)
+        lines += self.properties_clause(self.properties(table, constraint_package))
+        lines[-1] += ";"
+        lines += self.trailer(table, constraint_package, inline_constraints)
+        return "\n".join(lines)
+
+
+class DatabricksDialect(Dialect):
+    """Delta tables for Databricks; NOT NULL and DEFAULT inline, key and CHECK constraints as ALTER statements."""
+
+    name = "databricks"
+    key_constraints = True
+
+    def column_definitions(self, columns) -> List[str]:
+        quote, column_type, literal = self.quote_identifier, self.column_type, self.string_literal
+        definitions = []
+        for col in columns:
+            name, hive_type, comment = _fields(col)
+            if not name or not hive_type:
+                continue
+            definition = f"{quote(name)} {column_type(hive_type)}"
+            not_null, default = _column_constraints(col)
+            if not_null:
+                definition += " NOT NULL"
+            if default is not None:
+                definition += f" DEFAULT {default}"
+            if comment:
+                definition += f" COMMENT {literal(comment)}"
+            definitions.append(definition)
+        return definitions
+
+    def partition_definitions(self, partitions, skewed_columns=()) -> List[str]:
+        seen = set()
+        definitions = []
+        for part in partitions:
+            name, hive_type, _ = _fields(part)
+            if not name or not hive_type or name in seen:
+                continue
+            definitions.append(f"{self.quote_identifier(name)} {self.column_type(hive_type)}")
+            seen.add(name)
+        for col in skewed_columns or ():
+            if col not in seen:
+                definitions.append(f"{self.quote_identifier(col)} STRING")
+                seen.add(col)
+        return definitions
+
+    def create_table_lines(
+        self, table_name: str, columns, partitions, table_type: str = "",
+        location: str = "", skewed_cols=(), file_format: str = "DELTA",
+    ) -> List[str]:
+        with get_metrics().stage("convert.type_mapping"):
+            column_defs = self.column_definitions(columns)
+            partition_defs = self.partition_definitions(partitions, skewed_cols)
+
+        external = table_type == "EXTERNAL_TABLE"
+        lines = _block(f"CREATE {'EXTERNAL ' if external else ''}TABLE IF NOT EXISTS {table_name}", column_defs)
+        if partition_defs:
+            lines += _block("PARTITIONED BY", partition_defs)
+        lines.append(f"USING {file_format.upper()}")
+        if external and location:
+            lines.append(f"LOCATION {self.string_literal(location)}")
+        return lines
+
+    def create_table(self, table: Table) -> List[str]:
+        return self.create_table_lines(
+            self.quote_name(table.database, table.table_name),
+            table.columns,
+            table.partitions,
+            table.table_type,
+            table.location,
+            table.storage_format.skewed_columns,
+            infer_format(table.storage_format.input_format),
+        )
+
+    def table_properties(self, properties: dict, constraint_package: dict, columns) -> Dict[str, str]:
+        try:
+            # Hive statistics are stale on the target; the delta. feature keys are ours.
+            props = _portable_properties(
+                {k.strip(): v for k, v in properties.items() if k and k.strip()}, ("spark.sql.",)
+            )
+            if has_column_defaults(columns):
+                props["delta.feature.allowColumnDefaults"] = "enabled"
+            return props
+        except Exception as e:
+            print(f"[ERROR] Failed to generate table properties: {e}")
+            return {}
+
+    def properties(self, table: Table, constraint_package: dict) -> Dict[str, str]:
+        return self.table_properties(table.table_parameters, constraint_package, table.columns)
+
+    def trailer(self, table: Table, constraint_package: dict, inline_constraints: bool) -> List[str]:
+        lines = []
+        alter_statements = constraint_package.get("alter_statements", [])
+        if alter_statements and inline_constraints:
+            lines += ["", "-- Constraints"] + [f"{statement};" for statement in alter_statements]
+        if inline_constraints:
+            # Databricks has no UNIQUE constraints.
+            lines += _commented_constraints("Databricks", constraint_package.get("unique_statements", []))
+        zorder_cols = [c.strip() for c in table.storage_format.bucket_columns if c and c.strip()]
+        if zorder_cols:
+            lines.append(
+                f"-- OPTIMIZE {self.quote_name(table.database, table.table_name)} "
+                f"ZORDER BY ({', '.join(self.quote_identifier(c) for c in zorder_cols)}); "
+                f"COMMENT 'ZORDER statement for bucketing optimization TO BE APPLIED AT RUNTIME'"
+            )
+        return lines
+
+
+def _portable_properties(properties: dict, owned_prefixes=("delta.", "spark.sql.")) -> Dict[str, str]:
+    """Table properties minus Hive statistics and keys owned by the target (Delta, Spark) itself."""
+    return {
+        k: v
+        for k, v in properties.items()
+        if k
+        and k not in VOLATILE_PROPERTIES
+        and k not in ("EXTERNAL", "bucketing_version")
+        and not k.startswith(owned_prefixes)
+    }
+
+
+def _commented_constraints(dialect: str, statements: List[str]) -> List[str]:
+    if not statements:
+        return []
+    return ["", f"-- Constraints (not supported by {dialect}; kept for reference)"] + [
+        f"-- {statement};" for statement in statements
+    ]
+
+
+def _all_constraints(constraint_package: dict, inline_constraints: bool) -> List[str]:
+    if not inline_constraints:
+        return []
+    return constraint_package.get("alter_statements", []) + constraint_package.get("unique_statements", [])
+
+
+class SparkHiveDialect(Dialect):
+    """Spark SQL with Hive support: the table keeps its SerDe, formats and Hive types."""
+
+    name = "spark"
+
+    def column_type(self, hive_type: str) -> str:
+        # Spark reads Hive type strings as they are, except uniontype.
+        if "uniontype" in hive_type.lower():
+            return TypeMapper.map_type(hive_type)
+        return hive_type
+
+    def sort_columns(self, sort_columns) -> List[str]:
+        result = []
+        for entry in sort_columns:
+            match = _SORT_ORDER.match(entry)
+            if match:
+                order = "ASC" if match.group(2) == "1" else "DESC"
+                result.append(f"{self.quote_identifier(match.group(1))} {order}")
+            elif entry:
+                result.append(self.quote_identifier(entry))
+        return result
+
+    def create_table(self, table: Table) -> List[str]:
+        storage = table.storage_format
+        external = table.table_type == "EXTERNAL_TABLE"
+        with get_metrics().stage("convert.type_mapping"):
+            column_defs = self.column_definitions(table.columns)
+            partition_defs = self.column_definitions(table.partitions)
+
+        name = self.quote_name(table.database, table.table_name)
+        lines = _block(f"CREATE {'EXTERNAL ' if external else ''}TABLE IF NOT EXISTS {name}", column_defs)
+        if partition_defs:
+            lines += _block("PARTITIONED BY", partition_defs)
+        if storage.bucket_columns and storage.num_buckets > 0:
+            clause = f"CLUSTERED BY ({', '.join(self.quote_identifier(c) for c in storage.bucket_columns)})"
+            sort_cols = self.sort_columns(storage.sort_columns)
+            if sort_cols:
+                clause += f" SORTED BY ({', '.join(sort_cols)})"
+            lines.append(f"{clause} INTO {storage.num_buckets} BUCKETS")
+        if storage.serde_library:
+            lines.append(f"ROW FORMAT SERDE {self.string_literal(storage.serde_library)}")
+            if storage.desc_params:
+                lines += _block(
+                    "WITH SERDEPROPERTIES",
+                    [
+                        f"{self.string_literal(k)} = {self.string_literal(v)}"
+                        for k, v in storage.desc_params.items()
+                    ],
+                )
+        if storage.input_format and storage.output_format:
+            lines.append(f"STORED AS INPUTFORMAT {self.string_literal(storage.input_format)}")
+            lines.append(f"OUTPUTFORMAT {self.string_literal(storage.output_format)}")
+        if external and table.location:
+            lines.append(f"LOCATION {self.string_literal(table.location)}")
+        return lines
+
+    def properties(self, table: Table, constraint_package: dict) -> Dict[str, str]:
+        return _portable_properties(table.table_parameters)
+
+    def trailer(self, table: Table, constraint_package: dict, inline_constraints: bool) -> List[str]:
+        return _commented_constraints("Spark SQL", _all_constraints(constraint_package, inline_constraints))
+
+
+class IcebergDialect(Dialect):
+    """
+    Iceberg tables through Spark SQL. Partition columns join the schema and
+    are partitioned by identity; Hive buckets become bucket() transforms.
+    No LOCATION is emitted: existing Hive files are not an Iceberg table
+    (use Iceberg's migrate/add_files procedures for in-place conversion).
+    """
+
+    name = "iceberg"
+
+    @staticmethod
+    def write_format(input_format: str) -> str:
+        input_format = (input_format or "").lower()
+        return next((fmt for fmt in ("orc", "avro") if fmt in input_format), "parquet")
+
+    def create_table(self, table: Table) -> List[str]:
+        storage = table.storage_format
+        column_names = {_fields(c)[0] for c in table.columns}
+        partitions = [p for p in table.partitions if _fields(p)[0] not in column_names]
+        with get_metrics().stage("convert.type_mapping"):
+            column_defs = self.column_definitions(list(table.columns) + partitions)
+
+        lines = _block(
+            f"CREATE TABLE IF NOT EXISTS {self.quote_name(table.database, table.table_name)}",
+            column_defs,
+        )
+        lines.append("USING iceberg")
+        transforms = [self.quote_identifier(name) for name, _, _ in map(_fields, table.partitions) if name]
+        if storage.num_buckets > 0:
+            transforms += [
+                f"bucket({storage.num_buckets}, {self.quote_identifier(c)})"
+                for c in storage.bucket_columns
+            ]
+        if transforms:
+            lines.append(f"PARTITIONED BY ({', '.join(transforms)})")
+        return lines
+
+    def properties(self, table: Table, constraint_package: dict) -> Dict[str, str]:
+        props = {
+            "format-version": "2",
+            "write.format.default": self.write_format(table.storage_format.input_format),
+        }
+        props.update(_portable_properties(table.table_parameters))
+        return props
+
+    def trailer(self, table: Table, constraint_package: dict, inline_constraints: bool) -> List[str]:
+        return _commented_constraints("Iceberg", _all_constraints(constraint_package, inline_constraints))
+
+
+DIALECTS: Dict[str, Dialect] = {
+    dialect.name: dialect for dialect in (DatabricksDialect(), SparkHiveDialect(), IcebergDialect())
+}
+
+
+def get_dialect(dialect: Union[str, Dialect] = "databricks") -> Dialect:
+    if isinstance(dialect, Dialect):
+        return dialect
+    try:
+        return DIALECTS[(dialect or "databricks").lower()]
+    except KeyError:
+        raise ValueError(f"Unknown DDL dialect '{dialect}', expected one of {sorted(DIALECTS)}")
+
+
+def fold_constraints(table: Table, dialect: Union[str, Dialect] = "databricks") -> dict:
+    """generate_all_constraints() for ``table``, with NOT NULL/DEFAULT and properties folded in."""
+    constraint_package = generate_all_constraints(table.full_name, table, get_dialect(dialect))
+    column_constraints = constraint_package["column_modifications"]
+    for col in table.columns:
+        if col.name in column_constraints:
+            col.update(column_constraints[col.name])
+    table.table_parameters.update(constraint_package["table_properties"])
+    return constraint_package
+
+
+def render_table(
+    table: Union[Table, dict],
+    dialect: Union[str, Dialect] = "databricks",
+    inline_constraints: bool = True,
+    constraint_package: dict = None,
+) -> str:
+    """
+    CREATE TABLE DDL for one table. Without ``constraint_package`` the
+    table's constraints are generated and folded into it first.
+    """
+    if isinstance(table, dict):
+        table = Table.from_dict(table)
+    if constraint_package is None:
+        constraint_package = fold_constraints(table, dialect)
+    return get_dialect(dialect).render(table, constraint_package, inline_constraints)
+
+
+def render_tables(
+    tables: Iterable[Union[Table, dict]],
+    dialect: Union[str, Dialect] = "databricks",
+    inline_constraints: bool = True,
+) -> List[str]:
+    """render_table() for a batch of tables, in order."""
+    dialect = get_dialect(dialect)
+    return [render_table(table, dialect, inline_constraints) for table in tables]
@@ -1,28 +1,23 @@
-from convertor.column_structure import generate_column_definitions
-from convertor.partition_structure import generate_partition_definitions
-from typing import List, Dict
+from convertor.catalog import Table
+from convertor.ddl_renderer import DIALECTS
+from typing import List, Dict, Union
+
+DATABRICKS = DIALECTS["databricks"]
 
 
 def generate_create_table_ddl(
-    table_name: str,
-    columns: List[Dict],
-    partitions: List[Dict],
-    table_type: str,
+    table_name: Union[str, Table],
+    columns: List[Dict] = None,
+    partitions: List[Dict] = None,
+    table_type: str = "",
     location: str = "",
     skewed_cols: List[str] = [],
     file_format: str = "DELTA"
 ) -> str:
-    column_defs = generate_column_definitions(columns)
-    partition_defs = generate_partition_definitions(partitions, skewed_cols)
-
-    ddl = f"CREATE {'EXTERNAL ' if table_type == 'EXTERNAL_TABLE' else ''}TABLE IF NOT EXISTS {table_name} (\n  {column_defs}\n)"
-
-    if partition_defs:
-        ddl += f"\nPARTITIONED BY (\n  {partition_defs}\n)"
-        
-    ddl += f"\nUSING {file_format.upper()}"
-
-    if table_type == "EXTERNAL_TABLE" and location:
-        ddl += f"\nLOCATION '{location}'"
+    if isinstance(table_name, Table):
+        return "\n".join(DATABRICKS.create_table(table_name))
 
-    return ddl
+    lines = DATABRICKS.create_table_lines(
+        table_name, columns, partitions, table_type, location, skewed_cols, file_format
+    )
+    return "\n".join(lines)
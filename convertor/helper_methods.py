@@ -7,8 +7,10 @@ def generate_location_clause(table_type: str, location: str) -> str:
     return ""
 
 
-def has_column_defaults(columns: list[dict]) -> bool:
-    return any("default" in col and col["default"] for col in columns)
+def has_column_defaults(columns: list) -> bool:
+    return any(
+        col.get("default") if isinstance(col, dict) else col.default for col in columns
+    )
 
 
 def generate_properties_clause(
@@ -68,8 +70,9 @@ def infer_format(input_format) -> str:
         "DELTA"
     )
 
-def export_ddl_to_sql(output_dir: str, db: str, table: str, ddl: str):
+def export_ddl_to_sql(output_dir: str, db: str, table: str, ddl: str) -> str:
     os.makedirs(output_dir, exist_ok=True)
     file_path = os.path.join(output_dir, f"{db}.{table}.sql")
     with open(file_path, "w") as f:
         f.write(ddl)
+    return file_path
@@ -0,0 +1,32 @@
+"""
+Identifier quoting shared by the DDL dialects and the constraint statements.
+
+Names are quoted only when they need it, so ordinary names come out as they
+are. Anything with quote_identifier() and quote_name() (a
+convertor.ddl_renderer.Dialect, or this module) can quote a statement.
+"""
+
+# Spark SQL keywords that are reserved under ANSI mode (the Databricks SQL
+# default); they must be quoted to be used as names.
+RESERVED_WORDS = frozenset(
+    """
+    ALL AND ANY AS AUTHORIZATION BOTH CASE CAST CHECK COLLATE COLUMN CONSTRAINT
+    CREATE CROSS CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP CURRENT_USER DISTINCT
+    ELSE END ESCAPE EXCEPT FALSE FETCH FILTER FOR FOREIGN FROM FULL GRANT GROUP
+    HAVING IN INNER INTERSECT INTO IS JOIN LATERAL LEADING LEFT NATURAL NOT NULL
+    OFFSET ON ONLY OR ORDER OUTER OVERLAPS PRIMARY REFERENCES RIGHT SELECT
+    SESSION_USER SOME TABLE THEN TIME TO TRAILING UNION UNIQUE UNKNOWN USER USING
+    WHEN WHERE WITH
+    """.split()
+)
+
+
+def quote_identifier(name: str) -> str:
+    # ASCII identifiers are exactly [A-Za-z_][A-Za-z0-9_]*
+    if name.isascii() and name.isidentifier() and name.upper() not in RESERVED_WORDS:
+        return name
+    return "`" + name.replace("`", "``") + "`"
+
+
+def quote_name(*parts: str) -> str:
+    return ".".join(quote_identifier(part) for part in parts)
@@ -1,27 +1,50 @@
-from typing import List, Dict, Optional
-from convertor.datatype_mapping import HIVE_TO_DATABRICKS_MAP
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import unquote
+from convertor.ddl_renderer import DIALECTS
 
 
 def generate_partition_definitions(
     partitions: List[Dict], skewed_columns: Optional[List[str]] = None
 ) -> str:
-    seen = set()
-    partition_defs = []
+    return ",\n  ".join(DIALECTS["databricks"].partition_definitions(partitions, skewed_columns))
 
-    for part in partitions:
-        name = part.get("name")
-        hive_type = part.get("type")
 
-        if not name or not hive_type or name in seen:
-            continue
+def parse_partition_spec(spec: str) -> List[Tuple[str, str]]:
+    """``ds=2024-01-01/region=us%2Feast`` -> [("ds", "2024-01-01"), ("region", "us/east")]."""
+    pairs = []
+    for part in spec.split("/"):
+        key, _, value = part.partition("=")
+        # Hive path-escapes special characters in partition values as %XX.
+        pairs.append((unquote(key), unquote(value)))
+    return pairs
 
-        mapped_type = HIVE_TO_DATABRICKS_MAP.get(hive_type.lower(), hive_type.upper())
-        partition_defs.append(f"{name} {mapped_type}")
-        seen.add(name)
 
-    for col in skewed_columns or []:
-        if col not in seen:
-            partition_defs.append(f"{col} STRING")
-            seen.add(col)
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
 
-    return ",\n  ".join(partition_defs)
+
+def format_partition_clause(spec: str) -> str:
+    values = ", ".join(f"{key}={_sql_string(value)}" for key, value in parse_partition_spec(spec))
+    return f"PARTITION ({values})"
+
+
+def generate_add_partition_statements(
+    table_name: str, specs: Iterable[str], partitions_per_statement: int = 100
+) -> Iterator[str]:
+    """Batched ``ALTER TABLE ... ADD IF NOT EXISTS PARTITION ...`` statements, lazily."""
+    batch = []
+    for spec in specs:
+        batch.append(format_partition_clause(spec))
+        if len(batch) >= partitions_per_statement:
+            yield _add_partitions(table_name, batch)
+            batch = []
+    if batch:
+        yield _add_partitions(table_name, batch)
+
+
+def _add_partitions(table_name: str, clauses: List[str]) -> str:
+    return f"ALTER TABLE {table_name} ADD IF NOT EXISTS\n  " + "\n  ".join(clauses)
+
+
+def generate_repair_statement(table_name: str) -> str:
+    return f"MSCK REPAIR TABLE {table_name}"
@@ -0,0 +1,271 @@
+"""
+Schema diff between two clean-JSON snapshots of the same table.
+
+Each table gets a fingerprint over everything that can be expressed as DDL,
+so unchanged tables are skipped without being compared field by field.
+Columns, properties and constraints of a changed table are compared through
+dicts keyed by name. Both steps are linear in the size of the catalog.
+"""
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from convertor.catalog import Table
+from convertor.catalog_index import group_foreign_keys
+from convertor.constraint_handling import generate_alter_statements
+from convertor.datatype_mapping import TypeMapper
+from convertor.identifiers import quote_identifier, quote_name
+
+# Statistics and bookkeeping Hive rewrites without any schema change.
+VOLATILE_PROPERTIES = frozenset(
+    {
+        "transient_lastDdlTime",
+        "numFiles",
+        "numFilesErasureCoded",
+        "numRows",
+        "rawDataSize",
+        "totalSize",
+        "COLUMN_STATS_ACCURATE",
+        "last_modified_by",
+        "last_modified_time",
+    }
+)
+
+
+def table_fingerprint(clean_json: dict) -> bytes:
+    """Digest of a clean-JSON table, ignoring ``meta`` and volatile properties."""
+    stable = {k: v for k, v in clean_json.items() if k != "meta"}
+    stable["table_parameters"] = _stable_properties(clean_json.get("table_parameters") or {})
+    encoded = json.dumps(stable, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).digest()
+
+
+def _stable_properties(properties: dict) -> dict:
+    return {k: v for k, v in properties.items() if k not in VOLATILE_PROPERTIES}
+
+
+def _column_state(table: Table) -> Dict[str, tuple]:
+    """name -> (databricks type, comment, not_null, default) for every data column."""
+    not_null = {c.column for c in table.constraints if c.kind == "not_null"}
+    defaults = {c.column: c.default_value for c in table.constraints if c.kind == "default"}
+    return {
+        col.name: (
+            TypeMapper.map_type(col.type),
+            col.comment or "",
+            bool(col.not_null) or col.name in not_null,
+            col.default if col.default is not None else defaults.get(col.name),
+        )
+        for col in table.columns
+        if col.name and col.type
+    }
+
+
+def _key_constraints(table: Table) -> Dict[str, tuple]:
+    """constraint name -> (kind, definition) for PRIMARY KEY, UNIQUE, FOREIGN KEY and CHECK."""
+    result = {}
+    for c in table.constraints:
+        if c.kind in ("primary_key", "unique") and c.columns:
+            result[c.constraint] = (c.kind, tuple(c.columns))
+        elif c.kind == "check":
+            result[c.constraint] = ("check", c.expression)
+    foreign_key_rows = [c for c in table.constraints if c.kind == "foreign_keys"]
+    for fk in group_foreign_keys(table.full_name, foreign_key_rows):
+        result[fk.constraint_name] = (
+            "foreign_key",
+            (fk.columns, fk.reference_table, fk.reference_columns),
+        )
+    return result
+
+
+def _quote(value: str) -> str:
+    return f"'{value}'"
+
+
+def _add_constraint_sql(table: str, name: str, kind: str, definition) -> str:
+    if kind == "check":
+        constraint = {"constraint_name": name, "expression": definition}
+    elif kind in ("primary_key", "unique"):
+        constraint = {"constraint_name": name, "columns": list(definition)}
+    else:
+        columns, reference_table, reference_columns = definition
+        constraint = {
+            "constraint_name": name,
+            "columns": list(columns),
+            "reference_table": reference_table,
+            "reference_columns": list(reference_columns),
+        }
+    return generate_alter_statements(table, {kind: [constraint]}, [kind])[0]
+
+
+class TableDiff:
+    """Statements that move one table from its old to its new definition."""
+
+    def __init__(self, table: str):
+        self.table = table
+        self.statements: List[str] = []
+        self.foreign_keys: List[str] = []  # applied after every table's other changes
+        self.notes: List[str] = []  # changes with no ALTER equivalent
+
+    def __bool__(self) -> bool:
+        return bool(self.statements or self.foreign_keys or self.notes)
+
+
+def diff_tables(old: Table, new: Table) -> TableDiff:
+    diff = TableDiff(new.full_name)
+    name = quote_name(new.database, new.table_name)
+
+    for field, label in (
+        ("table_type", "table type"),
+        ("location", "location"),
+    ):
+        if getattr(old, field) != getattr(new, field):
+            diff.notes.append(f"{label} changed: {getattr(old, field)!r} -> {getattr(new, field)!r}")
+    if old.storage_format.input_format != new.storage_format.input_format:
+        diff.notes.append("storage format changed")
+    if [(p.name, p.type) for p in old.partitions] != [(p.name, p.type) for p in new.partitions]:
+        diff.notes.append("partition columns changed; the table must be recreated")
+
+    old_constraints, new_constraints = _key_constraints(old), _key_constraints(new)
+    for cname, (kind, definition) in old_constraints.items():
+        if new_constraints.get(cname) == (kind, definition):
+            continue
+        if kind == "unique":
+            # Never created on Databricks, which has no UNIQUE constraints.
+            diff.notes.append(f"unique constraint {cname} changed or removed (not supported by Databricks)")
+            continue
+        diff.statements.append(f"ALTER TABLE {name} DROP CONSTRAINT {quote_identifier(cname)}")
+
+    _diff_columns(diff, name, _column_state(old), _column_state(new))
+    _diff_properties(diff, name, old.table_parameters, new.table_parameters)
+
+    for cname, (kind, definition) in new_constraints.items():
+        if old_constraints.get(cname) != (kind, definition):
+            if kind == "unique":
+                if cname not in old_constraints:
+                    diff.notes.append(f"unique constraint {cname} added (not supported by Databricks)")
+                continue
+            sql = _add_constraint_sql(diff.table, cname, kind, definition)
+            (diff.foreign_keys if kind == "foreign_key" else diff.statements).append(sql)
+    return diff
+
+
+def _diff_columns(diff: TableDiff, name: str, old: Dict[str, tuple], new: Dict[str, tuple]) -> None:
+    if old == new:
+        return
+
+    dropped = [quote_identifier(col) for col in old if col not in new]
+    if dropped:
+        diff.statements.append(f"ALTER TABLE {name} DROP COLUMNS ({', '.join(dropped)})")
+
+    added = []
+    for col, (dtype, comment, not_null, default) in new.items():
+        previous = old.get(col)
+        if previous is None:
+            definition = f"{quote_identifier(col)} {dtype}"
+            if comment:
+                definition += f" COMMENT {_quote(comment)}"
+            added.append(definition)
+            continue
+        if previous == (dtype, comment, not_null, default):
+            continue
+        old_type, old_comment, old_not_null, old_default = previous
+        alter = f"ALTER TABLE {name} ALTER COLUMN {quote_identifier(col)}"
+        if old_type != dtype:
+            diff.statements.append(f"{alter} TYPE {dtype}")
+        if old_comment != comment:
+            diff.statements.append(f"{alter} COMMENT {_quote(comment)}")
+        if old_not_null != not_null:
+            diff.statements.append(f"{alter} {'SET' if not_null else 'DROP'} NOT NULL")
+        if old_default != default:
+            diff.statements.append(
+                f"{alter} DROP DEFAULT" if default is None else f"{alter} SET DEFAULT {default}"
+            )
+    if added:
+        diff.statements.append(f"ALTER TABLE {name} ADD COLUMNS ({', '.join(added)})")
+
+    # New NOT NULL / DEFAULT on added columns need their own ALTERs.
+    for col, (_, _, not_null, default) in new.items():
+        if col in old:
+            continue
+        alter = f"ALTER TABLE {name} ALTER COLUMN {quote_identifier(col)}"
+        if not_null:
+            diff.statements.append(f"{alter} SET NOT NULL")
+        if default is not None:
+            diff.statements.append(f"{alter} SET DEFAULT {default}")
+
+
+def _diff_properties(diff: TableDiff, name: str, old: dict, new: dict) -> None:
+    old, new = _stable_properties(old), _stable_properties(new)
+    if old == new:
+        return
+    changed = {k: v for k, v in new.items() if old.get(k) != v}
+    removed = [k for k in old if k not in new]
+    if changed:
+        props = ", ".join(f"{_quote(k)} = {_quote(v)}" for k, v in changed.items())
+        diff.statements.append(f"ALTER TABLE {name} SET TBLPROPERTIES ({props})")
+    if removed:
+        props = ", ".join(_quote(k) for k in removed)
+        diff.statements.append(f"ALTER TABLE {name} UNSET TBLPROPERTIES IF EXISTS ({props})")
+
+
+class SchemaDiff:
+    """Result of comparing two snapshots; see diff_snapshots()."""
+
+    def __init__(self):
+        self.new_tables: List[str] = []
+        self.dropped_tables: List[str] = []
+        self.changed: List[TableDiff] = []
+        self.unchanged = 0
+
+    def to_sql(self) -> str:
+        lines = [
+            "-- Schema changes since the previous snapshot",
+            f"-- {len(self.changed)} changed, {len(self.new_tables)} new, "
+            f"{len(self.dropped_tables)} removed, {self.unchanged} unchanged tables",
+        ]
+        if self.new_tables:
+            lines += ["", "-- New tables (apply their CREATE TABLE DDL)"]
+            lines += [f"--   {name}" for name in self.new_tables]
+        if self.dropped_tables:
+            lines += ["", "-- Tables no longer in Hive (not dropped automatically)"]
+            lines += [f"--   {name}" for name in self.dropped_tables]
+        for diff in self.changed:
+            if not (diff.statements or diff.notes):
+                continue
+            lines += ["", f"-- Table: {diff.table}"]
+            lines += [f"-- NOTE: {note}" for note in diff.notes]
+            lines += [f"{s};" for s in diff.statements]
+        foreign_keys = [s for diff in self.changed for s in diff.foreign_keys]
+        if foreign_keys:
+            lines += ["", "-- Foreign keys"] + [f"{s};" for s in foreign_keys]
+        return "\n".join(lines) + "\n"
+
+
+def diff_snapshots(old: Dict[str, tuple], new) -> SchemaDiff:
+    """
+    Compare ``old`` ({db.table: (fingerprint, Table)}) with ``new``, an
+    iterable of clean-JSON dicts. Only tables whose fingerprints differ are
+    converted to the catalog model and diffed.
+    """
+    result = SchemaDiff()
+    seen = set()
+    for clean_json in new:
+        name = f"{clean_json.get('database', '')}.{clean_json.get('table_name', '')}"
+        seen.add(name)
+        previous: Optional[tuple] = old.get(name)
+        if previous is None:
+            result.new_tables.append(name)
+            continue
+        fingerprint, old_table = previous
+        if fingerprint == table_fingerprint(clean_json):
+            result.unchanged += 1
+            continue
+        diff = diff_tables(old_table, Table.from_dict(clean_json))
+        if diff:
+            result.changed.append(diff)
+        else:
+            result.unchanged += 1
+    result.dropped_tables = sorted(name for name in old if name not in seen)
+    result.new_tables.sort()
+    result.changed.sort(key=lambda d: d.table)
+    return result
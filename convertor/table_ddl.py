@@ -0,0 +1,56 @@
+from typing import Union
+
+from convertor.catalog import StorageFormat, Table
+from convertor.constraint_handling import generate_all_constraints
+from convertor.ddl_renderer import Dialect, fold_constraints, get_dialect
+
+
+def build_table_ddl(
+    db: str,
+    table: str,
+    clean_json: dict,
+    inline_constraints: bool = True,
+    dialect: Union[str, Dialect] = "databricks",
+) -> str:
+    """
+    CREATE TABLE DDL for one table in ``dialect`` (see convertor.ddl_renderer);
+    folds its constraints into ``clean_json`` in place.
+
+    With ``inline_constraints=False`` the PRIMARY/UNIQUE/FOREIGN KEY and CHECK
+    ALTER statements are left out, for a catalog-wide migration plan to apply.
+    """
+    if isinstance(clean_json, Table):
+        return build_model_ddl(clean_json, inline_constraints, dialect)
+    dialect = get_dialect(dialect)
+    constraint_package = generate_all_constraints(f"{db}.{table}", clean_json, dialect)
+    column_constraints = constraint_package["column_modifications"]
+
+    for col in clean_json["columns"]:
+        if col["name"] in column_constraints:
+            col.update(column_constraints[col["name"]])
+
+    # Merge additional table_properties from constraint_manager
+    clean_json.get("table_parameters", {}).update(constraint_package["table_properties"])
+
+    # Dialects take clean-JSON columns as they are; only the table-level
+    # fields are wrapped, so no per-column records are built.
+    model = Table(
+        database=db,
+        table_name=table,
+        location=clean_json.get("location", ""),
+        table_type=clean_json.get("table_type", ""),
+        columns=clean_json.get("columns", []),
+        partitions=clean_json.get("partitions", []),
+        storage_format=StorageFormat.from_dict(clean_json.get("storage_format")),
+        table_parameters=clean_json.get("table_parameters"),
+    )
+    model.table_parameters.update(constraint_package["table_properties"])
+    return get_dialect(dialect).render(model, constraint_package, inline_constraints)
+
+
+def build_model_ddl(
+    model: Table, inline_constraints: bool = True, dialect: Union[str, Dialect] = "databricks"
+) -> str:
+    """build_table_ddl() for a catalog Table; constraints are folded into the model."""
+    constraint_package = fold_constraints(model, dialect)
+    return get_dialect(dialect).render(model, constraint_package, inline_constraints)
@@ -0,0 +1,87 @@
+"""
+Table statistics for scheduling and migration sizing.
+
+Hive keeps numRows, totalSize, numFiles and rawDataSize in a table's
+parameters once statistics have been gathered; it writes -1 (or nothing)
+when they never were, and those read as None here.
+"""
+from typing import Optional
+
+STAT_PARAMETERS = {
+    "num_rows": "numRows",
+    "total_size": "totalSize",
+    "num_files": "numFiles",
+    "raw_data_size": "rawDataSize",
+}
+
+
+def _stat(parameters: dict, key: str) -> Optional[int]:
+    try:
+        value = int(str(parameters.get(key, "")).strip())
+    except ValueError:
+        return None
+    return value if value >= 0 else None
+
+
+class TableStats:
+    __slots__ = (
+        "database",
+        "table",
+        "columns",
+        "partition_columns",
+        "num_rows",
+        "total_size",
+        "num_files",
+        "raw_data_size",
+    )
+
+    def __init__(self, database: str, table: str, columns: int = 0, partition_columns: int = 0,
+                 num_rows: int = None, total_size: int = None, num_files: int = None,
+                 raw_data_size: int = None):
+        self.database = database
+        self.table = table
+        self.columns = columns
+        self.partition_columns = partition_columns
+        self.num_rows = num_rows
+        self.total_size = total_size
+        self.num_files = num_files
+        self.raw_data_size = raw_data_size
+
+    @classmethod
+    def from_clean_json(cls, clean_json: dict) -> "TableStats":
+        parameters = clean_json.get("table_parameters") or {}
+        return cls(
+            clean_json.get("database", ""),
+            clean_json.get("table_name", ""),
+            len(clean_json.get("columns", [])),
+            len(clean_json.get("partitions", [])),
+            **{field: _stat(parameters, key) for field, key in STAT_PARAMETERS.items()},
+        )
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return self.database, self.table
+
+    @property
+    def crawl_cost(self) -> int:
+        """DESCRIBE FORMATTED rows and conversion work both grow with the column count."""
+        return self.columns + self.partition_columns
+
+    @property
+    def partition_cost(self) -> int:
+        """Listing partitions grows with the data files behind them."""
+        return self.num_files or 0
+
+    @property
+    def average_file_size(self) -> Optional[float]:
+        if not self.num_files or self.total_size is None:
+            return None
+        return self.total_size / self.num_files
+
+    def is_small_file_heavy(self, small_file_bytes: int, min_files: int) -> bool:
+        """At least ``min_files`` files averaging under ``small_file_bytes``."""
+        average = self.average_file_size
+        return average is not None and self.num_files >= min_files and average < small_file_bytes
+
+    def __repr__(self) -> str:
+        return f"TableStats({self.database}.{self.table}, columns={self.columns}, files={self.num_files})"
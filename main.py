@@ -1,18 +1,55 @@
+import argparse
+import asyncio
 import yaml
 import os
-import json
-from connector.connection import ConnectionToHive
-from connector.db_function import list_databases, list_tables, describe_formatted
-from connector.section_fetching import split_describe_formatted
-from connector.utils import convert_sections_to_clean_json
-from convertor.generate_databricks_ddl import generate_create_table_ddl
-from convertor.helper_methods import (
-    generate_properties_clause,
-    generate_optimize_statement,
-    infer_format,
-    export_ddl_to_sql,
+import copy
+import queue
+import time
+from functools import partial
+from typing import Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
 )
-from convertor.constraint_handling import generate_all_constraints
+from connector.async_crawler import AsyncHiveCrawler
+from connector.connection_pool import HiveConnectionPool
+from connector.db_function import list_databases, list_tables
+from connector.describe_stream import PackedDescription, parse_describe_stream
+from connector.metastore_backend import (
+    connect_metastore,
+    list_metastore_databases,
+    load_database_metadata,
+)
+from connector.resilience import ResilientFetcher
+from connector.storage_scanner import StorageScanner
+from convertor.ddl_renderer import get_dialect
+from convertor.helper_methods import export_ddl_to_sql
+from convertor.table_ddl import build_table_ddl
+from convertor.table_stats import TableStats
+from pipeline import json_codec
+from pipeline.apply_stage import apply_export
+from pipeline.checkpoint import CheckpointJournal, ResumeState
+from pipeline.merge_shards import write_run_summary
+from pipeline.metadata_cache import MetadataCache
+from pipeline.metrics import RunMetrics, configure_metrics, get_metrics, set_metrics
+from pipeline.migration_plan import write_migration_plan
+from pipeline.partition_stage import PartitionStage, partitioned_tables
+from pipeline.schema_diff import load_snapshot, write_schema_diff
+from pipeline.sizing import (
+    MIN_SMALL_FILES,
+    OPTIMIZE_FILE,
+    SMALL_FILE_MB,
+    STORAGE_SCAN_FILE,
+    load_stats,
+    longest_first,
+    scan_storage,
+    schedule_jobs,
+    write_sizing_report,
+)
+from pipeline.output_writer import OutputWriter
+from pipeline.table_filter import TableFilter, parse_shard
 
 
 def load_hive_config(path: str = "config/creds.yaml") -> dict:
@@ -21,75 +58,348 @@ def load_hive_config(path: str = "config/creds.yaml") -> dict:
         return yaml.safe_load(f)
 
 
-def export_clean_json(output_dir: str, db: str, table: str, clean_json: dict) -> None:
+def export_clean_json(output_dir: str, db: str, table: str, clean_json: dict) -> str:
     os.makedirs(output_dir, exist_ok=True)
     file_path = os.path.join(output_dir, f"{db}.{table}_clean.json")
-    with open(file_path, "w") as f:
-        json.dump(clean_json, f, indent=2)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(json_codec.dumps_pretty(clean_json))
+    return file_path
 
 
-def process_table(hive_conn, db: str, table: str) -> None:
+def fetch_table(
+    fetcher: ResilientFetcher, db: str, table: str, fingerprint: bool = True
+) -> PackedDescription:
+    """DESCRIBE FORMATTED rows, packed (and fingerprinted for the cache) as they are fetched."""
     print(f"Running DESCRIBE FORMATTED for: {db}.{table}")
-    description = describe_formatted(hive_conn._conn, db, table)
-    sections = split_describe_formatted(description)
-    clean_json = convert_sections_to_clean_json(db, table, sections)
-    export_clean_json("metadata_output", db, table, clean_json)
-
-    columns = clean_json.get("columns", [])
-    partitions = clean_json.get("partitions", [])
-    storage_format = clean_json.get("storage_format", {})
-    skewed_cols = storage_format.get("skewed_columns", [])
-    table_type = clean_json.get("table_type", "")
-    location = clean_json.get("location", "")
-    constraints = clean_json.get("constraints", {})
-    constraint_package = generate_all_constraints(f"{db}.{table}", clean_json)
-    column_constraints = constraint_package["column_modifications"]
-
-    for col in clean_json["columns"]:
-        if col["name"] in column_constraints:
-            col.update(column_constraints[col["name"]])
-
-    properties = clean_json.get("table_parameters", {})
-
-    input_format = storage_format.get("input_format", "")
-    file_format = infer_format(input_format)
-
-    full_table_name = f"{db}.{table}"
-
-    ddl = generate_create_table_ddl(
-        table_name=full_table_name,
-        columns=columns,
-        partitions=partitions,
-        table_type=table_type,
-        location=location,
-        skewed_cols=skewed_cols,
-        file_format=file_format,
+    return fetcher.describe(db, table, partial(PackedDescription, fingerprint))
+
+
+def convert_table(
+    db: str,
+    table: str,
+    description: Iterable[tuple],
+    inline_constraints: bool = True,
+    dialect: str = "databricks",
+) -> tuple[str, dict]:
+    """CPU-bound stage: raw DESCRIBE FORMATTED rows to (ddl, clean_json)."""
+    metrics = get_metrics()
+    with metrics.stage("convert.parse"):
+        clean_json = parse_describe_stream(db, table, description)
+    # build_table_ddl folds constraints into the columns/properties it is given,
+    # so hand it a copy and keep the exported JSON as parsed.
+    with metrics.stage("convert.ddl"):
+        ddl = build_table_ddl(
+            db, table, copy.deepcopy(clean_json), inline_constraints, dialect
+        )
+    return ddl, clean_json
+
+
+def convert_table_with_metrics(
+    db: str,
+    table: str,
+    description: Iterable[tuple],
+    inline_constraints: bool = True,
+    dialect: str = "databricks",
+) -> tuple[str, dict, dict]:
+    """convert_table for a worker process; also returns the stage timings it recorded."""
+    metrics = set_metrics(RunMetrics(enabled=True))
+    ddl, clean_json = convert_table(db, table, description, inline_constraints, dialect)
+    return ddl, clean_json, metrics.stages
+
+
+def write_table_outputs(db: str, table: str, ddl: str, clean_json: dict) -> list[str]:
+    return [
+        export_clean_json("metadata_output", db, table, clean_json),
+        export_ddl_to_sql("ddl_output", db, table, ddl),
+    ]
+
+
+def _table_result(
+    db: str,
+    table: str,
+    start: float,
+    error: Exception = None,
+    status: str = "ok",
+    journal: CheckpointJournal = None,
+) -> dict:
+    """
+    Summary row for one table. Failed and unchanged tables are journaled
+    here; converted ones by the OutputWriter once their files are published.
+    """
+    if error is not None:
+        print(f"Failed to process table {db}.{table}: {error}")
+        status = "failed"
+    seconds = time.perf_counter() - start
+    get_metrics().observe_table(db, table, seconds, status)
+    if journal is not None and status != "ok":
+        journal.record(db, table, status, str(error) if error is not None else "")
+    return {
+        "database": db,
+        "table": table,
+        "status": status,
+        "error": str(error) if error is not None else "",
+        "seconds": round(seconds, 3),
+    }
+
+
+def _check_cache(cache: MetadataCache, db: str, table: str, description: PackedDescription) -> tuple:
+    """Return (unchanged, cache entry to store once the table is written)."""
+    if cache is None:
+        return False, None
+    change, entry = cache.classify(db, table, description.fingerprint)
+    return change == "unchanged", entry
+
+
+def _store_converted(
+    converted: tuple, db: str, table: str, fetched_rows: bool, entry: dict, write, cache
+) -> None:
+    ddl, clean_json, *stages = converted
+    if stages:
+        get_metrics().merge_stages(stages[0])
+    outputs = write(db, table, ddl, clean_json)
+    if entry is not None and fetched_rows:
+        cache.update(db, table, entry, outputs)
+
+
+def run_pipeline(
+    pool: HiveConnectionPool,
+    jobs: list[tuple[str, str]],
+    convert_workers: int = None,
+    queue_size: int = 64,
+    cache: MetadataCache = None,
+    writer: OutputWriter = None,
+    fetcher: ResilientFetcher = None,
+    inline_constraints: bool = True,
+    dialect: str = "databricks",
+) -> list[dict]:
+    """
+    Two-stage run: pool.size threads fetch DESCRIBE rows in fetchmany()
+    batches, packed as they arrive (see PackedDescription), into a bounded
+    queue, and a process pool converts them, largest description first.
+    Results keep the order of ``jobs``; schedule_jobs() orders them longest first.
+
+    With a ``cache``, tables whose DESCRIBE output is unchanged since the last
+    run are neither converted nor rewritten. With a ``writer``, outputs are
+    handed to its background thread instead of being written inline. The
+    ``fetcher`` supplies query deadlines, retries and hedging.
+    """
+    fetcher = fetcher or ResilientFetcher(pool)
+    write = writer.write if writer is not None else write_table_outputs
+    journal = writer.journal if writer is not None else None
+    convert = convert_table_with_metrics if get_metrics().enabled else convert_table
+    convert = partial(convert, inline_constraints=inline_constraints, dialect=dialect)
+    results = [None] * len(jobs)
+    # Widest tables convert first among those already fetched.
+    fetched = queue.PriorityQueue(maxsize=queue_size)
+
+    def fetch(idx: int, db: str, table: str) -> None:
+        start = time.perf_counter()
+        try:
+            description = fetch_table(fetcher, db, table, cache is not None)
+            unchanged, entry = _check_cache(cache, db, table, description)
+            if unchanged:
+                results[idx] = _table_result(db, table, start, status="unchanged", journal=journal)
+                return
+            fetched.put((-len(description), idx, (db, table, start, description, entry)))
+        except Exception as e:
+            results[idx] = _table_result(db, table, start, e, journal=journal)
+
+    def fetch_all(executor: ThreadPoolExecutor) -> None:
+        try:
+            futures = [executor.submit(fetch, i, db, t) for i, (db, t) in enumerate(jobs)]
+            for f in futures:
+                f.result()
+        finally:
+            # Always wake the converter loop, or it waits on fetched.get() forever.
+            fetched.put((float("inf"), -1, None))
+
+    convert_workers = convert_workers or os.cpu_count() or 1
+    max_in_flight = convert_workers * 2
+
+    with ThreadPoolExecutor(max_workers=pool.size + 1) as fetchers, ProcessPoolExecutor(
+        max_workers=convert_workers
+    ) as converters:
+        fetchers.submit(fetch_all, fetchers)
+        in_flight = {}
+        fetching = True
+
+        while fetching or in_flight:
+            if fetching and len(in_flight) < max_in_flight:
+                _, idx, item = fetched.get()
+                if item is None:
+                    fetching = False
+                    continue
+                db, table, start, description, entry = item
+                future = converters.submit(convert, db, table, description)
+                in_flight[future] = (idx, db, table, start, bool(description), entry)
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, db, table, start, fetched_rows, entry = in_flight.pop(future)
+                try:
+                    _store_converted(future.result(), db, table, fetched_rows, entry, write, cache)
+                    results[idx] = _table_result(db, table, start)
+                except Exception as e:
+                    results[idx] = _table_result(db, table, start, e, journal=journal)
+
+    return results
+
+
+async def run_async_pipeline(
+    crawler: AsyncHiveCrawler,
+    jobs: list[tuple[str, str]],
+    convert_workers: int = None,
+    cache: MetadataCache = None,
+    writer: OutputWriter = None,
+    inline_constraints: bool = True,
+    dialect: str = "databricks",
+) -> list[dict]:
+    """
+    asyncio variant of run_pipeline: the crawler keeps up to its concurrency
+    limit of DESCRIBE calls in flight, and each result is handed to the
+    process pool as soon as it arrives.
+    """
+    write = writer.write if writer is not None else write_table_outputs
+    journal = writer.journal if writer is not None else None
+    convert = convert_table_with_metrics if get_metrics().enabled else convert_table
+    convert = partial(convert, inline_constraints=inline_constraints, dialect=dialect)
+    results = [None] * len(jobs)
+    loop = asyncio.get_running_loop()
+    convert_workers = convert_workers or os.cpu_count() or 1
+    slots = asyncio.Semaphore(convert_workers * 2)
+    tasks = set()
+
+    async def finish(converters, idx, db, table, start, description, entry):
+        try:
+            converted = await loop.run_in_executor(converters, convert, db, table, description)
+            _store_converted(converted, db, table, bool(description), entry, write, cache)
+            results[idx] = _table_result(db, table, start)
+        except Exception as e:
+            results[idx] = _table_result(db, table, start, e, journal=journal)
+        finally:
+            slots.release()
+
+    with ProcessPoolExecutor(max_workers=convert_workers) as converters:
+        sink = partial(PackedDescription, fingerprint=cache is not None)
+        async for idx, db, table, start, description, error in crawler.describe_all(jobs, sink):
+            if error is not None:
+                results[idx] = _table_result(db, table, start, error, journal=journal)
+                continue
+            unchanged, entry = _check_cache(cache, db, table, description)
+            if unchanged:
+                results[idx] = _table_result(db, table, start, status="unchanged", journal=journal)
+                continue
+            await slots.acquire()
+            task = asyncio.create_task(
+                finish(converters, idx, db, table, start, description, entry)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    return results
+
+
+async def crawl_async(
+    crawler: AsyncHiveCrawler,
+    databases: list[str],
+    table_filter: TableFilter = None,
+    stats: dict = None,
+    resume: ResumeState = None,
+    unlisted: set = None,
+    **kwargs,
+) -> list[dict]:
+    jobs = await crawler.list_jobs(databases, table_filter, unlisted)
+    for db in databases:
+        print(f"Tables in database '{db}': {sum(1 for d, _ in jobs if d == db)}")
+    if resume is not None:
+        jobs = resume.pending(jobs)
+    return await run_async_pipeline(crawler, schedule_jobs(jobs, stats or {}), **kwargs)
+
+
+def print_summary(results: list[dict]) -> None:
+    failed = [r for r in results if r["status"] == "failed"]
+    unchanged = [r for r in results if r["status"] == "unchanged"]
+    print(
+        f"\n===== Summary: {len(results) - len(failed) - len(unchanged)} converted, "
+        f"{len(unchanged)} unchanged, {len(failed)} failed ====="
     )
+    for r in results:
+        line = f"{r['status'].upper():9} {r['database']}.{r['table']} ({r['seconds']}s)"
+        if r["error"]:
+            line += f" - {r['error']}"
+        print(line)
 
-    # Merge additional table_properties from constraint_manager
-    properties.update(constraint_package["table_properties"])
 
-    ddl += generate_properties_clause(properties, constraint_package, columns)
+def print_change_report(report: dict) -> None:
+    print("\n===== Metadata changes since last run =====")
+    for kind in ("new", "changed", "dropped", "failed"):
+        print(f"{kind.capitalize()} ({len(report[kind])}):")
+        for key in report[kind]:
+            print(f"  {key}")
+    print(f"Unchanged: {len(report['unchanged'])}")
 
-    # Step 3: Append ALTER TABLE constraint statements
-    alter_statements = constraint_package["alter_statements"]
-    if alter_statements:
-        ddl += "\n\n-- Constraints"
-        ddl += "\n" + "\n".join(alter_statements)
 
-    bucket_cols = storage_format.get("bucket_columns", [])
-    optimize_stmt = generate_optimize_statement(bucket_cols, table, db)
-    if optimize_stmt:
-        ddl += f"\n{optimize_stmt}"
+def run_metastore(
+    connection,
+    databases: list[str],
+    convert_workers: int = None,
+    placeholder: str = "?",
+    writer: OutputWriter = None,
+    inline_constraints: bool = True,
+    table_filter: TableFilter = None,
+    dialect: str = "databricks",
+    resume: ResumeState = None,
+) -> list[dict]:
+    """Convert whole databases bulk-loaded from the metastore RDBMS; tables
+    ``resume`` lists as finished are skipped."""
+    write = writer.write if writer is not None else write_table_outputs
+    journal = writer.journal if writer is not None else None
+    table_filter = table_filter or TableFilter()
+    results = []
+    with ProcessPoolExecutor(max_workers=convert_workers or os.cpu_count() or 1) as converters:
+        for db in databases:
+            print(f"\nLoading metastore metadata for database '{db}'")
+            start = time.perf_counter()
+            with get_metrics().stage("metastore.load_database"):
+                tables = load_database_metadata(
+                    connection, db, placeholder, partial(table_filter.selects, db)
+                )
+            # Widest tables first, so one huge table does not finish last.
+            order = longest_first(
+                list(tables), lambda t: TableStats.from_clean_json(tables[t]).crawl_cost
+            )
+            if resume is not None:
+                order = [table for _, table in resume.pending([(db, t) for t in order])]
+            futures = [
+                (
+                    table,
+                    tables[table],
+                    converters.submit(
+                        build_table_ddl, db, table, tables[table], inline_constraints, dialect
+                    ),
+                )
+                for table in order
+            ]
+            for table, clean_json, future in futures:
+                try:
+                    write(db, table, future.result(), clean_json)
+                    results.append(_table_result(db, table, start))
+                except Exception as e:
+                    results.append(_table_result(db, table, start, e, journal=journal))
+    return results
 
-    export_ddl_to_sql("ddl_output", db, table, ddl)
 
+def apply_write_failures(results: list[dict], failed: dict) -> None:
+    for r in results:
+        error = failed.get(f"{r['database']}.{r['table']}")
+        if error:
+            r.update(status="failed", error=f"write failed: {error}")
 
-def main():
-    config = load_hive_config()
-    hive_conn = ConnectionToHive(config)
-    hive_conn.connect()
 
+def prompt_databases(list_all) -> list[str]:
     option = (
         input(
             "Type 'user' to enter databases manually or 'all' to fetch all from Hive: "
@@ -99,27 +409,442 @@ def main():
     )
     if option == "user":
         user_input = input("Enter list of databases (comma-separated): ").strip()
-        databases = [db.strip() for db in user_input.split(",") if db.strip()]
+        return [db.strip() for db in user_input.split(",") if db.strip()]
     elif option == "all":
-        databases = list_databases(hive_conn._conn)
-    else:
-        print("Invalid option. Please type 'user' or 'all'.")
-        hive_conn.close()
+        return list_all()
+
+    print("Invalid option. Please type 'user' or 'all'.")
+    return None
+
+
+def select_databases(args: argparse.Namespace, list_all) -> list[str]:
+    """Databases named on the command line, else the interactive prompt."""
+    if args.all_databases:
+        return list_all()
+    if args.databases:
+        return [db.strip() for db in args.databases.split(",") if db.strip()]
+    return prompt_databases(list_all)
+
+
+def main_metastore(config: dict, args: argparse.Namespace) -> tuple:
+    """Returns (databases, results), or None when nothing was converted."""
+    metastore_config = config.get("metastore", {})
+    placeholder = metastore_config.get("placeholder", "?")
+    try:
+        connection = connect_metastore(metastore_config)
+    except Exception as e:
+        print(f"[ERROR] Failed to connect to the Hive metastore database: {e}")
+        return None
+
+    try:
+        databases = select_databases(args, lambda: list_metastore_databases(connection))
+        if databases is None:
+            return None
+        table_filter = TableFilter.from_config(config)
+        databases = table_filter.filter_databases(databases)
+        writer = OutputWriter.from_config(config)
+        resume = start_checkpoint(config, args, writer)
+        previous = load_previous_snapshot(config, writer, table_filter.selects)
+        results = run_metastore(
+            connection,
+            databases,
+            config.get("convert_workers"),
+            placeholder,
+            writer,
+            inline_constraints=not uses_migration_plan(config),
+            table_filter=table_filter,
+            dialect=ddl_dialect(config),
+            resume=resume,
+        )
+        apply_write_failures(results, writer.close())
+        close_checkpoint(writer, resume, results)
+        print_summary(results)
+        if uses_migration_plan(config):
+            export_migration_plan(writer)
+        export_schema_diff(previous, writer)
+        export_sizing_report(config, writer, results)
+        export_apply(config, writer, results, args.resume)
+        return databases, results
+    finally:
+        connection.close()
+
+
+def start_checkpoint(config: dict, args: argparse.Namespace, writer: OutputWriter) -> ResumeState:
+    """Attach the checkpoint journal to ``writer``; with --resume, return what
+    the interrupted run already finished (None otherwise)."""
+    settings = config.get("checkpoint", {}) or {}
+    if not settings.get("enabled", True):
+        if args.resume:
+            print("[ERROR] --resume needs checkpoint.enabled; converting every table")
+        return None
+    resume = None
+    if args.resume:
+        if writer.consolidated:
+            # Consolidated files are rewritten from scratch, so skipped tables would be lost.
+            print("[INFO] --resume needs per_table output layouts; converting every table")
+        else:
+            resume = ResumeState.load(settings.get("path", "run_journal.jsonl"))
+    writer.journal = CheckpointJournal.from_config(config, resume=resume is not None)
+    return resume
+
+
+def close_checkpoint(writer: OutputWriter, resume: ResumeState, results: list[dict]) -> None:
+    """Close the journal (after writer.close()) and add the resumed tables to ``results``."""
+    if writer.journal is not None:
+        writer.journal.close()
+    if resume is not None:
+        results.extend(resume.results())
+
+
+def uses_migration_plan(config: dict) -> bool:
+    return (config.get("output", {}) or {}).get("constraints", "inline") == "plan"
+
+
+def ddl_dialect(config: dict) -> str:
+    """The configured ``output.dialect``; raises ValueError for an unknown one."""
+    return get_dialect((config.get("output", {}) or {}).get("dialect", "databricks")).name
+
+
+def conversion_settings(config: dict) -> dict:
+    """Output settings that change a table's DDL; the metadata cache keys on them."""
+    output = config.get("output", {}) or {}
+    return {"dialect": ddl_dialect(config), "constraints": output.get("constraints", "inline")}
+
+
+def hive_pool_size(config: dict) -> int:
+    """``pool_size``, raised to ``async_crawler.concurrency`` for the asyncio
+    crawler: each statement it keeps in flight holds a pooled session."""
+    size = max(1, int(config.get("pool_size", 1)))
+    unlisted = set()  # databases whose SHOW TABLES failed
+    if config.get("crawler", "threads") == "asyncio":
+        concurrency = int((config.get("async_crawler", {}) or {}).get("concurrency", 100))
+        if concurrency > size:
+            print(f"[INFO] Opening up to {concurrency} Hive sessions for async_crawler.concurrency "
+                  f"(pool_size is {size})")
+            size = concurrency
+    return size
+
+
+def export_migration_plan(writer: OutputWriter) -> None:
+    try:
+        write_migration_plan(
+            writer.metadata_source, os.path.join(writer.ddl_dir, "migration_plan.sql")
+        )
+    except Exception as e:
+        print(f"[ERROR] Failed to write the migration plan: {e}")
+
+
+def export_apply(config: dict, writer: OutputWriter, results: list[dict], resume: bool = False) -> None:
+    """Apply this run's DDL to the ``apply`` target, when enabled."""
+    if not (config.get("apply", {}) or {}).get("enabled", False):
+        return
+    selected = {(r["database"], r["table"]) for r in results if r["status"] != "failed"}
+    if not selected:
         return
+    try:
+        apply_export(
+            config,
+            writer.metadata_source,
+            os.path.join(writer.ddl_dir, "apply_log.jsonl"),
+            ddl_dialect(config),
+            selected,
+            resume,
+        )
+    except Exception as e:
+        print(f"[ERROR] Failed to apply the DDL to the target: {e}")
 
-    for db in databases:
-        print(f"\nTables in database '{db}':")
+
+def load_previous_snapshot(config: dict, writer: OutputWriter, selected=None) -> dict:
+    """The last run's clean JSON, read before this run overwrites it (None when diffing is off).
+    Tables ``selected(db, table)`` rejects are left out, so they are not reported as removed."""
+    if not (config.get("output", {}) or {}).get("schema_diff", False):
+        return None
+    return load_snapshot(writer.metadata_source, selected)
+
+
+def export_schema_diff(previous: dict, writer: OutputWriter) -> None:
+    if previous is None:
+        return
+    if not previous:
+        print("[INFO] No previous export to diff against; schema_changes.sql not written")
+        return
+    try:
+        write_schema_diff(
+            previous, writer.metadata_source, os.path.join(writer.ddl_dir, "schema_changes.sql")
+        )
+    except Exception as e:
+        print(f"[ERROR] Failed to write schema changes: {e}")
+
+
+def load_schedule_stats(config: dict, writer: OutputWriter, databases: list[str]) -> dict:
+    """Statistics from the last export for longest-first scheduling ({} when disabled)."""
+    if config.get("scheduling", "longest_first") != "longest_first":
+        return {}
+    try:
+        return load_stats(writer.metadata_source, databases)
+    except Exception as e:
+        print(f"[ERROR] Failed to read table statistics from the last export: {e}")
+        return {}
+
+
+def export_sizing_report(config: dict, writer: OutputWriter, results: list[dict]) -> None:
+    settings = config.get("sizing", {}) or {}
+    if not settings.get("enabled", False):
+        return
+    selected = {(r["database"], r["table"]) for r in results if r["status"] != "failed"}
+    if not selected:
+        return
+    storage = None
+    scan_settings = config.get("storage_scan", {}) or {}
+    if scan_settings.get("enabled", False):
         try:
-            tables = list_tables(hive_conn._conn, db)
-            for table in tables:
-                try:
-                    process_table(hive_conn, db, table)
-                except Exception as e:
-                    print(f"Failed to describe table: {e}")
+            storage = scan_storage(
+                StorageScanner.from_config(config),
+                writer.metadata_source,
+                os.path.join(writer.ddl_dir, STORAGE_SCAN_FILE),
+                lambda db, table: (db, table) in selected,
+                scan_settings.get("include_managed", False),
+            )
         except Exception as e:
-            print(f"Error fetching tables for '{db}': {e}")
+            print(f"[ERROR] Failed to scan table storage; sizing from Hive statistics: {e}")
+    try:
+        write_sizing_report(
+            writer.metadata_source,
+            os.path.join(writer.ddl_dir, "sizing_report.txt"),
+            lambda db, table: (db, table) in selected,
+            settings.get("small_file_mb", SMALL_FILE_MB),
+            settings.get("min_small_files", MIN_SMALL_FILES),
+            storage,
+            # OPTIMIZE is Delta SQL.
+            os.path.join(writer.ddl_dir, OPTIMIZE_FILE) if ddl_dialect(config) == "databricks" else None,
+        )
+    except Exception as e:
+        print(f"[ERROR] Failed to write the sizing report: {e}")
+
+
+def export_partitions(
+    pool: HiveConnectionPool, config: dict, writer: OutputWriter, results: list[dict], timeout: float
+) -> None:
+    """Write partition registration scripts for every converted, partitioned table."""
+    settings = config.get("partitions", {}) or {}
+    if not settings.get("enabled", False):
+        return
+    selected = {(r["database"], r["table"]) for r in results if r["status"] != "failed"}
+    jobs, delta_tables = partitioned_tables(writer.metadata_source, selected)
+    if delta_tables:
+        print(f"[INFO] Skipping partitions of {len(delta_tables)} Delta tables (tracked in the Delta log)")
+    if not jobs:
+        return
+
+    print(f"\nExporting partitions for {len(jobs)} tables")
+    stage = PartitionStage.from_config(pool, config, timeout)
+    exported = stage.run(jobs)
+    failed = [r for r in exported if r["error"]]
+    repaired = [r for r in exported if r["mode"] == "msck" and not r["error"]]
+    print(
+        f"[INFO] Partitions: {sum(r['partitions'] for r in exported)} listed across "
+        f"{len(exported) - len(failed)} tables ({len(repaired)} MSCK REPAIR, {len(failed)} failed) "
+        f"in {stage.output_dir}"
+    )
+
+
+def export_run_metrics(config: dict, metrics: RunMetrics) -> None:
+    output_dir = (config.get("metrics", {}) or {}).get("output_dir", "metrics_output")
+    paths = metrics.export(output_dir)
+    if paths:
+        print(f"[INFO] Run metrics written to {', '.join(paths)}")
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export Hive table metadata and DDL. Without --databases or "
+        "--all-databases the databases are asked for interactively."
+    )
+    parser.add_argument("--config", default="config/creds.yaml")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("--databases", help="comma-separated databases to export")
+    selection.add_argument("--all-databases", action="store_true", help="export every database")
+    parser.add_argument("--tables", help="comma-separated table globs or re: patterns; "
+                        "replaces filters.tables.include")
+    parser.add_argument("--exclude-tables", help="comma-separated table patterns added to "
+                        "filters.tables.exclude")
+    parser.add_argument("--shard", help="i/N: export only the tables whose db.table hashes to "
+                        "shard i of N (1-based); merge the runs with pipeline.merge_shards")
+    parser.add_argument("--output-dir", help="root for every output directory (default: the "
+                        "configured paths, or shard-<i>-of-<N> when sharded)")
+    parser.add_argument("--resume", action="store_true", help="skip the tables an interrupted run "
+                        "journaled as finished and retry its failed ones")
+    args = parser.parse_args(argv)
+    try:
+        parse_shard(args.shard)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def _patterns(value: str) -> list[str]:
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+
+def _under_root(output_root: str, path: str) -> str:
+    """``path`` inside ``output_root``; an absolute path is re-rooted there too,
+    so runs with different roots never share a directory."""
+    return os.path.join(output_root, os.path.splitdrive(path)[1].lstrip("/\\"))
+
+
+def apply_cli_args(config: dict, args: argparse.Namespace) -> str:
+    """Fold command-line overrides into ``config``; returns the output root."""
+    if args.tables or args.exclude_tables:
+        filters = config["filters"] = config.get("filters") or {}
+        tables = filters["tables"] = filters.get("tables") or {}
+        if args.tables:
+            tables["include"] = _patterns(args.tables)
+        if args.exclude_tables:
+            tables["exclude"] = list(tables.get("exclude") or []) + _patterns(args.exclude_tables)
+    if args.shard:
+        config["shard"] = args.shard
+    shard = parse_shard(config.get("shard"))
+
+    output_root = args.output_dir or (f"shard-{shard[0]}-of-{shard[1]}" if shard else ".")
+    if output_root != ".":
+        # Each shard keeps its own outputs, cache and metrics under its root.
+        for section, key, default in (
+            ("output", "ddl_dir", "ddl_output"),
+            ("output", "metadata_dir", "metadata_output"),
+            ("partitions", "output_dir", "partition_output"),
+            ("metrics", "output_dir", "metrics_output"),
+            ("checkpoint", "path", "run_journal.jsonl"),
+            ("storage_scan", "cache_path", "metadata_output/.storage_scan_cache.json"),
+        ):
+            settings = config[section] = config.get(section) or {}
+            settings[key] = _under_root(output_root, settings.get(key, default))
+        config["metadata_cache_path"] = _under_root(
+            output_root, config.get("metadata_cache_path", "metadata_output/.metadata_cache.json")
+        )
+    return output_root
+
+
+def main(argv: list[str] = None) -> None:
+    args = parse_args(argv)
+    config = load_hive_config(args.config)
+    output_root = apply_cli_args(config, args)
+    started = time.time()
+    metrics = configure_metrics(config)
+    if config.get("metadata_backend", "hiveserver2") == "metastore":
+        run = main_metastore(config, args)
+        if run is not None:
+            write_run_summary(output_root, config, *run, started)
+        export_run_metrics(config, metrics)
+        return
+
+    pool = HiveConnectionPool(config, hive_pool_size(config))
+    fetcher = ResilientFetcher.from_config(pool, config)
+
+    def list_all() -> list[str]:
+        try:
+            with pool.acquire() as conn:
+                return list_databases(conn, fetcher.query_timeout)
+        except ConnectionError as e:
+            print(f"[ERROR] Failed to list databases: {e}")
+            return []
+
+    databases = select_databases(args, list_all)
+    if databases is None:
+        fetcher.close()
+        pool.close_all()
+        return
+    table_filter = TableFilter.from_config(config)
+    databases = table_filter.filter_databases(databases)
+
+    writer = OutputWriter.from_config(config)
+    resume = start_checkpoint(config, args, writer)
+    previous = load_previous_snapshot(config, writer, table_filter.selects)
+    stats = load_schedule_stats(config, writer, databases)
+    cache = None
+    if config.get("incremental", False):
+        if writer.consolidated:
+            print("[INFO] Incremental mode needs per_table output layouts; converting every table")
+        else:
+            cache = MetadataCache(
+                config.get("metadata_cache_path", "metadata_output/.metadata_cache.json"),
+                conversion_settings(config),
+            )
+
+    unlisted = set()  # databases whose SHOW TABLES failed
+    if config.get("crawler", "threads") == "asyncio":
+        crawler = AsyncHiveCrawler.from_config(pool, config, fetcher)
+        try:
+            results = asyncio.run(
+                crawl_async(
+                    crawler,
+                    databases,
+                    table_filter,
+                    stats,
+                    resume,
+                    unlisted,
+                    convert_workers=config.get("convert_workers"),
+                    cache=cache,
+                    writer=writer,
+                    inline_constraints=not uses_migration_plan(config),
+                    dialect=ddl_dialect(config),
+                )
+            )
+        finally:
+            crawler.close()
+    else:
+        jobs = []
+        for db in databases:
+            print(f"\nTables in database '{db}':")
+            try:
+                db_filter = table_filter.for_database(db)
+                with pool.acquire() as conn:
+                    tables = list_tables(conn, db, fetcher.query_timeout, db_filter.like_pattern())
+                jobs.extend((db, table) for table in table_filter.filter_tables(db, tables))
+            except Exception as e:
+                print(f"Error fetching tables for '{db}': {e}")
+                unlisted.add(db)
+        if resume is not None:
+            jobs = resume.pending(jobs)
+
+        results = run_pipeline(
+            pool,
+            schedule_jobs(jobs, stats),
+            convert_workers=config.get("convert_workers"),
+            queue_size=config.get("pipeline_queue_size", 64),
+            cache=cache,
+            writer=writer,
+            fetcher=fetcher,
+            inline_constraints=not uses_migration_plan(config),
+            dialect=ddl_dialect(config),
+        )
+    failed_writes = writer.close()
+    apply_write_failures(results, failed_writes)
+    close_checkpoint(writer, resume, results)
+    print_summary(results)
+    if cache is not None:
+        for key in failed_writes:
+            cache.tables.pop(key, None)
+        for r in results:
+            if r["status"] == "failed":
+                cache.mark_failed(r["database"], r["table"])
+        def selected(db: str, table: str) -> bool:
+            # Tables finished by an interrupted attempt were not seen; keep them out of "dropped".
+            return table_filter.selects(db, table) and not (resume is not None and resume.is_done(db, table))
 
-    hive_conn.close()
+        # A database that could not be listed says nothing about which of its tables were dropped.
+        listed = [db for db in databases if db not in unlisted]
+        print_change_report(cache.report(listed, selected))
+        cache.save()
+    if uses_migration_plan(config):
+        export_migration_plan(writer)
+    export_schema_diff(previous, writer)
+    export_sizing_report(config, writer, results)
+    export_apply(config, writer, results, args.resume)
+    export_partitions(pool, config, writer, results, fetcher.query_timeout)
+    write_run_summary(output_root, config, databases, results, started)
+    export_run_metrics(config, metrics)
+    fetcher.close()
+    pool.close_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,347 @@
+"""
+Apply an export to a target through pooled DB-API connections.
+
+    python -m pipeline.apply_stage --input metadata_output [--dialect databricks] [--resume]
+
+Statements are built from the exported clean JSON (any format
+pipeline.catalog_reader reads): one CREATE TABLE IF NOT EXISTS per table,
+TBLPROPERTIES included, then for dialects that enforce key constraints one
+ALTER TABLE per PRIMARY KEY, FOREIGN KEY and CHECK constraint (UNIQUE
+constraints are reported and not applied: Databricks does not support them).
+A statement runs once the statements it depends on have succeeded:
+
+    CREATE t               -
+    PRIMARY KEY t          CREATE t
+    FOREIGN KEY t -> p     CREATE t, CREATE p, PRIMARY KEY p
+    CHECK t                CREATE t
+
+so CREATEs run in parallel and constraints follow their parent tables. Ready
+statements go out in batches, one pooled connection per batch. Transport
+errors are retried with backoff on a fresh connection, and "already exists"
+counts as success, so retries and reruns are idempotent. Dependents of a
+failed statement are skipped. Each outcome is appended to ``apply_log.jsonl``;
+``--resume`` skips the statements an earlier run logged as applied.
+"""
+import argparse
+import math
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, List
+
+import yaml
+
+from connector.dbapi_pool import DbApiPool
+from connector.utils import backoff_delays, is_retryable
+from convertor.catalog_index import CatalogIndex
+from convertor.ddl_renderer import get_dialect
+from convertor.table_ddl import build_table_ddl
+from pipeline import json_codec
+from pipeline.catalog_reader import iter_tables
+from pipeline.metrics import get_metrics
+
+APPLIED_STATUSES = ("ok", "exists")
+# "Table ... already exists" and error classes such as TABLE_OR_VIEW_ALREADY_EXISTS;
+# not "duplicate", which also names real failures (e.g. duplicate column names).
+ALREADY_EXISTS = re.compile(r"ALREADY_EXISTS|\balready exists\b", re.IGNORECASE)
+# Transport errors of DB-API drivers that is_retryable() does not know about.
+RETRYABLE_DRIVER_ERRORS = ("RequestError",)
+
+
+class Statement:
+    __slots__ = ("key", "kind", "table", "sql", "depends_on")
+
+    def __init__(self, key: str, kind: str, table: str, sql: str, depends_on: tuple = ()):
+        self.key = key
+        self.kind = kind
+        self.table = table
+        self.sql = sql
+        self.depends_on = depends_on
+
+    def __repr__(self) -> str:
+        return f"Statement({self.key}, depends_on={list(self.depends_on)})"
+
+
+def _executable(ddl: str) -> str:
+    """DDL without its comment-only lines (e.g. the OPTIMIZE hint) and its ``;`` terminator."""
+    return "\n".join(line for line in ddl.splitlines() if not line.lstrip().startswith("--")).strip().rstrip(";")
+
+
+def build_statements(
+    metadata_source: str, dialect: str = "databricks", selected: set = None
+) -> List[Statement]:
+    """
+    Statements for every exported table (only ``(db, table)`` pairs in
+    ``selected`` when given). Dependencies on tables outside the selection
+    are assumed to exist on the target already.
+    """
+    dialect = get_dialect(dialect)
+    index = CatalogIndex(dialect=dialect)
+    statements, unrendered = [], set()
+    for clean_json in iter_tables(metadata_source):
+        db, table = clean_json.get("database", ""), clean_json.get("table_name", "")
+        index.add(clean_json)
+        if selected is not None and (db, table) not in selected:
+            continue
+        name = f"{db}.{table}"
+        try:
+            ddl = build_table_ddl(db, table, clean_json, inline_constraints=False, dialect=dialect)
+        except Exception as e:
+            print(f"[ERROR] Failed to render DDL for {name}: {e}")
+            unrendered.add(name)
+            continue
+        statements.append(Statement(f"create {name}", "create", name, _executable(ddl)))
+
+    if not dialect.key_constraints:
+        return statements
+    for create in list(statements):
+        name = create.table
+        pk_statement = index.primary_key_statement(name)
+        if pk_statement:
+            statements.append(
+                Statement(f"primary_key {name}", "primary_key", name, pk_statement, (create.key,))
+            )
+        for fk in index.foreign_keys(name):
+            reason = index.check_foreign_key(fk)
+            if not reason and fk.reference_table in unrendered:
+                reason = f"no DDL for parent table {fk.reference_table}"
+            if reason:
+                print(f"[INFO] Not applying foreign key {fk.constraint_name} on {name}: {reason}")
+                continue
+            parent = fk.reference_table
+            depends_on = [create.key]
+            if parent != name:
+                depends_on.append(f"create {parent}")
+            if index.primary_key_statement(parent):
+                depends_on.append(f"primary_key {parent}")
+            statements.append(
+                Statement(
+                    f"foreign_key {name}.{fk.constraint_name}",
+                    "foreign_key",
+                    name,
+                    index.foreign_key_statement(fk),
+                    tuple(depends_on),
+                )
+            )
+        for constraint_name, _ in index.unique_statements(name):
+            print(f"[INFO] Not applying unique constraint {constraint_name} on {name}: "
+                  f"not supported by {dialect.name}")
+        for constraint_name, check_statement in index.check_statements(name):
+            statements.append(
+                Statement(f"check {name}.{constraint_name}", "check", name, check_statement, (create.key,))
+            )
+    return statements
+
+
+def load_applied(log_path: str) -> set:
+    """Keys an earlier run logged as applied (ok or already existing)."""
+    applied = set()
+    if not os.path.exists(log_path):
+        return applied
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json_codec.loads(line)
+            except Exception:
+                continue  # torn last line of an interrupted run
+            if entry.get("status") in APPLIED_STATUSES:
+                applied.add(entry["key"])
+    return applied
+
+
+class ApplyStage:
+    """Runs Statements against a DbApiPool in dependency order; see the module docstring."""
+
+    def __init__(
+        self,
+        pool: DbApiPool,
+        log_path: str = os.path.join("ddl_output", "apply_log.jsonl"),
+        retries: int = 2,
+        batch_size: int = 20,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+    ):
+        self.pool = pool
+        self.log_path = log_path
+        self.retries = max(0, retries)
+        self.batch_size = max(1, batch_size)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_config(cls, pool: DbApiPool, config: dict, log_path: str) -> "ApplyStage":
+        settings = config.get("apply", {}) or {}
+        resilience = config.get("resilience", {}) or {}
+        return cls(
+            pool,
+            log_path,
+            retries=settings.get("retries", 2),
+            batch_size=settings.get("batch_size", 20),
+            backoff_base=resilience.get("retry_backoff_base", 0.5),
+            backoff_max=resilience.get("retry_backoff_max", 10),
+        )
+
+    def run(self, statements: List[Statement], applied: Iterable[str] = ()) -> List[dict]:
+        """
+        Apply ``statements``; keys in ``applied`` count as done without running.
+        Returns one result per statement that was run or skipped.
+        """
+        applied = set(applied)
+        keys = {s.key: s for s in statements}
+        waiting, dependents = {}, {}
+        ready = deque()
+        for s in statements:
+            if s.key in applied:
+                continue
+            # Dependencies outside this run (or applied earlier) are satisfied.
+            deps = {d for d in s.depends_on if d in keys and d not in applied}
+            waiting[s.key] = deps
+            for d in deps:
+                dependents.setdefault(d, []).append(s.key)
+            if not deps:
+                ready.append(s.key)
+
+        results = []
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a" if applied else "w", encoding="utf-8") as log, ThreadPoolExecutor(
+            max_workers=self.pool.size, thread_name_prefix="apply"
+        ) as executor:
+
+            def finish(result: dict) -> None:
+                results.append(result)
+                entry = dict(result)
+                if result["status"] in APPLIED_STATUSES:
+                    entry.pop("sql")
+                log.write(json_codec.dumps(entry) + "\n")
+
+            def skip(key: str, reason: str) -> None:
+                for child in dependents.get(key, []):
+                    if child in waiting:
+                        del waiting[child]
+                        s = keys[child]
+                        finish(_result(s, "skipped", f"{reason} failed", 0, 0.0))
+                        skip(child, reason)
+
+            in_flight = {}
+            while ready or in_flight:
+                while ready and len(in_flight) < self.pool.size * 2:
+                    # Smaller batches while few statements are ready, so they still spread over the pool.
+                    size = min(self.batch_size, math.ceil(len(ready) / self.pool.size))
+                    batch = [keys[ready.popleft()] for _ in range(size)]
+                    in_flight[executor.submit(self._run_batch, batch)] = batch
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.pop(future)
+                    for result in future.result():
+                        key = result["key"]
+                        waiting.pop(key, None)
+                        finish(result)
+                        if result["status"] not in APPLIED_STATUSES:
+                            skip(key, key)
+                            continue
+                        for child in dependents.get(key, []):
+                            deps = waiting.get(child)
+                            if deps is not None:
+                                deps.discard(key)
+                                if not deps:
+                                    ready.append(child)
+                log.flush()
+        return results
+
+    def _run_batch(self, batch: List[Statement]) -> List[dict]:
+        with self.pool.acquire() as conn:
+            return [self._execute(conn, statement) for statement in batch]
+
+    def _execute(self, conn, statement: Statement) -> dict:
+        start = time.perf_counter()
+        delays = backoff_delays(self.backoff_base, self.backoff_max)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                with get_metrics().stage(f"apply.{statement.kind}"):
+                    conn.execute(statement.sql)
+                return _result(statement, "ok", "", attempt, time.perf_counter() - start)
+            except Exception as e:
+                if ALREADY_EXISTS.search(str(e)):
+                    # Applied by an earlier attempt or run.
+                    return _result(statement, "exists", str(e), attempt, time.perf_counter() - start)
+                retryable = is_retryable(e) or type(e).__name__ in RETRYABLE_DRIVER_ERRORS
+                if attempt > self.retries or not retryable:
+                    print(f"[ERROR] Failed to apply {statement.key}: {e}")
+                    return _result(statement, "failed", str(e), attempt, time.perf_counter() - start)
+                conn.close()
+                time.sleep(next(delays))
+
+
+def _result(statement: Statement, status: str, error: str, attempts: int, seconds: float) -> dict:
+    return {
+        "key": statement.key,
+        "kind": statement.kind,
+        "table": statement.table,
+        "status": status,
+        "attempts": attempts,
+        "seconds": round(seconds, 3),
+        "error": error,
+        "sql": statement.sql,
+    }
+
+
+def summarize(results: List[dict], seconds: float) -> str:
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return (
+        f"{len(results)} statements in {seconds:.1f}s: {counts.get('ok', 0)} applied, "
+        f"{counts.get('exists', 0)} already present, {counts.get('failed', 0)} failed, "
+        f"{counts.get('skipped', 0)} skipped"
+    )
+
+
+def apply_export(
+    config: dict,
+    metadata_source: str,
+    log_path: str,
+    dialect: str = "databricks",
+    selected: set = None,
+    resume: bool = False,
+) -> List[dict]:
+    """Build the statements for an export and apply them to the ``apply`` target."""
+    statements = build_statements(metadata_source, dialect, selected)
+    applied = load_applied(log_path) if resume else set()
+    if applied:
+        print(f"[INFO] Skipping {len(applied)} statements applied by an earlier run")
+    pool = DbApiPool.from_config(config.get("apply", {}) or {})
+    stage = ApplyStage.from_config(pool, config, log_path)
+    pending = sum(1 for s in statements if s.key not in applied)
+    print(f"\nApplying {pending} statements over {pool.size} connections")
+    start = time.perf_counter()
+    try:
+        results = stage.run(statements, applied)
+    finally:
+        pool.close_all()
+    print(f"[INFO] Applied {summarize(results, time.perf_counter() - start)}; log in {log_path}")
+    return results
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Apply an export's DDL to the target in creds.yaml 'apply'")
+    parser.add_argument("--input", default="metadata_output",
+                        help="export directory or catalog .jsonl/.sqlite/.tables.parquet")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                                         "config", "creds.yaml"))
+    parser.add_argument("--dialect", help="DDL dialect (default: output.dialect from the config)")
+    parser.add_argument("--log", default=os.path.join("ddl_output", "apply_log.jsonl"))
+    parser.add_argument("--resume", action="store_true",
+                        help="skip statements the log records as applied")
+    args = parser.parse_args(argv)
+    with open(args.config, "r") as f:
+        config = yaml.safe_load(f)
+    dialect = args.dialect or (config.get("output", {}) or {}).get("dialect", "databricks")
+    apply_export(config, args.input, args.log, dialect, resume=args.resume)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Lazy readers for exported catalogs.
+
+Every export format can be read back one table at a time:
+
+    metadata_output/                         *_clean.json per table
+    metadata_output/catalog.jsonl            JSON Lines
+    metadata_output/catalog.sqlite           sqlite catalog (also .db)
+    metadata_output/catalog.tables.parquet   parquet catalog (needs pyarrow)
+    any single clean-JSON file
+
+    for table in iter_tables("metadata_output/catalog.jsonl", databases=["sales"]):
+        ...
+
+Only one table (or one sqlite/parquet batch) is in memory at a time.
+"""
+import glob
+import os
+import sqlite3
+from typing import Iterable, Iterator, Optional
+
+from pipeline import json_codec
+from pipeline.catalog_store import COLUMN_FIELDS, column_rows, pyarrow
+
+SQLITE_SUFFIXES = (".sqlite", ".db")
+PARQUET_TABLES_SUFFIX = ".tables.parquet"
+
+
+def iter_clean_json_sources(path: str, databases: Optional[Iterable[str]] = None) -> Iterator[tuple[str, str]]:
+    """
+    Yield ``(source, raw_json)`` for every table in ``path`` (see the module
+    docstring). With ``databases``, the sqlite and parquet catalogs skip other
+    databases without reading their JSON; other formats are not filtered.
+    """
+    if os.path.isdir(path):
+        for file_path in sorted(glob.glob(os.path.join(path, "*_clean.json"))):
+            with open(file_path, "r", encoding="utf-8") as f:
+                yield file_path, f.read()
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield f"{path}:{line_no}", line
+    elif path.endswith(SQLITE_SUFFIXES):
+        yield from _sqlite_sources(path, databases)
+    elif path.endswith(".parquet"):
+        yield from _parquet_sources(path, databases)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield path, f.read()
+
+
+def _sqlite_sources(path: str, databases: Optional[Iterable[str]]) -> Iterator[tuple[str, str]]:
+    sql = "SELECT database, table_name, clean_json FROM tables"
+    params = []
+    if databases is not None:
+        params = list(databases)
+        sql += f" WHERE database IN ({', '.join('?' * len(params))})"
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        for db, table, raw_json in conn.execute(sql + " ORDER BY database, table_name", params):
+            yield f"{path}:{db}.{table}", raw_json
+    finally:
+        conn.close()
+
+
+def _parquet_file(path: str):
+    if pyarrow is None:
+        raise RuntimeError(f"Reading '{path}' needs pyarrow (pip install pyarrow)")
+    return pyarrow.parquet.ParquetFile(path)
+
+
+def _parquet_sources(path: str, databases: Optional[Iterable[str]]) -> Iterator[tuple[str, str]]:
+    wanted = set(databases) if databases is not None else None
+    for batch in _parquet_file(path).iter_batches(columns=["database", "table_name", "clean_json"]):
+        for db, table, raw_json in zip(*(column.to_pylist() for column in batch.columns)):
+            if wanted is None or db in wanted:
+                yield f"{path}:{db}.{table}", raw_json
+
+
+def iter_tables(path: str, databases: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    """Clean-JSON dicts for every table in ``path``; unreadable documents are reported and skipped."""
+    wanted = set(databases) if databases is not None else None
+    for source, raw_json in iter_clean_json_sources(path, wanted):
+        try:
+            clean_json = json_codec.loads(raw_json)
+        except Exception as e:
+            print(f"[ERROR] Failed to read '{source}': {e}")
+            continue
+        if wanted is None or clean_json.get("database") in wanted:
+            yield clean_json
+
+
+def iter_columns(path: str, databases: Optional[Iterable[str]] = None) -> Iterator[dict]:
+    """
+    One dict per column (keys: COLUMN_FIELDS). The sqlite and parquet
+    catalogs are read from their column tables; other formats are derived
+    from each table's JSON.
+    """
+    wanted = set(databases) if databases is not None else None
+    if path.endswith(SQLITE_SUFFIXES):
+        sql = f"SELECT {', '.join(COLUMN_FIELDS)} FROM columns"
+        params = []
+        if wanted is not None:
+            params = sorted(wanted)
+            sql += f" WHERE database IN ({', '.join('?' * len(params))})"
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            for row in conn.execute(sql + " ORDER BY database, table_name, position", params):
+                row = dict(zip(COLUMN_FIELDS, row))
+                row["is_partition"] = bool(row["is_partition"])
+                yield row
+        finally:
+            conn.close()
+    elif path.endswith(PARQUET_TABLES_SUFFIX):
+        columns_path = path[: -len(PARQUET_TABLES_SUFFIX)] + ".columns.parquet"
+        for batch in _parquet_file(columns_path).iter_batches(columns=list(COLUMN_FIELDS)):
+            for row in batch.to_pylist():
+                if wanted is None or row["database"] in wanted:
+                    yield row
+    else:
+        for clean_json in iter_tables(path, wanted):
+            for row in column_rows(clean_json):
+                yield dict(zip(COLUMN_FIELDS, row))
@@ -0,0 +1,187 @@
+"""
+Queryable catalog exports: one row per table and one row per column.
+
+    sqlite   metadata_output/catalog.sqlite           tables + columns
+    parquet  metadata_output/catalog.tables.parquet
+             metadata_output/catalog.columns.parquet  (needs pyarrow)
+
+Each table row carries the table's full clean JSON, so a store can be read
+back like any other export (see pipeline.catalog_reader). Rows are written
+in batches under ``.tmp`` names; finish() returns the ``(tmp_path, path)``
+pairs for the OutputWriter to fsync and rename like its other files.
+"""
+import os
+import sqlite3
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+CATALOG_FORMATS = ("none", "sqlite", "parquet")
+
+TABLE_FIELDS = (
+    "database",
+    "table_name",
+    "table_type",
+    "location",
+    "input_format",
+    "output_format",
+    "serde_library",
+    "num_buckets",
+    "column_count",
+    "partition_count",
+    "owner",
+    "clean_json",
+)
+COLUMN_FIELDS = ("database", "table_name", "position", "name", "type", "comment", "is_partition")
+INTEGER_FIELDS = frozenset({"num_buckets", "column_count", "partition_count", "position"})
+
+_INSERT_TABLE = f"INSERT INTO tables VALUES ({', '.join('?' * len(TABLE_FIELDS))})"
+_INSERT_COLUMNS = f"INSERT INTO columns VALUES ({', '.join('?' * len(COLUMN_FIELDS))})"
+
+
+def table_row(clean_json: dict, raw_json: str) -> tuple:
+    storage_format = clean_json.get("storage_format") or {}
+    return (
+        clean_json.get("database", ""),
+        clean_json.get("table_name", ""),
+        clean_json.get("table_type", ""),
+        clean_json.get("location", ""),
+        storage_format.get("input_format", ""),
+        storage_format.get("output_format", ""),
+        storage_format.get("serde_library", ""),
+        int(storage_format.get("num_buckets") or 0),
+        len(clean_json.get("columns", [])),
+        len(clean_json.get("partitions", [])),
+        (clean_json.get("meta") or {}).get("owner", ""),
+        raw_json,
+    )
+
+
+def column_rows(clean_json: dict) -> list[tuple]:
+    """Data columns then partition columns, numbered from 0 in that order."""
+    db, table = clean_json.get("database", ""), clean_json.get("table_name", "")
+    columns = [(col, False) for col in clean_json.get("columns", [])]
+    columns += [(col, True) for col in clean_json.get("partitions", [])]
+    return [
+        (db, table, position, col.get("name"), col.get("type"), col.get("comment", ""), is_partition)
+        for position, (col, is_partition) in enumerate(columns)
+    ]
+
+
+class SqliteCatalog:
+    """catalog.sqlite with ``tables`` and ``columns``; indexes are built by finish()."""
+
+    def __init__(self, path: str, batch_size: int = 1000):
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self._tables, self._columns = [], []
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(f"{path}.tmp"):
+            os.remove(f"{path}.tmp")
+        # Opened by the caller's thread, then used only by the writer thread.
+        self._conn = sqlite3.connect(f"{path}.tmp", check_same_thread=False)
+        # A scratch file until close() renames it, so no journal is needed.
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE tables (database TEXT, table_name TEXT, table_type TEXT, location TEXT, "
+            "input_format TEXT, output_format TEXT, serde_library TEXT, num_buckets INTEGER, "
+            "column_count INTEGER, partition_count INTEGER, owner TEXT, clean_json TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE columns (database TEXT, table_name TEXT, position INTEGER, name TEXT, "
+            "type TEXT, comment TEXT, is_partition INTEGER)"
+        )
+
+    def add(self, clean_json: dict, raw_json: str) -> None:
+        self._tables.append(table_row(clean_json, raw_json))
+        self._columns.extend(column_rows(clean_json))
+        if len(self._tables) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._conn.executemany(_INSERT_TABLE, self._tables)
+        self._conn.executemany(_INSERT_COLUMNS, self._columns)
+        self._conn.commit()
+        self._tables, self._columns = [], []
+
+    def finish(self) -> list[tuple[str, str]]:
+        self._flush()
+        self._conn.execute("CREATE UNIQUE INDEX tables_by_name ON tables (database, table_name)")
+        self._conn.execute("CREATE INDEX columns_by_table ON columns (database, table_name, position)")
+        self._conn.execute("CREATE INDEX columns_by_name ON columns (name)")
+        self._conn.commit()
+        self._conn.close()
+        return [(f"{self.path}.tmp", self.path)]
+
+
+def _arrow_schema(fields: tuple):
+    def arrow_type(name: str):
+        if name in INTEGER_FIELDS:
+            return pyarrow.int32()
+        if name == "is_partition":
+            return pyarrow.bool_()
+        return pyarrow.string()
+
+    return pyarrow.schema([(name, arrow_type(name)) for name in fields])
+
+
+class ParquetCatalog:
+    """``<prefix>.tables.parquet`` and ``<prefix>.columns.parquet``, one row group per batch."""
+
+    def __init__(self, prefix: str, batch_size: int = 1000):
+        if pyarrow is None:
+            raise RuntimeError("The parquet catalog needs pyarrow (pip install pyarrow)")
+        self.tables_path = f"{prefix}.tables.parquet"
+        self.columns_path = f"{prefix}.columns.parquet"
+        self.batch_size = max(1, batch_size)
+        self._tables, self._columns = [], []
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+
+        self._table_schema = _arrow_schema(TABLE_FIELDS)
+        self._column_schema = _arrow_schema(COLUMN_FIELDS)
+        self._table_writer = pyarrow.parquet.ParquetWriter(f"{self.tables_path}.tmp", self._table_schema)
+        self._column_writer = pyarrow.parquet.ParquetWriter(f"{self.columns_path}.tmp", self._column_schema)
+
+    def add(self, clean_json: dict, raw_json: str) -> None:
+        self._tables.append(table_row(clean_json, raw_json))
+        self._columns.extend(column_rows(clean_json))
+        if len(self._tables) >= self.batch_size:
+            self._flush()
+
+    @staticmethod
+    def _write(writer, schema, rows: list[tuple]) -> None:
+        if rows:
+            columns = list(zip(*rows))
+            writer.write_table(
+                pyarrow.Table.from_arrays(
+                    [pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema,
+                )
+            )
+
+    def _flush(self) -> None:
+        self._write(self._table_writer, self._table_schema, self._tables)
+        self._write(self._column_writer, self._column_schema, self._columns)
+        self._tables, self._columns = [], []
+
+    def finish(self) -> list[tuple[str, str]]:
+        self._flush()
+        self._table_writer.close()
+        self._column_writer.close()
+        return [
+            (f"{self.tables_path}.tmp", self.tables_path),
+            (f"{self.columns_path}.tmp", self.columns_path),
+        ]
+
+
+def open_catalog_store(catalog_format: str, metadata_dir: str):
+    """A SqliteCatalog, ParquetCatalog or None for ``catalog_format`` "none"."""
+    if catalog_format == "sqlite":
+        return SqliteCatalog(os.path.join(metadata_dir, "catalog.sqlite"))
+    if catalog_format == "parquet":
+        return ParquetCatalog(os.path.join(metadata_dir, "catalog"))
+    return None
@@ -0,0 +1,154 @@
+"""
+Append-only checkpoint journal, so an interrupted run can resume.
+
+Every finished table appends one JSON line to ``run_journal.jsonl``:
+
+    {"database": "sales", "table": "orders", "status": "ok", "error": "",
+     "outputs": ["metadata_output/sales.orders_clean.json", ...], "at": 1760700000.0}
+
+"ok" lines are written by the OutputWriter only after the table's files have
+been fsynced and renamed into place, so a journaled table is never missing
+its outputs. Lines are flushed to the OS as they are written (surviving a
+killed process) and fsynced at most every ``fsync_interval`` seconds, so the
+journal costs no per-table fsync. A torn last line is ignored on reading.
+
+``main.py --resume`` replays the journal: tables whose last status is "ok"
+or "unchanged" are skipped, and failed tables are retried with their
+earlier errors listed.
+"""
+import os
+import threading
+import time
+from typing import Dict, Iterable, List
+
+from pipeline import json_codec
+
+DONE_STATUSES = ("ok", "unchanged")
+
+
+class CheckpointJournal:
+    """Thread-safe writer for the journal; ``resume=False`` starts a new one."""
+
+    def __init__(self, path: str, fsync_interval: float = 1.0, resume: bool = False):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._synced_at = time.monotonic()
+        self._dirty = False
+        self._append({"event": "resume" if resume else "start", "at": round(time.time(), 3)})
+
+    @classmethod
+    def from_config(cls, config: dict, resume: bool = False) -> "CheckpointJournal":
+        settings = config.get("checkpoint", {}) or {}
+        return cls(
+            settings.get("path", "run_journal.jsonl"),
+            settings.get("fsync_interval", 1.0),
+            resume,
+        )
+
+    def record(self, db: str, table: str, status: str, error: str = "", outputs: List[str] = None) -> None:
+        self._append(
+            {
+                "database": db,
+                "table": table,
+                "status": status,
+                "error": error,
+                "outputs": outputs or [],
+                "at": round(time.time(), 3),
+            }
+        )
+
+    def _append(self, entry: dict) -> None:
+        line = json_codec.dumps(entry) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self._dirty = True
+            if time.monotonic() - self._synced_at >= self.fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._synced_at = time.monotonic()
+        self._dirty = False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._dirty:
+                self._sync()
+            self._file.close()
+
+
+class ResumeState:
+    """What an earlier, interrupted run finished, read back from its journal."""
+
+    def __init__(self, entries: Iterable[dict] = ()):
+        self.last: Dict[tuple, dict] = {}
+        self.errors: Dict[tuple, List[str]] = {}
+        self.attempts = 0
+        self.skipped: List[tuple] = []
+        for entry in entries:
+            if "event" in entry:
+                self.attempts += 1
+                continue
+            key = (entry["database"], entry["table"])
+            self.last[key] = entry
+            if entry["status"] == "failed":
+                self.errors.setdefault(key, []).append(entry.get("error", ""))
+
+    @classmethod
+    def load(cls, path: str) -> "ResumeState":
+        if not os.path.exists(path):
+            print(f"[INFO] No journal at '{path}'; nothing to resume")
+            return cls()
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                try:
+                    entries.append(json_codec.loads(line))
+                except Exception:
+                    # An interrupted append leaves a torn last line.
+                    print(f"[INFO] Ignoring unreadable journal line {line_no} in '{path}'")
+        state = cls(entries)
+        print(
+            f"[INFO] Resuming after {state.attempts} earlier attempt(s): {len(state.done)} tables done, "
+            f"{len(state.failed)} failed tables will be retried"
+        )
+        return state
+
+    @property
+    def done(self) -> set:
+        return {key for key, entry in self.last.items() if entry["status"] in DONE_STATUSES}
+
+    @property
+    def failed(self) -> set:
+        return {key for key, entry in self.last.items() if entry["status"] == "failed"}
+
+    def is_done(self, db: str, table: str) -> bool:
+        entry = self.last.get((db, table))
+        return entry is not None and entry["status"] in DONE_STATUSES
+
+    def pending(self, jobs: List[tuple]) -> List[tuple]:
+        """``(db, table)`` jobs still to run; prints the error history of retried tables."""
+        remaining = []
+        for job in jobs:
+            (self.skipped if self.is_done(*job) else remaining).append(job)
+        for job in remaining:
+            errors = self.errors.get(job)
+            if errors:
+                print(f"[INFO] Retrying {job[0]}.{job[1]} (failed {len(errors)}x, last: {errors[-1]})")
+        if len(remaining) != len(jobs):
+            print(f"[INFO] Skipping {len(jobs) - len(remaining)} tables finished by an earlier attempt")
+        return remaining
+
+    def results(self) -> List[dict]:
+        """Summary rows for the tables pending() skipped."""
+        return [
+            {"database": db, "table": table, "status": self.last[(db, table)]["status"],
+             "error": "", "seconds": 0.0}
+            for db, table in self.skipped
+        ]
@@ -0,0 +1,33 @@
+"""
+JSON encoding for exported metadata.
+
+orjson is used when it is installed (several times faster on large
+catalogs), the standard library otherwise. Both write UTF-8 text that
+either one reads back to the same documents.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """Compact single-line JSON, as used by JSON Lines and the catalog stores."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_pretty(obj) -> str:
+    """JSON indented by two spaces, for per-table files."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,253 @@
+"""
+Run summaries and merging of sharded runs.
+
+Every run of main.py writes ``run_summary.json`` next to its output
+directories. A catalog split with ``--shard i/N`` is exported by N
+independent runs, each under its own output root, and merged afterwards:
+
+    python main.py --all-databases --shard 1/4 --output-dir out/shard-1-of-4
+    ...
+    python -m pipeline.merge_shards out/shard-*-of-4 --output out/merged
+
+Per-table files are copied, per-database scripts and catalog.jsonl are
+concatenated, and the cross-table outputs (migration plan, sizing report,
+sqlite/parquet catalog) are rebuilt from the merged metadata. Each shard's
+schema_changes.sql only covers that shard, so they are concatenated.
+"""
+import argparse
+import glob
+import os
+import shutil
+import time
+from typing import List
+
+from pipeline import json_codec
+from pipeline.catalog_reader import iter_clean_json_sources
+from pipeline.catalog_store import open_catalog_store
+from pipeline.migration_plan import write_migration_plan
+from pipeline.sizing import OPTIMIZE_FILE, STORAGE_SCAN_FILE, load_storage_scan, write_sizing_report
+
+SUMMARY_FILE = "run_summary.json"
+# Cross-table files in ddl_dir that are not one table's (or database's) DDL.
+DERIVED_DDL_FILES = (
+    "migration_plan.sql", "schema_changes.sql", "sizing_report.txt", "optimize_after_migration.sql"
+)
+
+
+def _relative(path: str, root: str) -> str:
+    """``path`` relative to ``root``; absolute paths outside ``root`` are kept as they are."""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+    if os.path.isabs(path) and (relative == os.pardir or relative.startswith(os.pardir + os.sep)):
+        return path
+    return relative
+
+
+def _write_text(path: str, content: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(f"{path}.tmp", path)
+
+
+def count_statuses(results: List[dict]) -> dict:
+    counts = {"ok": 0, "unchanged": 0, "failed": 0}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return counts
+
+
+def write_run_summary(
+    output_root: str, config: dict, databases: List[str], results: List[dict], started: float
+) -> str:
+    """Write ``<output_root>/run_summary.json`` describing one run and its outputs."""
+    output = config.get("output", {}) or {}
+    summary = {
+        "shard": config.get("shard") or None,
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "seconds": round(time.time() - started, 3),
+        "databases": list(databases),
+        "ddl_dir": _relative(output.get("ddl_dir", "ddl_output"), output_root),
+        "metadata_dir": _relative(output.get("metadata_dir", "metadata_output"), output_root),
+        "partition_dir": _relative(
+            (config.get("partitions", {}) or {}).get("output_dir", "partition_output"), output_root
+        ),
+        "ddl_layout": output.get("ddl_layout", "per_table"),
+        "metadata_layout": output.get("metadata_layout", "per_table"),
+        "catalog": output.get("catalog", "none"),
+        "counts": count_statuses(results),
+        "results": results,
+    }
+    path = os.path.join(output_root, SUMMARY_FILE)
+    _write_text(path, json_codec.dumps_pretty(summary))
+    print(f"[INFO] Run summary written to {path}")
+    return path
+
+
+def load_run_summary(root: str) -> dict:
+    with open(os.path.join(root, SUMMARY_FILE), "r", encoding="utf-8") as f:
+        summary = json_codec.loads(f.read())
+    summary["root"] = root
+    return summary
+
+
+def _shard_dir(summary: dict, key: str) -> str:
+    return os.path.join(summary["root"], summary[key])
+
+
+def check_shards(summaries: List[dict]) -> List[int]:
+    """
+    Validate that the runs belong together; return the missing shard numbers.
+    Raises ValueError for mixed shard counts, duplicate shards or different
+    output layouts.
+    """
+    for key in ("ddl_layout", "metadata_layout", "catalog"):
+        values = {s[key] for s in summaries}
+        if len(values) > 1:
+            raise ValueError(f"Shards were exported with different {key} settings: {sorted(values)}")
+
+    shards = [s["shard"] for s in summaries if s["shard"]]
+    if not shards:
+        return []
+    if len(shards) != len(summaries):
+        raise ValueError("Cannot merge sharded and unsharded runs")
+    counts = {int(shard.split("/")[1]) for shard in shards}
+    if len(counts) > 1:
+        raise ValueError(f"Shards come from different shard counts: {sorted(counts)}")
+    indexes = [int(shard.split("/")[0]) for shard in shards]
+    duplicates = sorted({i for i in indexes if indexes.count(i) > 1})
+    if duplicates:
+        raise ValueError(f"Shards given more than once: {duplicates}")
+    return sorted(set(range(1, counts.pop() + 1)) - set(indexes))
+
+
+def _merge_files(sources: List[str], target_dir: str, derived: tuple = ()) -> int:
+    """Copy per-table files; files present in several shards are concatenated."""
+    by_name = {}
+    for source in sources:
+        for path in sorted(glob.glob(os.path.join(source, "*"))):
+            name = os.path.basename(path)
+            if os.path.isfile(path) and not name.endswith(".tmp") and not name.startswith(".") \
+                    and name not in derived:
+                by_name.setdefault(name, []).append(path)
+
+    if by_name:
+        os.makedirs(target_dir, exist_ok=True)
+    for name, paths in by_name.items():
+        target = os.path.join(target_dir, name)
+        if len(paths) == 1:
+            shutil.copyfile(paths[0], f"{target}.tmp")
+            os.replace(f"{target}.tmp", target)
+            continue
+        parts = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                parts.append(f.read())
+        # The same separators the OutputWriter puts between lines and tables.
+        separator = "" if name.endswith(".jsonl") else "\n\n"
+        _write_text(target, separator.join(part for part in parts if part))
+    return len(by_name)
+
+
+def _merge_schema_changes(summaries: List[dict], target: str) -> None:
+    parts = []
+    for summary in summaries:
+        path = os.path.join(_shard_dir(summary, "ddl_dir"), "schema_changes.sql")
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                parts.append(f"-- Shard {summary['shard'] or summary['root']}\n{f.read().rstrip()}")
+    if parts:
+        _write_text(target, "\n\n".join(parts) + "\n")
+
+
+def _rebuild_catalog(catalog_format: str, metadata_dir: str, metadata_source: str) -> None:
+    store = open_catalog_store(catalog_format, metadata_dir)
+    if store is None:
+        return
+    for source, raw_json in iter_clean_json_sources(metadata_source):
+        try:
+            clean_json = json_codec.loads(raw_json)
+        except Exception as e:
+            print(f"[ERROR] Failed to read '{source}': {e}")
+            continue
+        store.add(clean_json, json_codec.dumps(clean_json))
+    for tmp_path, path in store.finish():
+        os.replace(tmp_path, path)
+
+
+def merge_shards(roots: List[str], output_root: str) -> dict:
+    """Merge the runs under ``roots`` into ``output_root``; returns the merged summary."""
+    summaries = [load_run_summary(root) for root in roots]
+    missing = check_shards(summaries)
+    if missing:
+        print(f"[ERROR] Missing shards: {', '.join(map(str, missing))}; the merged export is incomplete")
+
+    first = summaries[0]
+    ddl_dir = os.path.join(output_root, first["ddl_dir"])
+    metadata_dir = os.path.join(output_root, first["metadata_dir"])
+    partition_dir = os.path.join(output_root, first["partition_dir"])
+    _merge_files(
+        [_shard_dir(s, "metadata_dir") for s in summaries],
+        metadata_dir,
+        ("catalog.sqlite", "catalog.tables.parquet", "catalog.columns.parquet"),
+    )
+    _merge_files([_shard_dir(s, "ddl_dir") for s in summaries], ddl_dir, DERIVED_DDL_FILES)
+    _merge_files([_shard_dir(s, "partition_dir") for s in summaries], partition_dir)
+
+    metadata_source = metadata_dir
+    if first["metadata_layout"] == "jsonl":
+        metadata_source = os.path.join(metadata_dir, "catalog.jsonl")
+    if os.path.exists(metadata_source):
+        _rebuild_catalog(first["catalog"], metadata_dir, metadata_source)
+
+    def produced(name: str) -> bool:
+        return any(os.path.exists(os.path.join(_shard_dir(s, "ddl_dir"), name)) for s in summaries)
+
+    if produced("migration_plan.sql"):
+        write_migration_plan(metadata_source, os.path.join(ddl_dir, "migration_plan.sql"))
+    if produced("sizing_report.txt"):
+        # The shards' storage_scan.jsonl files were concatenated like any other output.
+        scan_path = os.path.join(ddl_dir, STORAGE_SCAN_FILE)
+        write_sizing_report(
+            metadata_source,
+            os.path.join(ddl_dir, "sizing_report.txt"),
+            storage=load_storage_scan(scan_path) if os.path.exists(scan_path) else None,
+            optimize_path=os.path.join(ddl_dir, OPTIMIZE_FILE) if produced(OPTIMIZE_FILE) else None,
+        )
+    _merge_schema_changes(summaries, os.path.join(ddl_dir, "schema_changes.sql"))
+
+    results = sorted(
+        (r for s in summaries for r in s["results"]), key=lambda r: (r["database"], r["table"])
+    )
+    merged = {
+        "shards": [s["shard"] for s in summaries],
+        "missing_shards": missing,
+        "started_at": min(s["started_at"] for s in summaries),
+        "seconds": max(s["seconds"] for s in summaries),
+        "databases": sorted({db for s in summaries for db in s["databases"]}),
+        **{key: first[key] for key in
+           ("ddl_dir", "metadata_dir", "partition_dir", "ddl_layout", "metadata_layout", "catalog")},
+        "counts": count_statuses(results),
+        "results": results,
+    }
+    _write_text(os.path.join(output_root, SUMMARY_FILE), json_codec.dumps_pretty(merged))
+    counts = merged["counts"]
+    print(
+        f"[INFO] Merged {len(summaries)} runs into {output_root}: {counts['ok']} converted, "
+        f"{counts['unchanged']} unchanged, {counts['failed']} failed"
+    )
+    return merged
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Merge the outputs of sharded runs into one export")
+    parser.add_argument("roots", nargs="+", help="output roots of the runs (each with run_summary.json)")
+    parser.add_argument("--output", required=True, help="directory for the merged export")
+    args = parser.parse_args(argv)
+    try:
+        merge_shards(args.roots, args.output)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"[ERROR] {e}")
+
+
+if __name__ == "__main__":
+    main()
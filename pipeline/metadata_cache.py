@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+
+# Rows whose value changes without any schema change.
+VOLATILE_KEYS = {"LastAccessTime:"}
+
+
+class DescriptionFingerprint:
+    """Hash and transient_lastDdlTime of DESCRIBE FORMATTED rows, fed one row at a time."""
+
+    __slots__ = ("_digest", "last_ddl_time", "rows")
+
+    def __init__(self):
+        self._digest = hashlib.sha256()
+        self.last_ddl_time = None
+        self.rows = 0
+
+    def feed(self, row) -> None:
+        self.rows += 1
+        if self.last_ddl_time is None:
+            for i, cell in enumerate(row[:-1]):
+                if isinstance(cell, str) and cell.strip() == "transient_lastDdlTime":
+                    value = row[i + 1]
+                    self.last_ddl_time = value.strip() if isinstance(value, str) else str(value)
+                    break
+        if row and isinstance(row[0], str) and row[0].strip() in VOLATILE_KEYS:
+            return
+        self._digest.update(repr(tuple(row)).encode("utf-8"))
+        self._digest.update(b"\n")
+
+    def entry(self) -> dict:
+        return {"fingerprint": self._digest.hexdigest(), "last_ddl_time": self.last_ddl_time or ""}
+
+
+def fingerprint_rows(description: list[tuple]) -> DescriptionFingerprint:
+    """DescriptionFingerprint of rows that were fetched into memory."""
+    fingerprint = DescriptionFingerprint()
+    for row in description:
+        fingerprint.feed(row)
+    return fingerprint
+
+
+class MetadataCache:
+    """
+    Persistent per-``db.table`` record of the last converted DESCRIBE output.
+
+    A table is unchanged when its fingerprint and transient_lastDdlTime match the
+    cached entry, it was converted with the same ``settings`` (such as the DDL
+    dialect) and the outputs written for it are still on disk.
+    """
+
+    def __init__(self, path: str, settings: dict = None):
+        self.path = path
+        self.settings = dict(settings or {})
+        self.tables = {}
+        self.seen = {}
+        try:
+            with open(path, "r") as f:
+                self.tables = json.load(f).get("tables", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[ERROR] Failed to load metadata cache '{path}', starting empty: {e}")
+
+    @staticmethod
+    def key(db: str, table: str) -> str:
+        return f"{db}.{table}"
+
+    def classify(self, db: str, table: str, description) -> tuple[str, dict]:
+        """
+        Return ("new" | "changed" | "unchanged", entry) for a fetched table;
+        ``description`` is its rows or a DescriptionFingerprint of them.
+        """
+        if not isinstance(description, DescriptionFingerprint):
+            description = fingerprint_rows(description)
+        key = self.key(db, table)
+        entry = dict(description.entry(), **self.settings)
+        cached = self.tables.get(key)
+        if cached is None:
+            status = "new"
+        elif (
+            description.rows
+            and all(cached.get(k) == v for k, v in entry.items())
+            and all(os.path.exists(p) for p in cached.get("outputs", []))
+        ):
+            status = "unchanged"
+        else:
+            status = "changed"
+        self.seen[key] = status
+        return status, entry
+
+    def update(self, db: str, table: str, entry: dict, outputs: list[str]) -> None:
+        self.tables[self.key(db, table)] = dict(entry, outputs=outputs)
+
+    def mark_failed(self, db: str, table: str) -> None:
+        """Report a table that could not be fetched or converted as failed; its entry is kept."""
+        self.seen[self.key(db, table)] = "failed"
+
+    def report(self, databases: list[str], selected=None) -> dict:
+        """Group this run's tables by change status; cached tables of the crawled
+        databases that were not seen are reported as dropped and forgotten.
+        ``databases`` must only hold databases whose tables were listed, and
+        ``selected(db, table)`` keeps tables a filter skipped out of "dropped"."""
+        report = {"new": [], "changed": [], "unchanged": [], "failed": [], "dropped": []}
+        for key, status in self.seen.items():
+            report[status].append(key)
+
+        prefixes = tuple(f"{db}." for db in databases)
+        for key in list(self.tables):
+            if key.startswith(prefixes) and key not in self.seen:
+                if selected is not None and not selected(*key.split(".", 1)):
+                    continue
+                report["dropped"].append(key)
+                del self.tables[key]
+
+        for keys in report.values():
+            keys.sort()
+        return report
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"tables": self.tables}, f)
+        os.replace(tmp_path, self.path)
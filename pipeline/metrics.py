@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+TABLE_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_NULL_CONTEXT = nullcontext()
+
+
+class RunMetrics:
+    """
+    Per-run instrumentation: stage timers, event counters (retries, hedges),
+    a per-table latency histogram, rows/bytes fetched from Hive and a log of
+    tables slower than ``slow_table_seconds``.
+
+    A disabled instance turns every call into a no-op, so instrumented code
+    paths only pay for an attribute lookup.
+    """
+
+    def __init__(self, enabled: bool = True, slow_table_seconds: float = 30.0):
+        self.enabled = enabled
+        self.slow_table_seconds = slow_table_seconds
+        self.started_at = time.time()
+        self.stages = {}  # name -> [calls, total_seconds, max_seconds]
+        self.counters = {}
+        self.table_buckets = [0] * (len(TABLE_LATENCY_BUCKETS) + 1)
+        self.table_count = 0
+        self.table_seconds = 0.0
+        self.table_status = {}
+        self.slow_tables = []
+        self.rows_fetched = 0
+        self.bytes_fetched = 0
+        self._lock = threading.Lock()
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(name, time.perf_counter() - start)
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self.stages.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def merge_stages(self, stages: dict) -> None:
+        """Fold in stage totals measured elsewhere (e.g. in a worker process)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            for name, (calls, total, longest) in stages.items():
+                entry = self.stages.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += calls
+                entry[1] += total
+                entry[2] = max(entry[2], longest)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def count_fetched(self, rows) -> None:
+        if not self.enabled:
+            return
+        # UTF-8 bytes; ASCII text (most metadata) is one byte per character.
+        size = sum(
+            len(cell) if cell.isascii() else len(cell.encode("utf-8"))
+            for row in rows
+            for cell in row
+            if isinstance(cell, str)
+        )
+        with self._lock:
+            self.rows_fetched += len(rows)
+            self.bytes_fetched += size
+
+    def observe_table(self, db: str, table: str, seconds: float, status: str = "ok") -> None:
+        if not self.enabled:
+            return
+        index = len(TABLE_LATENCY_BUCKETS)
+        for i, bound in enumerate(TABLE_LATENCY_BUCKETS):
+            if seconds <= bound:
+                index = i
+                break
+        with self._lock:
+            self.table_buckets[index] += 1
+            self.table_count += 1
+            self.table_seconds += seconds
+            self.table_status[status] = self.table_status.get(status, 0) + 1
+            if seconds >= self.slow_table_seconds:
+                self.slow_tables.append({"table": f"{db}.{table}", "seconds": round(seconds, 3)})
+                print(f"[INFO] Slow table {db}.{table}: {seconds:.2f}s")
+
+    def summary(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(TABLE_LATENCY_BUCKETS + ("+Inf",), self.table_buckets):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "started_at": self.started_at,
+            "wall_seconds": round(time.time() - self.started_at, 3),
+            "stages": {
+                name: {
+                    "calls": calls,
+                    "total_seconds": round(total, 6),
+                    "mean_seconds": round(total / calls, 6) if calls else 0.0,
+                    "max_seconds": round(longest, 6),
+                }
+                for name, (calls, total, longest) in sorted(self.stages.items())
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "tables": {
+                "count": self.table_count,
+                "total_seconds": round(self.table_seconds, 6),
+                "by_status": dict(self.table_status),
+                "latency_buckets": buckets,
+            },
+            "fetched": {"rows": self.rows_fetched, "bytes": self.bytes_fetched},
+            "slow_tables": sorted(self.slow_tables, key=lambda t: -t["seconds"]),
+        }
+
+    def prometheus_text(self, prefix: str = "datasetu") -> str:
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Seconds spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        for name, (_, total, _) in sorted(self.stages.items()):
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{name}"}} {total:.6f}')
+        lines += [
+            f"# HELP {prefix}_stage_calls_total Calls per pipeline stage.",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        for name, (calls, _, _) in sorted(self.stages.items()):
+            lines.append(f'{prefix}_stage_calls_total{{stage="{name}"}} {calls}')
+
+        lines += [
+            f"# HELP {prefix}_events_total Connector events such as retries and hedges.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, count in sorted(self.counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{name}"}} {count}')
+
+        lines += [
+            f"# HELP {prefix}_table_seconds End-to-end latency per table.",
+            f"# TYPE {prefix}_table_seconds histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip(TABLE_LATENCY_BUCKETS + ("+Inf",), self.table_buckets):
+            cumulative += count
+            lines.append(f'{prefix}_table_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{prefix}_table_seconds_sum {self.table_seconds:.6f}")
+        lines.append(f"{prefix}_table_seconds_count {self.table_count}")
+
+        lines += [
+            f"# HELP {prefix}_tables_total Tables processed by status.",
+            f"# TYPE {prefix}_tables_total counter",
+        ]
+        for status, count in sorted(self.table_status.items()):
+            lines.append(f'{prefix}_tables_total{{status="{status}"}} {count}')
+
+        lines += [
+            f"# HELP {prefix}_rows_fetched_total DESCRIBE rows fetched from Hive.",
+            f"# TYPE {prefix}_rows_fetched_total counter",
+            f"{prefix}_rows_fetched_total {self.rows_fetched}",
+            f"# HELP {prefix}_bytes_fetched_total Bytes of DESCRIBE text fetched from Hive.",
+            f"# TYPE {prefix}_bytes_fetched_total counter",
+            f"{prefix}_bytes_fetched_total {self.bytes_fetched}",
+            f"# HELP {prefix}_slow_tables Tables slower than the slow-table threshold.",
+            f"# TYPE {prefix}_slow_tables gauge",
+            f"{prefix}_slow_tables {len(self.slow_tables)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_dir: str) -> list[str]:
+        """Write run_metrics.json and a Prometheus textfile; returns their paths."""
+        if not self.enabled:
+            return []
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, "run_metrics.json")
+        prom_path = os.path.join(output_dir, "datasetu.prom")
+        for path, content in (
+            (json_path, json.dumps(self.summary(), indent=2)),
+            (prom_path, self.prometheus_text()),
+        ):
+            # node_exporter's textfile collector expects files to appear atomically.
+            with open(f"{path}.tmp", "w") as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+        return [json_path, prom_path]
+
+
+_current = RunMetrics(enabled=False)
+
+
+def get_metrics() -> RunMetrics:
+    return _current
+
+
+def set_metrics(metrics: RunMetrics) -> RunMetrics:
+    global _current
+    _current = metrics
+    return metrics
+
+
+def configure_metrics(config: dict) -> RunMetrics:
+    """Install the run's metrics from the ``metrics`` section of creds.yaml."""
+    settings = config.get("metrics", {}) or {}
+    return set_metrics(
+        RunMetrics(
+            enabled=bool(settings.get("enabled", False)),
+            slow_table_seconds=float(settings.get("slow_table_seconds", 30)),
+        )
+    )
@@ -0,0 +1,54 @@
+"""
+Build the cross-table constraint migration plan from an export.
+
+    python -m pipeline.migration_plan --input metadata_output --output ddl_output/migration_plan.sql
+
+Reads any export pipeline.catalog_reader understands (a directory of
+``*_clean.json`` files or a JSONL, sqlite or parquet catalog), so tables skipped as unchanged by an
+incremental run are still part of the plan.
+"""
+import argparse
+import os
+
+from convertor.catalog_index import CatalogIndex, MigrationPlan
+from pipeline import json_codec
+from pipeline.catalog_reader import iter_clean_json_sources
+
+
+def build_index(path: str) -> CatalogIndex:
+    index = CatalogIndex()
+    for source, raw_json in iter_clean_json_sources(path):
+        try:
+            index.add(json_codec.loads(raw_json))
+        except Exception as e:
+            print(f"[ERROR] Failed to index '{source}': {e}")
+    return index
+
+
+def write_migration_plan(metadata_source: str, output_path: str) -> MigrationPlan:
+    """Index every exported table and write the ordered constraint script."""
+    plan = build_index(metadata_source).migration_plan()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(f"{output_path}.tmp", "w") as f:
+        f.write(plan.to_sql())
+    os.replace(f"{output_path}.tmp", output_path)
+    print(
+        f"[INFO] Migration plan for {len(plan.table_order)} tables written to {output_path} "
+        f"({len(plan.primary_keys)} primary keys, {len(plan.foreign_keys)} foreign keys, "
+        f"{len(plan.checks)} check constraints, {len(plan.unique)} unique constraints as comments, "
+        f"{len(plan.unresolved)} skipped)"
+    )
+    return plan
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write the constraint migration plan for an export")
+    parser.add_argument("--input", default="metadata_output",
+                        help="export directory or catalog .jsonl/.sqlite/.tables.parquet")
+    parser.add_argument("--output", default=os.path.join("ddl_output", "migration_plan.sql"))
+    args = parser.parse_args(argv)
+    write_migration_plan(args.input, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Rebuild DDL from exported clean JSON without contacting Hive.
+
+    python -m pipeline.offline_replay --input metadata_output
+    python -m pipeline.offline_replay --input metadata_output/catalog.jsonl --workers 16
+    python -m pipeline.offline_replay --input metadata_output --dialect iceberg
+
+Only convertor code and the output writer are imported, so pyhive (and the
+rest of the connector layer) is never loaded.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
+from convertor.ddl_renderer import DIALECTS
+from convertor.table_ddl import build_table_ddl
+from pipeline import json_codec
+from pipeline.catalog_reader import iter_clean_json_sources
+from pipeline.migration_plan import write_migration_plan
+from pipeline.output_writer import DDL_LAYOUTS, OutputWriter
+
+
+def replay_document(
+    source: str, raw_json: str, inline_constraints: bool = True, dialect: str = "databricks"
+) -> tuple:
+    """Worker: one clean-JSON document to ``(source, db, table, ddl, error)``."""
+    try:
+        clean_json = json_codec.loads(raw_json)
+        db = clean_json["database"]
+        table = clean_json["table_name"]
+        ddl = build_table_ddl(db, table, clean_json, inline_constraints, dialect)
+        return source, db, table, ddl, ""
+    except Exception as e:
+        return source, "", "", "", f"{type(e).__name__}: {e}"
+
+
+def replay(
+    path: str,
+    writer: OutputWriter,
+    workers: int = None,
+    chunksize: int = 32,
+    inline_constraints: bool = True,
+    dialect: str = "databricks",
+) -> list[dict]:
+    """Regenerate DDL for every exported table under ``path`` in parallel."""
+    workers = workers or os.cpu_count() or 1
+    # Submit a bounded window at a time so the catalog is never fully in memory.
+    window = workers * chunksize * 4
+    sources = iter_clean_json_sources(path)
+    worker = partial(replay_document, inline_constraints=inline_constraints, dialect=dialect)
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = list(islice(sources, window))
+            if not batch:
+                break
+            for source, db, table, ddl, error in executor.map(
+                worker, *zip(*batch), chunksize=chunksize
+            ):
+                if error:
+                    print(f"[ERROR] Failed to replay '{source}': {error}")
+                else:
+                    writer.write(db, table, ddl)
+                results.append(
+                    {
+                        "source": source,
+                        "database": db,
+                        "table": table,
+                        "status": "failed" if error else "ok",
+                        "error": error,
+                    }
+                )
+    return results
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild DDL from exported clean JSON")
+    parser.add_argument("--input", default="metadata_output",
+                        help="export directory, catalog .jsonl/.sqlite/.tables.parquet "
+                             "or single *_clean.json file")
+    parser.add_argument("--ddl-dir", default="ddl_output")
+    parser.add_argument("--ddl-layout", default="per_table", choices=DDL_LAYOUTS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=32)
+    parser.add_argument("--constraints", default="inline", choices=("inline", "plan"),
+                        help="'plan' moves key constraints into migration_plan.sql")
+    parser.add_argument("--dialect", default="databricks", choices=sorted(DIALECTS),
+                        help="SQL dialect of the generated DDL")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    writer = OutputWriter(ddl_dir=args.ddl_dir, ddl_layout=args.ddl_layout)
+    results = replay(
+        args.input, writer, args.workers, args.chunksize, args.constraints == "inline", args.dialect
+    )
+    failed_writes = writer.close()
+    if args.constraints == "plan":
+        write_migration_plan(args.input, os.path.join(args.ddl_dir, "migration_plan.sql"))
+
+    failed = [r for r in results if r["status"] != "ok"]
+    print(
+        f"Replayed {len(results) - len(failed)} tables "
+        f"({len(failed)} failed, {len(failed_writes)} write errors) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+import os
+import queue
+import threading
+from pipeline import json_codec
+from pipeline.catalog_store import CATALOG_FORMATS, open_catalog_store
+from pipeline.metrics import get_metrics
+
+DDL_LAYOUTS = ("per_table", "per_database")
+METADATA_LAYOUTS = ("per_table", "jsonl")
+
+_STOP = object()
+# Stands for the catalog files in the set of unpublished paths.
+_CATALOG = object()
+
+
+def _fsync_path(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OutputWriter:
+    """
+    Background writer for DDL and clean-JSON artifacts.
+
+    Tables are queued with write() and written by a single thread. Every file
+    is first written under a ``.tmp`` name and renamed into place only after
+    an fsync, so readers never see a half-written file. Per-table files are
+    fsynced and renamed in batches of ``fsync_batch_size``. Consolidated files
+    (per-database ``.sql`` scripts, the JSON Lines catalog) are renamed when
+    the writer is closed.
+
+    Layouts:
+      ddl_layout       "per_table"    ddl_output/<db>.<table>.sql
+                       "per_database" ddl_output/<db>.sql
+      metadata_layout  "per_table"    metadata_output/<db>.<table>_clean.json
+                       "jsonl"        metadata_output/catalog.jsonl
+      catalog_format   "none"
+                       "sqlite"       metadata_output/catalog.sqlite
+                       "parquet"      metadata_output/catalog.{tables,columns}.parquet
+
+    A table whose files fail to be written or published is returned by
+    close() as failed; for a consolidated file that is every table it holds.
+    With a ``journal`` (pipeline.checkpoint), each table is journaled as "ok"
+    once all of its files are published, or as "failed" together with its
+    entry in the failures close() returns.
+    An unexpected error stops the writer: the tables not yet published and
+    every table still queued are then reported as failed.
+
+    The catalog formats add one row per table and per column next to the
+    metadata layout (see pipeline.catalog_store). JSON is encoded with
+    orjson when it is installed.
+    """
+
+    def __init__(
+        self,
+        ddl_dir: str = "ddl_output",
+        metadata_dir: str = "metadata_output",
+        ddl_layout: str = "per_table",
+        metadata_layout: str = "per_table",
+        queue_size: int = 256,
+        fsync_batch_size: int = 500,
+        catalog_format: str = "none",
+        journal=None,
+    ):
+        if ddl_layout not in DDL_LAYOUTS:
+            raise ValueError(f"Unknown ddl_layout '{ddl_layout}', expected one of {DDL_LAYOUTS}")
+        if metadata_layout not in METADATA_LAYOUTS:
+            raise ValueError(
+                f"Unknown metadata_layout '{metadata_layout}', expected one of {METADATA_LAYOUTS}"
+            )
+        if catalog_format not in CATALOG_FORMATS:
+            raise ValueError(f"Unknown catalog format '{catalog_format}', expected one of {CATALOG_FORMATS}")
+        self.ddl_dir = ddl_dir
+        self.metadata_dir = metadata_dir
+        self.ddl_layout = ddl_layout
+        self.metadata_layout = metadata_layout
+        self.catalog_format = catalog_format
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.failed = {}
+        self.journal = journal
+        self._catalog = open_catalog_store(catalog_format, metadata_dir)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._pending = []  # (tmp_path, final_path) awaiting fsync + rename
+        self._open_files = {}  # final_path -> file object for consolidated outputs
+        self._unpublished = []  # (db, table, paths, in_catalog) written but not yet published
+        self._failed_paths = set()  # per-table files of a consolidated run that failed to publish
+        self._directories = set()  # output directories already created
+        self.error = None  # the exception that stopped the writer thread
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def consolidated(self) -> bool:
+        return (
+            self.ddl_layout != "per_table"
+            or self.metadata_layout != "per_table"
+            or self.catalog_format != "none"
+        )
+
+    @property
+    def metadata_source(self) -> str:
+        """Where the clean JSON ends up: the metadata directory or the catalog file."""
+        if self.metadata_layout == "per_table":
+            return self.metadata_dir
+        return os.path.join(self.metadata_dir, "catalog.jsonl")
+
+    @classmethod
+    def from_config(cls, config: dict) -> "OutputWriter":
+        output = config.get("output", {}) or {}
+        return cls(
+            ddl_dir=output.get("ddl_dir", "ddl_output"),
+            metadata_dir=output.get("metadata_dir", "metadata_output"),
+            ddl_layout=output.get("ddl_layout", "per_table"),
+            metadata_layout=output.get("metadata_layout", "per_table"),
+            queue_size=output.get("queue_size", 256),
+            fsync_batch_size=output.get("fsync_batch_size", 500),
+            catalog_format=output.get("catalog", "none"),
+        )
+
+    def paths_for(self, db: str, table: str) -> list[str]:
+        if self.metadata_layout == "per_table":
+            metadata_path = os.path.join(self.metadata_dir, f"{db}.{table}_clean.json")
+        else:
+            metadata_path = os.path.join(self.metadata_dir, "catalog.jsonl")
+        if self.ddl_layout == "per_table":
+            ddl_path = os.path.join(self.ddl_dir, f"{db}.{table}.sql")
+        else:
+            ddl_path = os.path.join(self.ddl_dir, f"{db}.sql")
+        return [metadata_path, ddl_path]
+
+    def write(self, db: str, table: str, ddl: str, clean_json: dict = None) -> list[str]:
+        """Queue one table's artifacts (DDL only when ``clean_json`` is None);
+        blocks while the queue is full."""
+        self._queue.put((db, table, ddl, clean_json))
+        paths = self.paths_for(db, table)
+        return paths if clean_json is not None else paths[1:]
+
+    def close(self) -> dict:
+        """Drain the queue, publish every file and return {db.table: error};
+        ``error`` is set when the writer thread stopped early."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.error is not None:
+            print(f"[ERROR] Output writer stopped early; {len(self.failed)} tables reported as failed")
+        return self.failed
+
+    def _run(self) -> None:
+        stopped = False
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    stopped = True
+                    break
+                db, table, ddl, clean_json = item
+                try:
+                    with get_metrics().stage("write.outputs"):
+                        self._write_table(db, table, ddl, clean_json)
+                except Exception as e:
+                    print(f"[ERROR] Failed to write outputs for {db}.{table}: {e}")
+                    self._fail(db, table, str(e), f"write failed: {e}")
+                if len(self._pending) >= self.fsync_batch_size:
+                    self._flush_pending()
+
+            self._flush_pending()
+            self._journal_published(self._failed_paths | self._close_consolidated())
+        except Exception as e:
+            print(f"[ERROR] Output writer stopped: {e}")
+            self.error = e
+            self._abandon(f"output writer stopped: {e}", stopped)
+
+    def _abandon(self, error: str, stopped: bool) -> None:
+        """Fail every table not yet published and drain the queue, so that
+        write() and close() never block on a dead thread."""
+        for db, table, _, _ in self._unpublished:
+            self.failed.setdefault(f"{db}.{table}", error)
+        self._unpublished = []
+        while not stopped:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            self.failed.setdefault(f"{item[0]}.{item[1]}", error)
+
+    def _write_table(self, db: str, table: str, ddl: str, clean_json: dict) -> None:
+        metadata_path, ddl_path = self.paths_for(db, table)
+
+        if clean_json is None:
+            pass
+        elif self.metadata_layout == "per_table":
+            self._write_file(metadata_path, json_codec.dumps_pretty(clean_json))
+            if self._catalog is not None:
+                self._catalog.add(clean_json, json_codec.dumps(clean_json))
+        else:
+            line = json_codec.dumps(clean_json)
+            self._consolidated(metadata_path).write(line + "\n")
+            if self._catalog is not None:
+                self._catalog.add(clean_json, line)
+
+        if self.ddl_layout == "per_table":
+            self._write_file(ddl_path, ddl)
+        else:
+            f = self._consolidated(ddl_path)
+            if f.tell():
+                f.write("\n\n")
+            f.write(f"-- Table: {db}.{table}\n{ddl}\n")
+
+        paths = [metadata_path, ddl_path] if clean_json is not None else [ddl_path]
+        self._unpublished.append((db, table, paths, clean_json is not None and self._catalog is not None))
+
+    def _makedirs(self, path: str) -> None:
+        directory = os.path.dirname(path) or "."
+        if directory not in self._directories:
+            os.makedirs(directory, exist_ok=True)
+            self._directories.add(directory)
+
+    def _write_file(self, path: str, content: str) -> None:
+        self._makedirs(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        self._pending.append((tmp_path, path))
+
+    def _consolidated(self, path: str):
+        f = self._open_files.get(path)
+        if f is None:
+            self._makedirs(path)
+            f = open(f"{path}.tmp", "w", encoding="utf-8")
+            self._open_files[path] = f
+        return f
+
+    def _flush_pending(self) -> None:
+        if not self._pending:
+            return
+        with get_metrics().stage("write.fsync_batch"):
+            self._publish_pending()
+
+    def _publish_pending(self) -> None:
+        directories = set()
+        unpublished = set()
+        for tmp_path, path in self._pending:
+            try:
+                _fsync_path(tmp_path)
+                os.replace(tmp_path, path)
+                directories.add(os.path.dirname(path) or ".")
+            except Exception as e:
+                print(f"[ERROR] Failed to publish '{path}': {e}")
+                unpublished.add(path)
+        self._pending = []
+        for directory in directories:
+            self._fsync_directory(directory)
+        if not self.consolidated:
+            # Consolidated files are only published by close().
+            self._journal_published(unpublished)
+        else:
+            self._failed_paths |= unpublished
+
+    def _journal_published(self, unpublished: set) -> None:
+        """Settle the tables written since the last call: "failed" when any of
+        their files is in ``unpublished``, "ok" otherwise."""
+        for db, table, paths, in_catalog in self._unpublished:
+            failed = [path for path in paths if path in unpublished]
+            if in_catalog and _CATALOG in unpublished:
+                failed.append(f"{self.catalog_format} catalog")
+            if failed:
+                error = f"publish failed: {', '.join(failed)}"
+                self._fail(db, table, error, error)
+            elif self.journal is not None and f"{db}.{table}" not in self.failed:
+                self.journal.record(db, table, "ok", outputs=paths)
+        self._unpublished = []
+
+    def _fail(self, db: str, table: str, error: str, journal_error: str) -> None:
+        """The one place a table is failed: close() returns it and the journal records it."""
+        self.failed[f"{db}.{table}"] = error
+        if self.journal is not None:
+            self.journal.record(db, table, "failed", journal_error)
+
+    def _close_consolidated(self) -> set:
+        """Publish the consolidated files and the catalog; returns the paths
+        that could not be published (``_CATALOG`` for the catalog)."""
+        unpublished = set()
+        directories = set()
+        for path, f in self._open_files.items():
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+                os.replace(f.name, path)
+                directories.add(os.path.dirname(path) or ".")
+            except Exception as e:
+                print(f"[ERROR] Failed to publish '{path}': {e}")
+                unpublished.add(path)
+        self._open_files = {}
+        if self._catalog is not None:
+            try:
+                for tmp_path, path in self._catalog.finish():
+                    _fsync_path(tmp_path)
+                    os.replace(tmp_path, path)
+                    directories.add(os.path.dirname(path) or ".")
+            except Exception as e:
+                print(f"[ERROR] Failed to publish the {self.catalog_format} catalog: {e}")
+                unpublished.add(_CATALOG)
+            self._catalog = None
+        for directory in directories:
+            self._fsync_directory(directory)
+        return unpublished
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        try:
+            _fsync_path(directory)
+        except OSError:
+            # Not every platform/filesystem allows fsync on a directory.
+            pass
@@ -0,0 +1,171 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from connector.connection_pool import HiveConnectionPool
+from connector.db_function import iter_partitions
+from convertor.helper_methods import infer_format
+from convertor.partition_structure import (
+    generate_add_partition_statements,
+    generate_repair_statement,
+)
+from convertor.table_stats import TableStats
+from pipeline.catalog_reader import iter_tables
+from pipeline.metrics import get_metrics
+from pipeline.sizing import longest_first
+
+PARTITION_MODES = ("add", "msck", "auto")
+
+
+def partitioned_tables(metadata_source: str, selected: set) -> tuple[list, list]:
+    """
+    ``(jobs, delta_tables)`` for the exported tables in ``selected`` that have
+    partition columns. Delta tables track partitions in their transaction log,
+    so they are returned separately instead of as jobs. Jobs come most data
+    files (numFiles) first, as those have the most partitions to list.
+    """
+    jobs, delta_tables = [], []
+    costs = {}
+    for clean_json in iter_tables(metadata_source):
+        key = (clean_json.get("database"), clean_json.get("table_name"))
+        if key not in selected or not clean_json.get("partitions"):
+            continue
+        input_format = (clean_json.get("storage_format") or {}).get("input_format", "")
+        if infer_format(input_format) == "DELTA":
+            delta_tables.append(key)
+        else:
+            jobs.append(key)
+            costs[key] = TableStats.from_clean_json(clean_json).num_files
+    return longest_first(jobs, costs.get), delta_tables
+
+
+class PartitionStage:
+    """
+    Write partition registration scripts, one per partitioned table, to
+    ``output_dir/<db>.<table>.partitions.sql``.
+
+    Modes:
+      "add"   stream SHOW PARTITIONS and emit ALTER TABLE ... ADD IF NOT EXISTS
+              with ``partitions_per_statement`` partitions per statement
+      "msck"  emit MSCK REPAIR TABLE without listing partitions
+      "auto"  like "add", but fall back to MSCK REPAIR TABLE once a table has
+              more than ``msck_threshold`` partitions
+
+    Tables run in parallel, one pooled Hive session each.
+    """
+
+    def __init__(
+        self,
+        pool: HiveConnectionPool,
+        output_dir: str = "partition_output",
+        mode: str = "add",
+        partitions_per_statement: int = 100,
+        fetch_batch_size: int = 1000,
+        msck_threshold: int = 100000,
+        timeout: float = None,
+    ):
+        if mode not in PARTITION_MODES:
+            raise ValueError(f"Unknown partition mode '{mode}', expected one of {PARTITION_MODES}")
+        self.pool = pool
+        self.output_dir = output_dir
+        self.mode = mode
+        self.partitions_per_statement = max(1, partitions_per_statement)
+        self.fetch_batch_size = fetch_batch_size
+        self.msck_threshold = msck_threshold
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, pool: HiveConnectionPool, config: dict, timeout: float = None) -> "PartitionStage":
+        settings = config.get("partitions", {}) or {}
+        return cls(
+            pool,
+            output_dir=settings.get("output_dir", "partition_output"),
+            mode=settings.get("mode", "add"),
+            partitions_per_statement=settings.get("partitions_per_statement", 100),
+            fetch_batch_size=settings.get("fetch_batch_size", 1000),
+            msck_threshold=settings.get("msck_threshold", 100000),
+            timeout=timeout,
+        )
+
+    def run(self, jobs: list[tuple[str, str]]) -> list[dict]:
+        """Export every ``(db, table)`` job; results keep the order of ``jobs``."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        results = [None] * len(jobs)
+        pending = iter(enumerate(jobs))
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="partitions") as executor:
+            while True:
+                for idx, (db, table) in pending:
+                    in_flight[executor.submit(self.export_table, db, table)] = idx
+                    if len(in_flight) >= self.pool.size * 2:
+                        break
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[in_flight.pop(future)] = future.result()
+        return results
+
+    def export_table(self, db: str, table: str) -> dict:
+        start = time.perf_counter()
+        name = f"{db}.{table}"
+        path = os.path.join(self.output_dir, f"{name}.partitions.sql")
+        result = {"database": db, "table": table, "partitions": 0, "mode": self.mode, "error": ""}
+        try:
+            with get_metrics().stage("partitions.table"):
+                if self.mode == "msck":
+                    self._write(path, [generate_repair_statement(name)])
+                else:
+                    result.update(self._write_add_partitions(db, table, path))
+        except Exception as e:
+            print(f"[ERROR] Failed to export partitions for {name}: {e}")
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        return result
+
+    def _write_add_partitions(self, db: str, table: str, path: str) -> dict:
+        name = f"{db}.{table}"
+        count = 0
+        fallback = False
+
+        def counted(specs):
+            nonlocal count
+            for spec in specs:
+                count += 1
+                yield spec
+
+        tmp_path = f"{path}.tmp"
+        try:
+            with self.pool.acquire() as conn, open(tmp_path, "w") as f:
+                specs = counted(
+                    iter_partitions(conn, db, table, self.fetch_batch_size, self.timeout)
+                )
+                for statement in generate_add_partition_statements(
+                    name, specs, self.partitions_per_statement
+                ):
+                    if self.mode == "auto" and count > self.msck_threshold:
+                        fallback = True
+                        break
+                    f.write(f"{statement};\n\n")
+                specs.close()
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if fallback:
+            os.remove(tmp_path)
+            self._write(path, [generate_repair_statement(name)])
+            return {"partitions": count, "mode": "msck"}
+        if count == 0:
+            os.remove(tmp_path)
+            return {"partitions": 0, "mode": "add"}
+        os.replace(tmp_path, path)
+        return {"partitions": count, "mode": "add"}
+
+    @staticmethod
+    def _write(path: str, statements: list[str]) -> None:
+        with open(f"{path}.tmp", "w") as f:
+            f.write("".join(f"{s};\n" for s in statements))
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,56 @@
+"""
+Emit ALTER statements that move Databricks from one export to the next.
+
+    python -m pipeline.schema_diff --old snapshots/2024-06-01 --new metadata_output
+
+Both sides are read through pipeline.catalog_reader (a directory of
+``*_clean.json`` files or a JSONL, sqlite or parquet catalog). The previous snapshot is
+held as compact catalog.Table records plus a fingerprint per table.
+"""
+import argparse
+import os
+from typing import Dict
+
+from convertor.catalog import Table
+from convertor.schema_diff import SchemaDiff, diff_snapshots, table_fingerprint
+from pipeline.catalog_reader import iter_tables
+
+
+def load_snapshot(path: str, selected=None) -> Dict[str, tuple]:
+    """{db.table: (fingerprint, Table)} for every table exported under ``path``
+    that ``selected(db, table)`` accepts (all of them when it is None)."""
+    if not os.path.exists(path):
+        return {}
+    snapshot = {}
+    for clean_json in iter_tables(path):
+        if selected is not None and not selected(clean_json.get("database"), clean_json.get("table_name")):
+            continue
+        table = Table.from_dict(clean_json)
+        snapshot[table.full_name] = (table_fingerprint(clean_json), table)
+    return snapshot
+
+
+def write_schema_diff(previous: Dict[str, tuple], current_path: str, output_path: str) -> SchemaDiff:
+    diff = diff_snapshots(previous, iter_tables(current_path))
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(f"{output_path}.tmp", "w") as f:
+        f.write(diff.to_sql())
+    os.replace(f"{output_path}.tmp", output_path)
+    print(
+        f"[INFO] Schema changes written to {output_path} ({len(diff.changed)} changed, "
+        f"{len(diff.new_tables)} new, {len(diff.dropped_tables)} removed tables)"
+    )
+    return diff
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Diff two clean-JSON exports into ALTER statements")
+    parser.add_argument("--old", required=True, help="previous export directory or catalog .jsonl")
+    parser.add_argument("--new", default="metadata_output", help="current export directory or catalog .jsonl")
+    parser.add_argument("--output", default=os.path.join("ddl_output", "schema_changes.sql"))
+    args = parser.parse_args(argv)
+    write_schema_diff(load_snapshot(args.old), args.new, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Cost-based scheduling and the migration sizing report.
+
+A table's statistics are only known once it has been described, so the
+crawl is ordered by the previous export: biggest tables (by column count)
+start first and a single 8k-column table no longer finishes last. Tables
+that are new since that export get the average cost.
+
+The sizing report aggregates totalSize, numFiles and numRows per database
+and lists tables dominated by small files. With a storage scan
+(connector.storage_scanner) the scanned file counts and bytes replace the
+Hive statistics, which are often stale or missing, and the report adds
+file-size histograms. Small-file tables get an OPTIMIZE statement in
+``optimize_after_migration.sql``.
+"""
+import os
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from connector.storage_scanner import SIZE_BUCKET_LABELS, StorageScanner, StorageStats
+from convertor.ddl_renderer import DIALECTS
+from convertor.table_stats import TableStats
+from pipeline import json_codec
+from pipeline.catalog_reader import iter_tables
+
+SMALL_FILE_MB = 32
+MIN_SMALL_FILES = 100
+STORAGE_SCAN_FILE = "storage_scan.jsonl"
+OPTIMIZE_FILE = "optimize_after_migration.sql"
+
+
+def load_stats(metadata_source: str, databases: Optional[Iterable[str]] = None) -> Dict[tuple, TableStats]:
+    """{(db, table): TableStats} for every table exported under ``metadata_source``."""
+    if not os.path.exists(metadata_source):
+        return {}
+    return {
+        stats.key: stats
+        for stats in map(TableStats.from_clean_json, iter_tables(metadata_source, databases))
+    }
+
+
+def longest_first(jobs: List[tuple], cost: Callable[[tuple], Optional[float]]) -> List[tuple]:
+    """
+    ``jobs`` ordered by descending ``cost(job)``; unknown (None) costs count as
+    the average of the known ones. Ties keep their original order.
+    """
+    costs = [cost(job) for job in jobs]
+    known = [c for c in costs if c is not None]
+    default = sum(known) / len(known) if known else 0
+    order = sorted(
+        range(len(jobs)), key=lambda i: -(costs[i] if costs[i] is not None else default)
+    )
+    return [jobs[i] for i in order]
+
+
+def schedule_jobs(jobs: List[tuple], stats: Dict[tuple, TableStats]) -> List[tuple]:
+    """Longest-job-first crawl order for ``(db, table)`` jobs."""
+    if not stats:
+        return jobs
+    scheduled = longest_first(
+        jobs, lambda job: stats[job].crawl_cost if job in stats else None
+    )
+    known = sum(1 for job in jobs if job in stats)
+    print(f"[INFO] Scheduling {len(jobs)} tables longest first ({known} with costs from the last export)")
+    return scheduled
+
+
+def scan_storage(
+    scanner: StorageScanner,
+    metadata_source: str,
+    output_path: str,
+    selected: Callable[[str, str], bool] = None,
+    include_managed: bool = False,
+) -> Dict[tuple, StorageStats]:
+    """
+    Scan the locations of the exported EXTERNAL_TABLEs (every table with
+    ``include_managed``) and write one line per table to ``output_path``.
+    """
+    locations = {}
+    for clean_json in iter_tables(metadata_source):
+        key = (clean_json.get("database", ""), clean_json.get("table_name", ""))
+        if selected is not None and not selected(*key):
+            continue
+        if include_managed or clean_json.get("table_type") == "EXTERNAL_TABLE":
+            locations[key] = clean_json.get("location", "")
+
+    start = time.perf_counter()
+    storage = scanner.scan(locations)
+    if scanner.cache is not None:
+        scanner.cache.save()
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(f"{output_path}.tmp", "w", encoding="utf-8") as f:
+        for (db, table), stats in sorted(storage.items()):
+            f.write(json_codec.dumps({"database": db, "table": table, "location": locations[(db, table)],
+                                      **stats.to_dict()}) + "\n")
+    os.replace(f"{output_path}.tmp", output_path)
+    cached = f", {scanner.cache.hits} directories unchanged" if scanner.cache is not None else ""
+    unreadable = sum(1 for stats in storage.values() if stats.error)
+    print(
+        f"[INFO] Scanned {len(storage) - unreadable} of {len(locations)} table locations in "
+        f"{time.perf_counter() - start:.1f}s ({sum(s.directories for s in storage.values()):,} directories"
+        f"{cached}); results in {output_path}"
+    )
+    if unreadable:
+        print(f"[INFO] {unreadable} table locations could not be read; sizing them from Hive statistics")
+    return storage
+
+
+def load_storage_scan(path: str) -> Dict[tuple, StorageStats]:
+    """The results scan_storage() wrote to ``path``."""
+    storage = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                data = json_codec.loads(line)
+                storage[(data["database"], data["table"])] = StorageStats.from_dict(data)
+    return storage
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PB"
+
+
+def _empty_totals() -> dict:
+    return {"tables": 0, "total_size": 0, "raw_data_size": 0, "num_files": 0, "num_rows": 0, "small_file_tables": 0}
+
+
+class SizingReport:
+    """Per-database totals plus the small-file-heavy tables of one export."""
+
+    def __init__(self, small_file_mb: float = SMALL_FILE_MB, min_small_files: int = MIN_SMALL_FILES):
+        self.small_file_bytes = small_file_mb * 1024 * 1024
+        self.small_file_mb = small_file_mb
+        self.min_small_files = min_small_files
+        self.databases: Dict[str, dict] = {}
+        self.small_file_tables: List[TableStats] = []
+        self.without_stats: List[str] = []
+        self.scanned = StorageStats()
+        self.scanned_tables = 0
+        self.scan_errors: List[str] = []
+
+    def add(self, stats: TableStats, storage: StorageStats = None) -> None:
+        """Add one table; a storage scan of it replaces its Hive file and size statistics."""
+        if storage is not None:
+            self.scanned_tables += 1
+            self.scanned.merge(storage)
+            if storage.errors:
+                self.scan_errors.append(f"{stats.database}.{stats.table}: {storage.error}")
+            if storage.directories:
+                stats.num_files, stats.total_size = storage.files, storage.bytes
+        totals = self.databases.setdefault(stats.database, _empty_totals())
+        totals["tables"] += 1
+        if stats.total_size is None and stats.num_files is None:
+            self.without_stats.append(f"{stats.database}.{stats.table}")
+        for field in ("total_size", "raw_data_size", "num_files", "num_rows"):
+            totals[field] += getattr(stats, field) or 0
+        if stats.is_small_file_heavy(self.small_file_bytes, self.min_small_files):
+            totals["small_file_tables"] += 1
+            self.small_file_tables.append(stats)
+
+    def totals(self) -> dict:
+        result = _empty_totals()
+        for totals in self.databases.values():
+            for field in result:
+                result[field] += totals[field]
+        return result
+
+    def to_text(self) -> str:
+        totals = self.totals()
+        lines = [
+            "Migration sizing report",
+            f"Tables: {totals['tables']:,}  Size: {_format_bytes(totals['total_size'])}  "
+            f"Files: {totals['num_files']:,}  Rows: {totals['num_rows']:,}",
+        ]
+        if self.without_stats:
+            lines.append(
+                f"Tables without statistics: {len(self.without_stats):,} "
+                f"(ANALYZE TABLE ... COMPUTE STATISTICS fills them in)"
+            )
+
+        lines += ["", f"{'Database':<32} {'Tables':>8} {'Size':>10} {'Files':>12} {'Rows':>16} {'Small-file':>10}"]
+        for db in sorted(self.databases, key=lambda d: -self.databases[d]["total_size"]):
+            t = self.databases[db]
+            lines.append(
+                f"{db:<32} {t['tables']:>8,} {_format_bytes(t['total_size']):>10} "
+                f"{t['num_files']:>12,} {t['num_rows']:>16,} {t['small_file_tables']:>10,}"
+            )
+
+        if self.scanned_tables:
+            scanned = self.scanned
+            lines += [
+                "",
+                f"Storage scan: {self.scanned_tables:,} table locations, {scanned.files:,} files, "
+                f"{_format_bytes(scanned.bytes)}, {scanned.partition_dirs:,} partition directories",
+            ]
+            for label, count in zip(SIZE_BUCKET_LABELS, scanned.histogram):
+                share = count / scanned.files if scanned.files else 0
+                lines.append(f"  {label:>12} {count:>12,} files {share:>7.1%}")
+            if self.scan_errors:
+                lines.append(f"Unreadable locations: {len(self.scan_errors):,}")
+                lines += [f"  {error}" for error in self.scan_errors]
+
+        if self.small_file_tables:
+            lines += [
+                "",
+                f"Small-file-heavy tables (at least {self.min_small_files} files averaging "
+                f"under {self.small_file_mb} MB)",
+            ]
+            for stats in sorted(self.small_file_tables, key=lambda s: -s.num_files):
+                lines.append(
+                    f"  {stats.database}.{stats.table}: {stats.num_files:,} files, "
+                    f"{_format_bytes(stats.total_size)}, average {_format_bytes(stats.average_file_size)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def optimize_statement(database: str, table: str, bucket_columns: list) -> str:
+    """Databricks OPTIMIZE for one table, ZORDER BY its old bucket columns when it had any."""
+    dialect = DIALECTS["databricks"]
+    zorder_cols = [c.strip() for c in bucket_columns or [] if c and c.strip()]
+    statement = f"OPTIMIZE {dialect.quote_name(database, table)}"
+    if zorder_cols:
+        statement += f" ZORDER BY ({', '.join(dialect.quote_identifier(c) for c in zorder_cols)})"
+    return statement
+
+
+def write_optimize_script(output_path: str, tables: List[TableStats], bucket_columns: Dict[tuple, list]) -> None:
+    """OPTIMIZE (ZORDER BY the old bucket columns) for every small-file table."""
+    lines = ["-- Compact small-file tables after their data is migrated"]
+    for stats in sorted(tables, key=lambda s: -s.num_files):
+        statement = optimize_statement(stats.database, stats.table, bucket_columns.get(stats.key, []))
+        lines.append(
+            f"{statement};  -- {stats.num_files:,} files, average {_format_bytes(stats.average_file_size)}"
+        )
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(f"{output_path}.tmp", "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(f"{output_path}.tmp", output_path)
+
+
+def write_sizing_report(
+    metadata_source: str,
+    output_path: str,
+    selected: Callable[[str, str], bool] = None,
+    small_file_mb: float = SMALL_FILE_MB,
+    min_small_files: int = MIN_SMALL_FILES,
+    storage: Dict[tuple, StorageStats] = None,
+    optimize_path: str = None,
+) -> SizingReport:
+    """
+    Report on every exported table ``selected(db, table)`` accepts, using the
+    ``storage`` scan where there is one; with ``optimize_path``, also write
+    the OPTIMIZE script for the small-file tables.
+    """
+    report = SizingReport(small_file_mb, min_small_files)
+    bucket_columns = {}
+    for clean_json in iter_tables(metadata_source):
+        stats = TableStats.from_clean_json(clean_json)
+        if selected is None or selected(stats.database, stats.table):
+            report.add(stats, (storage or {}).get(stats.key))
+            bucket_columns[stats.key] = (clean_json.get("storage_format") or {}).get("bucket_columns") or []
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(f"{output_path}.tmp", "w") as f:
+        f.write(report.to_text())
+    os.replace(f"{output_path}.tmp", output_path)
+    if optimize_path:
+        write_optimize_script(optimize_path, report.small_file_tables, bucket_columns)
+    totals = report.totals()
+    print(
+        f"[INFO] Sizing report written to {output_path} ({totals['tables']} tables, "
+        f"{_format_bytes(totals['total_size'])}, {len(report.small_file_tables)} small-file-heavy)"
+    )
+    return report
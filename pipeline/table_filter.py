@@ -0,0 +1,176 @@
+"""
+Include/exclude filters for databases and tables.
+
+Patterns are globs (``tmp_*``, ``glob:stg_??``) or regular expressions
+(``re:^stg_\\d+$``) and must match the whole name, case-insensitively, as
+Hive names are. A name is kept when it matches an include pattern (or there
+are none) and no exclude pattern.
+
+A shard ``i/N`` further keeps only the tables whose ``db.table`` hashes to
+shard i (1-based), so N nodes split a catalog without coordinating.
+"""
+import fnmatch
+import hashlib
+import re
+from typing import Iterable, Optional, Tuple
+
+# Hive's SHOW TABLES ... LIKE only understands '*' and '|' alternation.
+_PUSHDOWN_SAFE = re.compile(r"^[A-Za-z0-9_*]+$")
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    if pattern.startswith("re:"):
+        return re.compile(pattern[3:], re.IGNORECASE)
+    if pattern.startswith("glob:"):
+        pattern = pattern[5:]
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
+def _glob(pattern: str) -> Optional[str]:
+    if pattern.startswith("re:"):
+        return None
+    if pattern.startswith("glob:"):
+        pattern = pattern[5:]
+    return pattern if _PUSHDOWN_SAFE.match(pattern) else None
+
+
+def parse_shard(value: str) -> Optional[Tuple[int, int]]:
+    """``"i/N"`` -> (i, N) with 1 <= i <= N; "" or None -> None."""
+    if not value:
+        return None
+    index, _, count = str(value).partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 2/8")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', expected 1 <= i <= N")
+    return index, count
+
+
+def shard_of(database: str, table: str, count: int) -> int:
+    """Stable 1-based shard of ``db.table`` among ``count`` shards."""
+    digest = hashlib.sha1(f"{database}.{table}".lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+class NameFilter:
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        self.include = tuple(include or ())
+        self.exclude = tuple(exclude or ())
+        self._include = [compile_pattern(p) for p in self.include]
+        self._exclude = [compile_pattern(p) for p in self.exclude]
+
+    @classmethod
+    def from_config(cls, settings: dict) -> "NameFilter":
+        settings = settings or {}
+        return cls(settings.get("include"), settings.get("exclude"))
+
+    @property
+    def active(self) -> bool:
+        return bool(self._include or self._exclude)
+
+    def matches(self, name: str) -> bool:
+        if self._include and not any(p.fullmatch(name) for p in self._include):
+            return False
+        return not any(p.fullmatch(name) for p in self._exclude)
+
+    def filter(self, names: Iterable[str]) -> list[str]:
+        return [name for name in names if self.matches(name)]
+
+    def like_pattern(self) -> Optional[str]:
+        """
+        A ``SHOW TABLES ... LIKE`` pattern selecting a superset of the included
+        names, or None when the includes cannot be expressed in Hive's syntax.
+        Excludes are always applied client-side.
+        """
+        if not self.include:
+            return None
+        globs = [_glob(p) for p in self.include]
+        if None in globs:
+            return None
+        return "|".join(globs)
+
+
+class TableFilter:
+    """
+    The ``filters`` section of creds.yaml::
+
+        filters:
+          databases: {include: [...], exclude: [...]}
+          tables: {include: [...], exclude: [...]}
+          per_database:
+            sales: {include: [...], exclude: [...]}
+
+    A database's own ``include`` replaces the global table includes; its
+    excludes are added to the global ones. The top-level ``shard: "i/N"`` key
+    (or ``main.py --shard``) restricts tables to one hash shard.
+    """
+
+    def __init__(
+        self,
+        databases: NameFilter = None,
+        tables: NameFilter = None,
+        per_database: dict = None,
+        shard: Tuple[int, int] = None,
+    ):
+        self.databases = databases or NameFilter()
+        self.tables = tables or NameFilter()
+        self.per_database = {db.lower(): f for db, f in (per_database or {}).items()}
+        self.shard = shard
+        self._merged = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TableFilter":
+        settings = config.get("filters", {}) or {}
+        return cls(
+            NameFilter.from_config(settings.get("databases")),
+            NameFilter.from_config(settings.get("tables")),
+            {
+                db: NameFilter.from_config(db_settings)
+                for db, db_settings in (settings.get("per_database") or {}).items()
+            },
+            parse_shard(config.get("shard")),
+        )
+
+    def for_database(self, database: str) -> NameFilter:
+        merged = self._merged.get(database)
+        if merged is None:
+            own = self.per_database.get(database.lower())
+            if own is None:
+                merged = self.tables
+            else:
+                merged = NameFilter(
+                    own.include or self.tables.include, self.tables.exclude + own.exclude
+                )
+            self._merged[database] = merged
+        return merged
+
+    def in_shard(self, database: str, table: str) -> bool:
+        if self.shard is None:
+            return True
+        index, count = self.shard
+        return shard_of(database, table, count) == index
+
+    def selects(self, database: str, table: str) -> bool:
+        return (
+            self.databases.matches(database)
+            and self.for_database(database).matches(table)
+            and self.in_shard(database, table)
+        )
+
+    def filter_databases(self, databases: list[str]) -> list[str]:
+        kept = self.databases.filter(databases)
+        if len(kept) != len(databases):
+            print(f"[INFO] Filters skip {len(databases) - len(kept)} of {len(databases)} databases")
+        return kept
+
+    def filter_tables(self, database: str, tables: list[str]) -> list[str]:
+        kept = self.for_database(database).filter(tables)
+        if len(kept) != len(tables):
+            print(f"[INFO] Filters skip {len(tables) - len(kept)} of {len(tables)} tables in '{database}'")
+        if self.shard is not None:
+            matched = len(kept)
+            kept = [table for table in kept if self.in_shard(database, table)]
+            print(f"[INFO] Shard {self.shard[0]}/{self.shard[1]} takes {len(kept)} of {matched} tables in '{database}'")
+        return kept